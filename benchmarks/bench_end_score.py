@@ -0,0 +1,79 @@
+"""Benchmark: boards/second of the vectorized end scorer.
+
+Scores N random boards with dc4client.board.end_scores and, for reference,
+a straightforward per-board Python loop on a small sample.
+
+Usage:
+    python benchmarks/bench_end_score.py [--boards N]
+"""
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Import dc4client from this checkout, installed or not
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dc4client.board import HOUSE_RADIUS, STONE_RADIUS, TEE_X, TEE_Y, end_scores
+
+
+def random_boards(n: int, seed: int = 0) -> np.ndarray:
+    """Random boards around the house, with about a third of the stones not in play."""
+    rng = np.random.default_rng(seed)
+    boards = rng.uniform([-2.375, 32.0], [2.375, 41.0], size=(n, 2, 8, 2))
+    boards[rng.random((n, 2, 8)) < 0.35] = 0.0
+    return boards
+
+
+def loop_score(board: np.ndarray) -> int:
+    """Per-board pure Python reference implementation."""
+    limit = HOUSE_RADIUS + STONE_RADIUS
+    distances = [
+        sorted(
+            math.hypot(x - TEE_X, y - TEE_Y)
+            for x, y in board[team].tolist()
+            if (x != 0.0 or y != 0.0) and math.hypot(x - TEE_X, y - TEE_Y) <= limit
+        )
+        for team in (0, 1)
+    ]
+    best0 = distances[0][0] if distances[0] else math.inf
+    best1 = distances[1][0] if distances[1] else math.inf
+    if best0 < best1:
+        return sum(1 for d in distances[0] if d < best1)
+    if best1 < best0:
+        return -sum(1 for d in distances[1] if d < best0)
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--boards", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    boards = random_boards(args.boards)
+    scores = end_scores(boards)
+
+    sample = min(2000, args.boards)
+    start = time.perf_counter()
+    reference = np.array([loop_score(board) for board in boards[:sample]])
+    loop_rate = sample / (time.perf_counter() - start)
+    assert (reference == scores[:sample]).all(), "vectorized scores differ from the reference loop"
+
+    best = math.inf
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        end_scores(boards)
+        best = min(best, time.perf_counter() - start)
+
+    print(f"N={args.boards}: {best * 1e3:.1f} ms per batch")
+    print(f"vectorized: {args.boards / best:,.0f} boards/s")
+    print(f"python loop: {loop_rate:,.0f} boards/s (reference, {sample} boards)")
+    print(f"score histogram (-8..8): {np.bincount(scores + 8, minlength=17).tolist()}")
+
+
+if __name__ == "__main__":
+    main()
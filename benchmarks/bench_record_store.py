@@ -0,0 +1,86 @@
+"""Benchmark: query latency of the memory-mapped game record store.
+
+Writes N synthetic matches (two ends of 16 shots each, random boards and
+end scores) with GameRecordWriter into a temporary directory, then times
+GameRecordStore queries such as "all positions at shot 15 where team1 had
+hammer and was down by 1" on a freshly opened store, plus fetching the
+matching boards.
+
+Usage:
+    python benchmarks/bench_record_store.py [--games N]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Import dc4client from this checkout, installed or not
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dc4client import TEAM1, CompactState, GameRecordStore, GameRecordWriter
+
+
+def synthetic_match(rng: np.random.Generator, ends: int = 2):
+    """States of one match: 16 shots per end, end scores drawn at random."""
+    score = {"team0": [None] * ends, "team1": [None] * ends}
+    first = "team0"
+    for end in range(ends):
+        for shot in range(16):
+            stones = np.zeros((2, 8, 2))
+            placed = rng.uniform([-2.0, 33.0], [2.0, 40.0], size=(2, 8, 2))
+            # Stones thrown so far by each team
+            for team, count in enumerate(((shot + 1) // 2, shot // 2)):
+                stones[team, :count] = placed[team, :count]
+            yield CompactState(
+                winner_team=None, end_number=end, shot_number=shot // 2, total_shot_number=shot,
+                next_shot_team=first if shot % 2 == 0 else ("team1" if first == "team0" else "team0"),
+                first_team_remaining_time=600.0 - 10 * shot, second_team_remaining_time=600.0 - 10 * shot,
+                first_team_extra_end_remaining_time=60.0, second_team_extra_end_remaining_time=60.0,
+                stones=stones, stone_counts=(8, 8), last_move=(2.3, 1.57, 1.5707) if shot else None,
+                score={team: list(points) for team, points in score.items()},
+            )
+        points = int(rng.integers(-2, 3))
+        score["team0"][end] = max(points, 0)
+        score["team1"][end] = max(-points, 0)
+        # The team that scored throws first in the next end
+        if points:
+            first = "team0" if points > 0 else "team1"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        with GameRecordWriter(directory) as writer:
+            for game in range(args.games):
+                writer.add_match(f"match-{game}", synthetic_match(rng))
+        print(f"wrote {args.games} games ({writer.rows} rows) in {time.perf_counter() - start:.1f} s")
+
+        queries = {
+            "shot 15, team1 hammer, team1 down by 1": dict(total_shot_number=15, hammer=TEAM1, score_difference=1),
+            "end 1, shot 0": dict(end_number=1, total_shot_number=0),
+            "matches won 2-0 by team0, shot 8": dict(final_score=(2, 0), total_shot_number=8),
+            "one match by id": dict(match=f"match-{args.games // 2}"),
+        }
+        for label, conditions in queries.items():
+            times = []
+            for _ in range(args.repeat):
+                store = GameRecordStore(directory)
+                begin = time.perf_counter()
+                rows = store.query(**conditions)
+                boards = np.asarray(store.column("stones")[rows])
+                times.append(time.perf_counter() - begin)
+            print(f"  {label:<42} {len(rows):8d} rows  {min(times) * 1e3:8.2f} ms (median {np.median(times) * 1e3:.2f} ms)")
+        assert boards.shape[1:] == (2, 8, 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Microbenchmark: per-shot client CPU cost of submitting a shot.
+
+Compares the previous send_shot_info_dc3/send_shot_info implementation with
+the fast path used by DCClient now, in two ways:
+
+    - prepare: building the URL, headers and JSON body only. The previous
+      path used numpy scalar math, ShotInfoModel + model_dump, json encoding,
+      query params and BasicAuth encoding per request; the fast path uses the
+      math module, a body rendered from three floats and a cached URL/headers.
+    - end-to-end: client process CPU time per shot POST against a local
+      server running in a separate process. The previous path also created
+      a new ClientSession/TCPConnector (and TCP connection) per shot.
+
+The fast path does not reach a tenfold cut. On a development machine
+prepare is about 5x cheaper (three float reprs are most of what is left)
+and end-to-end about 3x, because aiohttp's own request handling now
+dominates the per-shot CPU time.
+
+Usage:
+    python benchmarks/bench_shot_submission.py [--iterations N] [--shots N]
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import socket
+import sys
+import time
+import timeit
+from pathlib import Path
+
+import aiohttp
+import numpy as np
+from aiohttp import BasicAuth, web
+from yarl import URL
+
+# Import dc4client from this checkout, installed or not
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dc4client import DCClient, ShotInfoModel
+from dc4client.dc_client import _SHOT_HEADERS, _render_shot_body, _shot_values
+
+
+HOST = "127.0.0.1"
+MATCH_ID = "0190a3b4-5c6d-7e8f-9a0b-1c2d3e4f5a6b"
+
+
+def legacy_prepare(shot_url: str, vx: float, vy: float):
+    """The request preparation performed per shot before the fast path."""
+    translational_velocity = np.sqrt(vx**2 + vy**2)
+    shot_angle = np.arctan2(vy, vx)
+    angular_velocity = np.pi / 2
+    shot_info = ShotInfoModel(
+        translational_velocity=translational_velocity,
+        angular_velocity=angular_velocity,
+        shot_angle=shot_angle,
+    )
+    body = json.dumps(shot_info.model_dump()).encode()
+    url = URL(shot_url).with_query({"match_id": MATCH_ID})
+    authorization = BasicAuth(login="user", password="password").encode()
+    return url, body, authorization
+
+
+def fast_prepare(client: DCClient, vx: float, vy: float):
+    """The request preparation performed per shot by DCClient.send_shot_info_dc3."""
+    translational_velocity = math.hypot(vx, vy)
+    shot_angle = math.atan2(vy, vx)
+    body = _render_shot_body(*_shot_values(translational_velocity, shot_angle, math.pi / 2))
+    return client._get_shot_request_url(), body, _SHOT_HEADERS
+
+
+async def legacy_send(shot_url: str, vx: float, vy: float) -> None:
+    """The previous send_shot_info: one new session per shot."""
+    translational_velocity = np.sqrt(vx**2 + vy**2)
+    shot_angle = np.arctan2(vy, vx)
+    shot_info = ShotInfoModel(
+        translational_velocity=translational_velocity,
+        angular_velocity=np.pi / 2,
+        shot_angle=shot_angle,
+    )
+    async with aiohttp.ClientSession(auth=BasicAuth(login="user", password="password")) as session:
+        async with session.post(
+            url=shot_url, params={"match_id": MATCH_ID}, json=shot_info.model_dump()
+        ) as response:
+            try:
+                await response.json()
+            except Exception:
+                await response.text()
+
+
+def _serve(port: int, ready) -> None:
+    async def shots(request: web.Request) -> web.Response:
+        await request.read()
+        return web.json_response(None)
+
+    app = web.Application()
+    app.router.add_post("/shots", shots)
+    ready.set()
+    web.run_app(app, host=HOST, port=port, print=None, handle_signals=False)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def best_per_call(func, iterations: int, repeat: int = 5) -> float:
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=iterations)) / iterations
+
+
+async def end_to_end(port: int, shots: int):
+    shot_url = f"http://{HOST}:{port}/shots"
+
+    # Warm both paths once so one-off costs are not counted
+    await legacy_send(shot_url, 0.131, 2.39)
+    start = time.process_time()
+    for _ in range(shots):
+        await legacy_send(shot_url, 0.131, 2.39)
+    legacy = (time.process_time() - start) / shots
+
+    async with DCClient(
+        match_id=MATCH_ID, username="user", password="password", auto_save_log=False
+    ) as client:
+        client.set_server_address(HOST, port)
+        await client.send_shot_info_dc3(0.131, 2.39, "cw")
+        start = time.process_time()
+        for _ in range(shots):
+            await client.send_shot_info_dc3(0.131, 2.39, "cw")
+        fast = (time.process_time() - start) / shots
+    return legacy, fast
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--shots", type=int, default=500)
+    args = parser.parse_args()
+
+    client = DCClient(match_id=MATCH_ID, username="user", password="password", auto_save_log=False)
+    client.set_server_address(HOST, 5000)
+    # Both paths must produce the same request body
+    assert json.loads(legacy_prepare(client.shot_info_url, 0.131, 2.39)[1]) == json.loads(
+        fast_prepare(client, 0.131, 2.39)[1]
+    )
+
+    legacy = best_per_call(lambda: legacy_prepare(client.shot_info_url, 0.131, 2.39), args.iterations)
+    fast = best_per_call(lambda: fast_prepare(client, 0.131, 2.39), args.iterations)
+    print("prepare (URL, headers, body):")
+    print(f"  legacy path: {legacy * 1e6:8.2f} us/shot")
+    print(f"  fast path:   {fast * 1e6:8.2f} us/shot")
+    print(f"  speedup:     {legacy / fast:8.1f}x")
+
+    port = _free_port()
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=_serve, args=(port, ready), daemon=True)
+    server.start()
+    try:
+        ready.wait()
+        time.sleep(0.5)
+        legacy, fast = asyncio.run(end_to_end(port, args.shots))
+    finally:
+        server.terminate()
+        server.join()
+    print("end-to-end (client CPU time per shot POST):")
+    print(f"  legacy path: {legacy * 1e6:8.2f} us/shot")
+    print(f"  fast path:   {fast * 1e6:8.2f} us/shot")
+    print(f"  speedup:     {legacy / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark: rollouts/second of the vectorized curling simulator.
+
+Throws K random shots (draws and take-outs, both spins) at one board with a
+few stones in and around the house, in one batched call, and checks that the
+results are deterministic and match one-shot-at-a-time simulation.
+
+Usage:
+    python benchmarks/bench_simulator.py [--shots K] [--stones N]
+"""
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Import dc4client from this checkout, installed or not
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dc4client.simulator import CurlingSimulator
+
+
+def random_board(stones_per_team: int, seed: int = 0) -> np.ndarray:
+    """A board with stones spread over the guard zone and the house."""
+    rng = np.random.default_rng(seed)
+    board = np.zeros((2, 8, 2))
+    board[:, :stones_per_team] = rng.uniform([-1.5, 34.0], [1.5, 40.0], size=(2, stones_per_team, 2))
+    return board
+
+
+def random_shots(count: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.stack(
+        (
+            rng.uniform(2.2, 4.0, count),
+            rng.uniform(math.pi / 2 - 0.04, math.pi / 2 + 0.04, count),
+            rng.choice((-math.pi / 2, math.pi / 2), count),
+        ),
+        axis=-1,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shots", type=int, default=5000)
+    parser.add_argument("--stones", type=int, default=4, help="stones per team already on the board")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    simulator = CurlingSimulator()
+    board = random_board(args.stones)
+    shots = random_shots(args.shots)
+    index = min(args.stones, 7)
+
+    first = simulator.simulate(board, shots, team=0, index=index)
+    best = math.inf
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = simulator.simulate(board, shots, team=0, index=index)
+        best = min(best, time.perf_counter() - start)
+    assert np.array_equal(first, result), "simulation is not deterministic"
+
+    sample = min(100, args.shots)
+    start = time.perf_counter()
+    single = np.stack([simulator.simulate(board, shots[i:i + 1], team=0, index=index)[0] for i in range(sample)])
+    single_rate = sample / (time.perf_counter() - start)
+    assert np.allclose(single, result[:sample]), "batched results differ from single-shot results"
+
+    in_play = (result != 0.0).any(axis=-1).sum(axis=(1, 2))
+    print(f"K={args.shots} shots, {args.stones} stones/team on the board: {best * 1e3:.1f} ms per batch")
+    print(f"batched: {args.shots / best:,.0f} rollouts/s")
+    print(f"one at a time: {single_rate:,.0f} rollouts/s")
+    print(f"mean stones left in play: {in_play.mean():.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Benchmark: time-to-first-state after the server drops the SSE stream.
+
+Starts a local stand-in stream server in a separate process. Every stream
+connection sends a few ``state_update`` events (with SSE ids) and then closes
+gracefully; a reconnect carrying ``Last-Event-Id`` resumes with the next event
+at once. Many DCClient instances consume their match streams concurrently, and
+the gap between the last event before a drop and the first event after it is
+recorded as the reconnect time. Lost or duplicated events are counted too.
+
+Usage:
+    python benchmarks/bench_sse_reconnect.py [--clients N] [--drops N]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import socket
+import sys
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+# Import dc4client from this checkout, installed or not
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dc4client import DCClient, LatencyHistogram
+
+
+HOST = "127.0.0.1"
+
+
+def _state_payload(total_shot_number: int) -> dict:
+    return {
+        "winner_team": None,
+        "end_number": 0,
+        "shot_number": total_shot_number // 2,
+        "total_shot_number": total_shot_number,
+        "next_shot_team": "team0" if total_shot_number % 2 == 0 else "team1",
+        "first_team_remaining_time": 600.0,
+        "second_team_remaining_time": 600.0,
+        "first_team_extra_end_remaining_time": 60.0,
+        "second_team_extra_end_remaining_time": 60.0,
+        "mix_doubles_settings": None,
+        "last_move": None,
+        "stone_coordinate": {
+            "data": {
+                "team0": [{"x": 0.0, "y": 0.0}] * 8,
+                "team1": [{"x": 0.0, "y": 0.0}] * 8,
+            }
+        },
+        "score": {"team0": [0] * 10, "team1": [0] * 10},
+    }
+
+
+def _serve(port: int, events_per_connection: int, interval: float, ready) -> None:
+    async def stream(request: web.Request) -> web.StreamResponse:
+        last_event_id = request.headers.get("Last-Event-Id")
+        next_id = int(last_event_id) + 1 if last_event_id else 0
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for index in range(events_per_connection):
+            if index:
+                await asyncio.sleep(interval)
+            data = json.dumps(_state_payload(next_id))
+            await response.write(f"id: {next_id}\nevent: state_update\ndata: {data}\n\n".encode())
+            next_id += 1
+        # Graceful close right after the last event of this connection
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/matches/{match_id}/stream", stream)
+    ready.set()
+    web.run_app(app, host=HOST, port=port, print=None, handle_signals=False, backlog=1024)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+async def _run_client(
+    index: int,
+    port: int,
+    total_events: int,
+    events_per_connection: int,
+    histogram: LatencyHistogram,
+    anomalies: list,
+) -> None:
+    client = DCClient(
+        match_id=f"match-{index}", username="user", password="password",
+        log_level=logging.ERROR, auto_save_log=False, keep_shot_connection_warm=False,
+    )
+    client.set_server_address(HOST, port)
+    expected = 0
+    previous_at = None
+    async for state in client.receive_state_data(compact=True):
+        now = time.monotonic()
+        if state.total_shot_number != expected:
+            anomalies.append((index, expected, state.total_shot_number))
+        if expected % events_per_connection == 0 and previous_at is not None:
+            histogram.record(now - previous_at)
+        previous_at = now
+        expected = state.total_shot_number + 1
+        if expected >= total_events:
+            break
+    await client.close()
+
+
+async def run(port: int, clients: int, drops: int, events_per_connection: int):
+    histogram = LatencyHistogram()
+    anomalies: list = []
+    total_events = events_per_connection * (drops + 1)
+    start = time.monotonic()
+    await asyncio.gather(*(
+        _run_client(index, port, total_events, events_per_connection, histogram, anomalies)
+        for index in range(clients)
+    ))
+    return histogram, anomalies, time.monotonic() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--drops", type=int, default=5)
+    parser.add_argument("--events-per-connection", type=int, default=3)
+    parser.add_argument("--interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    port = _free_port()
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(
+        target=_serve, args=(port, args.events_per_connection, args.interval, ready), daemon=True
+    )
+    server.start()
+    try:
+        ready.wait()
+        time.sleep(0.5)
+        histogram, anomalies, elapsed = asyncio.run(
+            run(port, args.clients, args.drops, args.events_per_connection)
+        )
+    finally:
+        server.terminate()
+        server.join()
+
+    summary = histogram.summary()
+    print(f"clients={args.clients} drops/client={args.drops} wall={elapsed:.2f}s")
+    print(f"reconnects measured: {summary['count']}")
+    for key in ("p50", "p95", "p99", "max"):
+        value = summary[key]
+        print(f"  time-to-first-state {key}: {value * 1e3:8.2f} ms" if value is not None else f"  {key}: n/a")
+    print(f"lost/duplicated events: {len(anomalies)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Benchmark suite: client hot paths, with JSON results and a baseline comparison.
+
+Cases (all times are per operation, lower is better):
+
+    state_parse            StateSchema(**payload) for one decoded state_update event
+    stone_coordinates      DCClient.get_stone_coordinates on a full board
+    sse_event              one event through receive_state_data (StateSchema), from a
+                           synthetic event source in a separate process
+    sse_event_compact      the same with receive_state_data(compact=True)
+    shot_round_trip        one send_shot_info POST round trip to a local server process
+    save_log_10k           logging records and flushing them to the JSONL file, per 10,000
+                           records (``--quick`` logs 2,000)
+    cold_import            ``import dc4client`` in a fresh interpreter
+
+Results are printed and written as JSON (``--output``). With a baseline file,
+each case is compared to it; with ``--check`` the run also fails (exit status
+1) when a case is slower than the baseline by more than ``--tolerance``.
+The committed baseline was recorded on one development machine, so only use
+``--check`` against a baseline saved on the same machine (``--save-baseline``
+stores the current results as the new baseline).
+
+Usage:
+    python benchmarks/bench_suite.py [--quick] [--only CASE ...] [--output results.json]
+        [--baseline benchmarks/baseline.json] [--tolerance 0.25] [--check] [--save-baseline]
+"""
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import multiprocessing
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+
+from aiohttp import web
+
+# Import dc4client from this checkout, installed or not
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dc4client import DCClient, StateSchema
+
+
+HOST = "127.0.0.1"
+MATCH_ID = "0190a3b4-5c6d-7e8f-9a0b-1c2d3e4f5a6b"
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+BASELINE_NOTE = (
+    "Recorded with 'python benchmarks/bench_suite.py --save-baseline' (add --only CASE ... to update "
+    "single cases). Record it again on the machine that runs --check, after changes that are meant to "
+    "change these numbers."
+)
+
+
+def state_payload(total_shot_number: int = 9) -> dict:
+    """A mid-end state_update payload with eight stones in play."""
+    in_play = [{"x": 0.3 * (i - 2), "y": 36.5 + 0.4 * i} for i in range(4)]
+    out_of_play = [{"x": 0.0, "y": 0.0}] * 4
+    return {
+        "winner_team": None,
+        "end_number": 3,
+        "shot_number": total_shot_number // 2,
+        "total_shot_number": total_shot_number,
+        "next_shot_team": "team0" if total_shot_number % 2 == 0 else "team1",
+        "first_team_remaining_time": 512.25,
+        "second_team_remaining_time": 498.5,
+        "first_team_extra_end_remaining_time": 60.0,
+        "second_team_extra_end_remaining_time": 60.0,
+        "mix_doubles_settings": None,
+        "last_move": {"translational_velocity": 2.41, "angular_velocity": 1.5708, "shot_angle": 1.5634},
+        "stone_coordinate": {"data": {"team0": in_play + out_of_play, "team1": in_play[::-1] + out_of_play}},
+        "score": {"team0": [0, 1, 0, None, None, None, None, None], "team1": [1, 0, 2, None, None, None, None, None]},
+    }
+
+
+def _serve(port: int, events: int, ready) -> None:
+    async def stream(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        # Events are pre-rendered so the server is not the bottleneck
+        chunk = b"".join(
+            f"id: {i}\nevent: state_update\ndata: {json.dumps(state_payload(i % 16))}\n\n".encode()
+            for i in range(256)
+        )
+        for _ in range(-(-events // 256)):
+            await response.write(chunk)
+        await asyncio.sleep(3600)
+        return response
+
+    async def shots(request: web.Request) -> web.Response:
+        await request.read()
+        return web.json_response(None)
+
+    app = web.Application()
+    app.router.add_get("/matches/{match_id}/stream", stream)
+    app.router.add_post("/shots", shots)
+    ready.set()
+    web.run_app(app, host=HOST, port=port, print=None, handle_signals=False)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def best_per_call(func, iterations: int, repeat: int = 5) -> float:
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=iterations)) / iterations
+
+
+def _client(**kwargs) -> DCClient:
+    return DCClient(
+        match_id=MATCH_ID, username="user", password="password",
+        log_level=logging.ERROR, keep_shot_connection_warm=False, **{"auto_save_log": False, **kwargs},
+    )
+
+
+def bench_state_parse(scale: float, port: int) -> float:
+    payload = state_payload()
+    return best_per_call(lambda: StateSchema(**payload), int(20000 * scale))
+
+
+def bench_stone_coordinates(scale: float, port: int) -> float:
+    client = _client()
+    client.state_data = StateSchema(**state_payload())
+    return best_per_call(client.get_stone_coordinates, int(50000 * scale))
+
+
+async def _sse_event(port: int, events: int, compact: bool) -> float:
+    client = _client()
+    client.set_server_address(HOST, port)
+    count = 0
+    start = 0.0
+    async for _ in client.receive_state_data(compact=compact):
+        if count == 0:
+            # Connection setup is not counted
+            start = time.perf_counter()
+        count += 1
+        if count > events:
+            break
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return elapsed / events
+
+
+def bench_sse_event(scale: float, port: int) -> float:
+    return min(asyncio.run(_sse_event(port, int(20000 * scale), False)) for _ in range(3))
+
+
+def bench_sse_event_compact(scale: float, port: int) -> float:
+    return min(asyncio.run(_sse_event(port, int(20000 * scale), True)) for _ in range(3))
+
+
+async def _shot_round_trip(port: int, shots: int) -> float:
+    client = _client()
+    client.set_server_address(HOST, port)
+    await client.send_shot_info(2.41, 1.5634, 1.5708)
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(shots):
+            await client.send_shot_info(2.41, 1.5634, 1.5708)
+        best = min(best, (time.perf_counter() - start) / shots)
+    await client.close()
+    return best
+
+
+def bench_shot_round_trip(scale: float, port: int) -> float:
+    return asyncio.run(_shot_round_trip(port, int(1000 * scale)))
+
+
+async def _save_log(records: int) -> float:
+    with tempfile.TemporaryDirectory() as log_dir:
+        client = _client(auto_save_log=True, log_dir=log_dir, log_queue_size=records + 16)
+        client.logger.setLevel(logging.INFO)
+        state = StateSchema(**state_payload())
+        start = time.perf_counter()
+        for _ in range(records):
+            client.logger.info("state_data: %s", state)
+        await client.save_log_file_async()
+        elapsed = time.perf_counter() - start
+        await client.close()
+    return elapsed
+
+
+def bench_save_log_10k(scale: float, port: int) -> float:
+    records = int(10000 * scale)
+    return min(asyncio.run(_save_log(records)) for _ in range(3)) * 10000 / records
+
+
+def bench_cold_import(scale: float, port: int) -> float:
+    code = "import time; start = time.perf_counter(); import dc4client; print(time.perf_counter() - start)"
+    runs = [
+        float(subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout)
+        for _ in range(max(3, int(7 * scale)))
+    ]
+    return statistics.median(runs)
+
+
+# name -> (function, unit multiplier, unit, needs the local server)
+CASES = {
+    "state_parse": (bench_state_parse, 1e6, "us", False),
+    "stone_coordinates": (bench_stone_coordinates, 1e6, "us", False),
+    "sse_event": (bench_sse_event, 1e6, "us", True),
+    "sse_event_compact": (bench_sse_event_compact, 1e6, "us", True),
+    "shot_round_trip": (bench_shot_round_trip, 1e6, "us", True),
+    "save_log_10k": (bench_save_log_10k, 1e3, "ms", False),
+    "cold_import": (bench_cold_import, 1e3, "ms", False),
+}
+
+
+def run_cases(names, scale: float) -> dict:
+    port = _free_port()
+    server = None
+    if any(CASES[name][3] for name in names):
+        ready = multiprocessing.Event()
+        server = multiprocessing.Process(target=_serve, args=(port, int(20000 * scale) + 1, ready), daemon=True)
+        server.start()
+        ready.wait()
+        time.sleep(0.5)
+    results = {}
+    try:
+        for name in names:
+            function, multiplier, unit, _ = CASES[name]
+            value = function(scale, port) * multiplier
+            results[name] = {"value": round(value, 4), "unit": unit}
+            print(f"  {name:<20} {value:12.3f} {unit}", flush=True)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Print each case against the baseline and return the names of regressed cases."""
+    regressions = []
+    print(f"\ncompared to baseline (tolerance {tolerance:.0%}):")
+    for name, result in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None or reference["unit"] != result["unit"]:
+            print(f"  {name:<20} no baseline")
+            continue
+        ratio = result["value"] / reference["value"] if reference["value"] else float("inf")
+        regressed = ratio > 1.0 + tolerance
+        if regressed:
+            regressions.append(name)
+        print(f"  {name:<20} {ratio:6.2f}x baseline ({reference['value']} {reference['unit']}){'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), help="run only these cases")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations (noisier)")
+    parser.add_argument("--output", type=Path, help="write the results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing")
+    parser.add_argument("--check", action="store_true", help="fail when a case regressed against the baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the baseline")
+    args = parser.parse_args()
+
+    names = args.only or list(CASES)
+    print("benchmarks:")
+    results = run_cases(names, 0.2 if args.quick else 1.0)
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.save_baseline:
+        merged = {"note": BASELINE_NOTE, **report}
+        if args.baseline.exists() and args.only:
+            # Keep the baseline of the cases that were not run
+            merged = copy.deepcopy(json.loads(args.baseline.read_text()))
+            merged["note"] = BASELINE_NOTE
+            merged["meta"] = report["meta"]
+            merged["results"].update(results)
+        args.baseline.write_text(json.dumps(merged, indent=2) + "\n")
+        print(f"\nbaseline saved to {args.baseline}")
+        return
+
+    if args.baseline.exists():
+        if compare(results, json.loads(args.baseline.read_text()), args.tolerance) and args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Import-time budget check for dc4client.
+
+Each case runs in fresh interpreters (median of ``--runs``). It fails (exit
+status 1) when the import takes longer than its budget, or when it loads a
+heavy dependency it should not need. Examples: ``import dc4client`` must not
+load numpy, aiohttp or pydantic, and sending a DC3-style shot must work
+without numpy.
+
+Budgets are in milliseconds on a typical development machine; use
+``--scale`` on slower machines (e.g. ``--scale 2`` doubles every budget).
+
+Usage:
+    python benchmarks/check_import_time.py [--runs N] [--scale F]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+# The interpreters import dc4client from this checkout, installed or not
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = ("numpy", "aiohttp", "aiohttp.web", "aiohttp_sse_client2", "pydantic")
+
+# (label, code, budget in ms, modules the code must not load)
+CASES = [
+    ("import dc4client", "import dc4client", 50, ("numpy", "aiohttp", "pydantic")),
+    (
+        "data models",
+        "from dc4client import ShotInfoModel, TeamModel, ClientDataModel",
+        600, ("numpy", "aiohttp"),
+    ),
+    ("MatchMakerClient", "from dc4client import MatchMakerClient", 800, ("numpy", "pydantic", "aiohttp.web")),
+    ("DCClient", "from dc4client import DCClient", 1000, ("numpy", "aiohttp.web")),
+    (
+        "send_shot_info_dc3 conversion",
+        # The POST itself is replaced: only the DC3 -> (velocity, angle, spin) conversion runs
+        "import asyncio\n"
+        "from dc4client import DCClient\n"
+        "client = DCClient(match_id='m', username='u', password='p', auto_save_log=False)\n"
+        "async def capture(**shot): pass\n"
+        "client.send_shot_info = capture\n"
+        "asyncio.run(client.send_shot_info_dc3(0.1, 2.4, 'cw'))\n",
+        1000, ("numpy",),
+    ),
+]
+
+_RUNNER = """
+import json, sys, time
+start = time.perf_counter()
+exec(compile(sys.argv[1], "<case>", "exec"))
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": [name for name in sys.argv[2:] if name in sys.modules]}))
+"""
+
+
+def measure(code: str, runs: int) -> tuple:
+    """Median seconds of ``code`` in fresh interpreters, and the heavy modules it loaded."""
+    times = []
+    loaded = set()
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _RUNNER, code, *HEAVY_MODULES],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.splitlines()[-1])
+        times.append(result["elapsed"])
+        loaded.update(result["loaded"])
+    return statistics.median(times), loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget by this factor")
+    args = parser.parse_args()
+
+    failures = 0
+    for label, code, budget, forbidden in CASES:
+        elapsed, loaded = measure(code, args.runs)
+        limit = budget * args.scale
+        unexpected = sorted(loaded.intersection(forbidden))
+        ok = elapsed * 1e3 <= limit and not unexpected
+        failures += not ok
+        detail = f"  loaded {', '.join(unexpected)}" if unexpected else ""
+        print(f"  {'ok  ' if ok else 'FAIL'} {label:<32} {elapsed * 1e3:8.1f} ms (budget {limit:.0f} ms){detail}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,196 @@
-from .dc_client import *
-from .match_maker_client import *
-from .send_data import *
-from .receive_data import *
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+# Public names of each submodule. ``import dc4client`` imports none of them:
+# a submodule (and the aiohttp, numpy or pydantic it needs) is imported the
+# first time one of its names (or the submodule itself, e.g. dc4client.board)
+# is accessed, e.g. ``from dc4client import MatchMakerClient`` loads aiohttp
+# and pydantic but not numpy. Each tuple repeats the submodule's ``__all__``,
+# which cannot be read without importing it; tests/test_package.py checks
+# that they agree.
+_SUBMODULE_EXPORTS: Dict[str, Tuple[str, ...]] = {
+    "dc_client": (
+        "MemoryBufferHandler",
+        "JsonLineFormatter",
+        "QueueJsonlFileHandler",
+        "DCClient",
+    ),
+    "match_maker_client": (
+        "MatchCreationResult",
+        "MatchMakerClient",
+    ),
+    "send_data": (
+        "MatchModel",
+        "ScoreModel",
+        "PhysicalSimulatorModel",
+        "TournamentModel",
+        "ShotInfoModel",
+        "StateModel",
+        "StoneCoordinates",
+        "MatchNameModel",
+        "PlayerModel",
+        "TeamModel",
+        "GameMode",
+        "MixDoublesTeamModel",
+        "PositionedStonesModel",
+        "ClientDataModel",
+    ),
+    "receive_data": (
+        "TournamentSchema",
+        "PhysicalSimulatorSchema",
+        "PlayerSchema",
+        "TrajectorySchema",
+        "CoordinateDataSchema",
+        "StoneCoordinateSchema",
+        "ScoreSchema",
+        "ShotInfoSchema",
+        "PowerPlayEndSchema",
+        "MixDoublesSettingsSchema",
+        "StateSchema",
+        "MatchDataSchema",
+    ),
+    "http_trace": (
+        "TRACE_PHASES",
+        "LatencyHistogram",
+        "RequestTracer",
+    ),
+    "time_budget": (
+        "TimeBudget",
+    ),
+    "compact_state": (
+        "TEAMS",
+        "STONES_PER_TEAM",
+        "CompactState",
+        "stone_array",
+        "StateCache",
+    ),
+    "board": (
+        "TEE_X",
+        "TEE_Y",
+        "HOUSE_RADIUS",
+        "STONE_RADIUS",
+        "HOG_LINE_Y",
+        "BACK_LINE_Y",
+        "SIDE_LINE_X",
+        "TEAM0",
+        "TEAM1",
+        "NO_TEAM",
+        "BoardFeatures",
+        "end_scores",
+        "compute_features",
+        "board_features",
+    ),
+    "encoder": (
+        "SCALAR_FEATURES",
+        "score_difference",
+        "hammer_team",
+        "StateEncoder",
+    ),
+    "local_server": (
+        "PhysicsStep",
+        "TEAM_NAMES",
+        "straight_line_physics",
+        "LocalDCServer",
+    ),
+    "simulator": (
+        "FRICTION_DECELERATION",
+        "CURL_COEFFICIENT",
+        "CURL_SPEED_OFFSET",
+        "COLLISION_RESTITUTION",
+        "shot_array",
+        "add_execution_noise",
+        "CurlingSimulator",
+        "default_simulator",
+    ),
+    "noise_sampler": (
+        "RolloutFunction",
+        "simulate_end_score",
+        "perturb_shots",
+        "summarize_outcomes",
+        "ShotNoiseSampler",
+    ),
+    "shot_search": (
+        "Evaluator",
+        "end_score_evaluator",
+        "SearchResult",
+        "ShotSearch",
+    ),
+    "eval_cache": (
+        "board_keys",
+        "state_key",
+        "SharedEvaluationCache",
+        "EvaluationCache",
+    ),
+    "orchestrator": (
+        "PlayFunction",
+        "MatchSpec",
+        "MatchResult",
+        "MatchOrchestrator",
+    ),
+    "self_play": (
+        "SAMPLE_SCHEMA",
+        "DEFAULT_FALLBACK_SHOT",
+        "Policy",
+        "ShardWriter",
+        "load_shards",
+        "self_play_specs",
+        "SelfPlayPipeline",
+    ),
+    "replay": (
+        "StateT",
+        "index_path",
+        "MatchRecorder",
+        "MatchReplay",
+    ),
+    "record_store": (
+        "ROW_COLUMNS",
+        "MATCH_COLUMNS",
+        "INDEXED_COLUMNS",
+        "GameRecordWriter",
+        "GameRecordStore",
+    ),
+}
+
+_EXPORTS: Dict[str, str] = {
+    name: module for module, names in _SUBMODULE_EXPORTS.items() for name in names
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULE_EXPORTS:
+        # Importing a submodule also binds it on the package
+        return importlib.import_module(f".{name}", __name__)
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # Later lookups find the name directly
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULE_EXPORTS))
+
+
+if TYPE_CHECKING:
+    from .dc_client import *
+    from .match_maker_client import *
+    from .send_data import *
+    from .receive_data import *
+    from .http_trace import *
+    from .time_budget import *
+    from .compact_state import *
+    from .board import *
+    from .encoder import *
+    from .local_server import *
+    from .simulator import *
+    from .noise_sampler import *
+    from .shot_search import *
+    from .eval_cache import *
+    from .orchestrator import *
+    from .self_play import *
+    from .replay import *
+    from .record_store import *
@@ -0,0 +1,150 @@
+from typing import Union
+
+import numpy as np
+
+from dc4client.compact_state import CompactState, StateCache, stone_array
+from dc4client.receive_data import StateSchema
+
+
+__all__ = [
+    "TEE_X",
+    "TEE_Y",
+    "HOUSE_RADIUS",
+    "STONE_RADIUS",
+    "HOG_LINE_Y",
+    "BACK_LINE_Y",
+    "SIDE_LINE_X",
+    "TEAM0",
+    "TEAM1",
+    "NO_TEAM",
+    "BoardFeatures",
+    "end_scores",
+    "compute_features",
+    "board_features",
+]
+
+
+# Sheet geometry in the StoneCoordinateSchema frame (metres).
+TEE_X = 0.0
+TEE_Y = 38.405
+HOUSE_RADIUS = 1.829
+STONE_RADIUS = 0.145
+HOG_LINE_Y = 32.004
+BACK_LINE_Y = 40.234
+SIDE_LINE_X = 2.375
+
+TEAM0 = 0
+TEAM1 = 1
+NO_TEAM = -1
+
+
+def _count_stones(house_distance: np.ndarray):
+    """Return per-board (team0, team1) counting stones from ``(..., 2, 8)`` in-house distances (inf elsewhere).
+    Only the team owning the shot rock gets a non-zero count: its stones closer
+    than the opponent's best stone in the house.
+    """
+    best = house_distance.min(axis=-1)
+    count0 = (house_distance[..., 0, :] < best[..., 1, None]).sum(axis=-1)
+    count1 = (house_distance[..., 1, :] < best[..., 0, None]).sum(axis=-1)
+    return count0, count1
+
+
+class BoardFeatures:
+    """Vectorized features of one board or a batch of boards.
+
+    All arrays have the batch shape ``B`` of the input (empty for a single
+    ``(2, 8, 2)`` board) followed by the per-team/per-stone axes. Team index 0
+    is "team0" and 1 is "team1". A stone at exactly ``(0.0, 0.0)`` is not in
+    play.
+
+        Attributes:
+            in_play (np.ndarray): ``B + (2, 8)`` bool, stone is on the sheet.
+            distance (np.ndarray): ``B + (2, 8)`` distance from the tee; ``inf`` if not in play.
+            in_house (np.ndarray): ``B + (2, 8)`` bool, stone touches the house.
+            in_guard_zone (np.ndarray): ``B + (2, 8)`` bool, between hog line and tee line, outside the house.
+            order (np.ndarray): ``B + (2, 8)`` stone indices of each team sorted by distance (not in play last).
+            stones_in_play (np.ndarray): ``B + (2,)`` number of stones in play per team.
+            stones_in_house (np.ndarray): ``B + (2,)`` number of stones in the house per team.
+            shot_rock_team (np.ndarray): ``B`` team of the closest stone in the house, or -1.
+            shot_rock_index (np.ndarray): ``B`` stone index of the shot rock, or -1.
+            counting_team (np.ndarray): ``B`` team that would score if the end finished now, or -1.
+            counting_stones (np.ndarray): ``B`` number of stones that team would score.
+    """
+    __slots__ = (
+        "in_play",
+        "distance",
+        "in_house",
+        "in_guard_zone",
+        "order",
+        "stones_in_play",
+        "stones_in_house",
+        "shot_rock_team",
+        "shot_rock_index",
+        "counting_team",
+        "counting_stones",
+    )
+
+    def __init__(self, stones: np.ndarray):
+        stones = np.asarray(stones, dtype=np.float64)
+        if stones.shape[-3:] != (2, 8, 2):
+            raise ValueError(f"stones must have shape (..., 2, 8, 2), got {stones.shape}")
+        x = stones[..., 0]
+        y = stones[..., 1]
+        self.in_play = (x != 0.0) | (y != 0.0)
+
+        distance = np.hypot(x - TEE_X, y - TEE_Y)
+        distance[~self.in_play] = np.inf
+        self.distance = distance
+        self.in_house = distance <= HOUSE_RADIUS + STONE_RADIUS
+        self.in_guard_zone = self.in_play & ~self.in_house & (y >= HOG_LINE_Y) & (y < TEE_Y)
+        self.order = np.argsort(distance, axis=-1, kind="stable")
+        self.stones_in_play = self.in_play.sum(axis=-1)
+        self.stones_in_house = self.in_house.sum(axis=-1)
+
+        # Closest stone in the house over both teams
+        house_distance = np.where(self.in_house, distance, np.inf)
+        flat = house_distance.reshape(house_distance.shape[:-2] + (-1,))
+        closest = flat.argmin(axis=-1)
+        has_shot_rock = np.take_along_axis(flat, closest[..., None], axis=-1)[..., 0] < np.inf
+        self.shot_rock_team = np.where(has_shot_rock, closest // 8, NO_TEAM)
+        self.shot_rock_index = np.where(has_shot_rock, closest % 8, NO_TEAM)
+
+        count0, count1 = _count_stones(house_distance)
+        self.counting_team = np.where(count0 > 0, TEAM0, np.where(count1 > 0, TEAM1, NO_TEAM))
+        self.counting_stones = np.maximum(count0, count1)
+
+
+_FEATURE_CACHE = StateCache()
+
+
+def end_scores(boards: np.ndarray) -> np.ndarray:
+    """Score many hypothetical boards as if the end finished now, in one vectorized pass.
+
+    Args:
+        boards (np.ndarray): ``(N, 2, 8, 2)`` (or any ``(..., 2, 8, 2)``) stone positions,
+            team 0 = "team0", team 1 = "team1", ``(0.0, 0.0)`` = not in play.
+    Returns:
+        np.ndarray: Signed scores with the batch shape: ``+n`` when team0 scores n stones,
+            ``-n`` when team1 scores n stones, 0 for a blank end.
+    """
+    boards = np.asarray(boards)
+    if boards.shape[-3:] != (2, 8, 2):
+        raise ValueError(f"boards must have shape (..., 2, 8, 2), got {boards.shape}")
+    x = boards[..., 0]
+    y = boards[..., 1]
+    dy = y - TEE_Y
+    squared_distance = (x - TEE_X) * (x - TEE_X) + dy * dy
+    in_house = (squared_distance <= (HOUSE_RADIUS + STONE_RADIUS) ** 2) & ((x != 0.0) | (y != 0.0))
+    # Squared distances order stones the same way as distances
+    count0, count1 = _count_stones(np.where(in_house, squared_distance, np.inf))
+    return count0 - count1
+
+
+def compute_features(stones: np.ndarray) -> BoardFeatures:
+    """Compute features for a ``(2, 8, 2)`` board or an ``(..., 2, 8, 2)`` batch of boards in one pass."""
+    return BoardFeatures(stones)
+
+
+def board_features(state: Union[StateSchema, CompactState]) -> BoardFeatures:
+    """Return the features of a state's board, computed once per state instance."""
+    return _FEATURE_CACHE.get(state, lambda s: BoardFeatures(stone_array(s)))
@@ -0,0 +1,253 @@
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from dc4client.receive_data import StateSchema
+
+
+__all__ = ["TEAMS", "STONES_PER_TEAM", "CompactState", "stone_array", "StateCache"]
+
+
+TEAMS = ("team0", "team1")
+STONES_PER_TEAM = 8
+
+
+class CompactState:
+    """Array-backed alternative to StateSchema.
+
+    Scalars live in ``__slots__`` and all stone positions in one contiguous
+    ``(2, 8, 2)`` float64 array indexed as ``stones[team, stone, (x, y)]``
+    (team 0 is "team0", team 1 is "team1", the same order as
+    StoneCoordinateSchema.data). Stones not in play are ``(0.0, 0.0)``, as sent
+    by the server. Built straight from the decoded JSON payload without
+    creating any pydantic objects; use :meth:`to_state_schema` when the full
+    model is needed.
+    """
+    __slots__ = (
+        "winner_team",
+        "end_number",
+        "shot_number",
+        "total_shot_number",
+        "next_shot_team",
+        "first_team_remaining_time",
+        "second_team_remaining_time",
+        "first_team_extra_end_remaining_time",
+        "second_team_extra_end_remaining_time",
+        "mix_doubles_settings",
+        "last_move",
+        "stones",
+        "stone_counts",
+        "score",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        winner_team: Optional[str],
+        end_number: int,
+        shot_number: Optional[int],
+        total_shot_number: Optional[int],
+        next_shot_team: Optional[str],
+        first_team_remaining_time: float,
+        second_team_remaining_time: float,
+        first_team_extra_end_remaining_time: float,
+        second_team_extra_end_remaining_time: float,
+        stones: np.ndarray,
+        stone_counts: Optional[Tuple[int, int]] = None,
+        last_move: Optional[Tuple[float, Optional[float], float]] = None,
+        score: Optional[Dict[str, list]] = None,
+        mix_doubles_settings: Optional[Dict[str, Any]] = None,
+    ):
+        if stones.shape != (2, STONES_PER_TEAM, 2):
+            raise ValueError(f"stones must have shape (2, {STONES_PER_TEAM}, 2), got {stones.shape}")
+        self.winner_team = winner_team
+        self.end_number = end_number
+        self.shot_number = shot_number
+        self.total_shot_number = total_shot_number
+        self.next_shot_team = next_shot_team
+        self.first_team_remaining_time = first_team_remaining_time
+        self.second_team_remaining_time = second_team_remaining_time
+        self.first_team_extra_end_remaining_time = first_team_extra_end_remaining_time
+        self.second_team_extra_end_remaining_time = second_team_extra_end_remaining_time
+        # (translational_velocity, angular_velocity, shot_angle)
+        self.last_move = last_move
+        self.stones = stones
+        # Number of stones the server sent per team (None if the state had no stone_coordinate)
+        self.stone_counts = stone_counts
+        self.score = score
+        self.mix_doubles_settings = mix_doubles_settings
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "CompactState":
+        """Build a CompactState from a decoded ``state_update`` JSON payload.
+        Raises:
+            ValueError: If a field StateSchema requires is missing or malformed, or a team has
+                more than 8 stones.
+        """
+        try:
+            return cls._from_payload(payload)
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid state payload: {e!r}") from e
+
+    @classmethod
+    def _from_payload(cls, payload: Dict[str, Any]) -> "CompactState":
+        stones = np.zeros((2, STONES_PER_TEAM, 2), dtype=np.float64)
+        stone_counts = None
+        stone_coordinate = payload.get("stone_coordinate")
+        if stone_coordinate is not None:
+            data = stone_coordinate["data"]
+            team0 = data.get("team0", ())
+            team1 = data.get("team1", ())
+            stone_counts = (len(team0), len(team1))
+            if max(stone_counts) > STONES_PER_TEAM:
+                raise ValueError(f"At most {STONES_PER_TEAM} stones per team expected, got {stone_counts}")
+            if stone_counts == (STONES_PER_TEAM, STONES_PER_TEAM):
+                # Common case: one flat list, one array fill
+                flat: List[float] = []
+                append = flat.append
+                for coordinate in team0:
+                    append(coordinate["x"])
+                    append(coordinate["y"])
+                for coordinate in team1:
+                    append(coordinate["x"])
+                    append(coordinate["y"])
+                stones.reshape(-1)[:] = flat
+            else:
+                for team_index, coordinates in enumerate((team0, team1)):
+                    for stone_index, coordinate in enumerate(coordinates):
+                        stones[team_index, stone_index, 0] = coordinate["x"]
+                        stones[team_index, stone_index, 1] = coordinate["y"]
+
+        last_move = payload["last_move"]
+        if last_move is not None:
+            last_move = (
+                float(last_move["translational_velocity"]),
+                None if last_move["angular_velocity"] is None else float(last_move["angular_velocity"]),
+                float(last_move["shot_angle"]),
+            )
+
+        return cls(
+            winner_team=payload["winner_team"],
+            end_number=payload["end_number"],
+            shot_number=payload["shot_number"],
+            total_shot_number=payload["total_shot_number"],
+            next_shot_team=payload["next_shot_team"],
+            first_team_remaining_time=float(payload["first_team_remaining_time"]),
+            second_team_remaining_time=float(payload["second_team_remaining_time"]),
+            first_team_extra_end_remaining_time=float(payload["first_team_extra_end_remaining_time"]),
+            second_team_extra_end_remaining_time=float(payload["second_team_extra_end_remaining_time"]),
+            stones=stones,
+            stone_counts=stone_counts,
+            last_move=last_move,
+            score=payload.get("score"),
+            mix_doubles_settings=payload.get("mix_doubles_settings"),
+        )
+
+    @classmethod
+    def from_state_schema(cls, state: StateSchema) -> "CompactState":
+        """Build a CompactState from an existing StateSchema."""
+        return cls.from_payload(state.model_dump())
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Return the state as a JSON-compatible dict in the server's format."""
+        stone_coordinate = None
+        if self.stone_counts is not None:
+            stone_coordinate = {
+                "data": {
+                    team: [
+                        {"x": float(x), "y": float(y)}
+                        for x, y in self.stones[team_index, :count].tolist()
+                    ]
+                    for team_index, (team, count) in enumerate(zip(TEAMS, self.stone_counts))
+                }
+            }
+        last_move = None
+        if self.last_move is not None:
+            translational_velocity, angular_velocity, shot_angle = self.last_move
+            last_move = {
+                "translational_velocity": translational_velocity,
+                "angular_velocity": angular_velocity,
+                "shot_angle": shot_angle,
+            }
+        return {
+            "winner_team": self.winner_team,
+            "end_number": self.end_number,
+            "shot_number": self.shot_number,
+            "total_shot_number": self.total_shot_number,
+            "next_shot_team": self.next_shot_team,
+            "first_team_remaining_time": self.first_team_remaining_time,
+            "second_team_remaining_time": self.second_team_remaining_time,
+            "first_team_extra_end_remaining_time": self.first_team_extra_end_remaining_time,
+            "second_team_extra_end_remaining_time": self.second_team_extra_end_remaining_time,
+            "mix_doubles_settings": self.mix_doubles_settings,
+            "last_move": last_move,
+            "stone_coordinate": stone_coordinate,
+            "score": self.score,
+        }
+
+    def to_state_schema(self) -> StateSchema:
+        """Convert back to the full pydantic StateSchema."""
+        return StateSchema(**self.to_payload())
+
+    def stone_coordinates(self) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+        """Return (team0, team1) lists of (x, y) tuples, like DCClient.get_stone_coordinates."""
+        counts = self.stone_counts if self.stone_counts is not None else (0, 0)
+        return tuple(
+            [tuple(xy) for xy in self.stones[team_index, :count].tolist()]
+            for team_index, count in enumerate(counts)
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactState(winner_team={self.winner_team!r}, end_number={self.end_number}, "
+            f"shot_number={self.shot_number}, total_shot_number={self.total_shot_number}, "
+            f"next_shot_team={self.next_shot_team!r}, "
+            f"first_team_remaining_time={self.first_team_remaining_time}, "
+            f"second_team_remaining_time={self.second_team_remaining_time}, "
+            f"first_team_extra_end_remaining_time={self.first_team_extra_end_remaining_time}, "
+            f"second_team_extra_end_remaining_time={self.second_team_extra_end_remaining_time}, "
+            f"last_move={self.last_move}, stones={self.stones.tolist()}, score={self.score})"
+        )
+
+
+def stone_array(state: Union[StateSchema, CompactState]) -> np.ndarray:
+    """Return the ``(2, 8, 2)`` stone position array of a StateSchema or CompactState.
+    For a CompactState this is its own array (no copy).
+    """
+    if isinstance(state, CompactState):
+        return state.stones
+    stones = np.zeros((2, STONES_PER_TEAM, 2), dtype=np.float64)
+    if state.stone_coordinate is not None:
+        data = state.stone_coordinate.data
+        for team_index, team in enumerate(TEAMS):
+            for stone_index, coordinate in enumerate(data.get(team, ())[:STONES_PER_TEAM]):
+                stones[team_index, stone_index, 0] = coordinate.x
+                stones[team_index, stone_index, 1] = coordinate.y
+    return stones
+
+
+class StateCache:
+    """Cache of values derived from a state, keyed by the state instance.
+
+    Entries are dropped as soon as the state object is garbage collected, so
+    the cache never keeps old states alive. Works for StateSchema (which is
+    not hashable) and CompactState alike.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Tuple[weakref.ref, Any]] = {}
+
+    def get(self, state: Any, compute: Callable[[Any], Any]) -> Any:
+        """Return the cached value for ``state``, computing it with ``compute(state)`` on a miss."""
+        key = id(state)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0]() is state:
+            return entry[1]
+        value = compute(state)
+        entries = self._entries
+        self._entries[key] = (weakref.ref(state, lambda _, key=key: entries.pop(key, None)), value)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
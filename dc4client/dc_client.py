@@ -1,28 +1,68 @@
+from __future__ import annotations
+
 import aiohttp
-from aiohttp import BasicAuth
 import asyncio
 import json
 import logging
 from uuid import UUID
 import aiohttp.client_exceptions
-import numpy as np
-from typing import AsyncGenerator, Any, Optional, List, Dict
+import math
+import numbers
+from multidict import CIMultiDict
+from yarl import URL
+from typing import TYPE_CHECKING, AsyncGenerator, Any, Callable, Optional, List, Dict, Tuple, Union
 from aiohttp_sse_client2 import client
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 import base64  # Moved to top level
 import random  # Moved to top level
+import gzip
+import itertools
+import queue
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from dc4client.http_trace import RequestTracer
+from dc4client.time_budget import TimeBudget
 
 from dc4client.receive_data import (
+    ShotInfoSchema,
     StateSchema,
 )
 from dc4client.send_data import (
     MatchNameModel,
-    ShotInfoModel,
     TeamModel,
     PositionedStonesModel
 )
 
+if TYPE_CHECKING:
+    # numpy-backed; imported where used so that DCClient alone does not load numpy
+    from dc4client.board import BoardFeatures
+    from dc4client.compact_state import CompactState
+
+
+__all__ = ["MemoryBufferHandler", "JsonLineFormatter", "QueueJsonlFileHandler", "DCClient"]
+
+
+# Library logger: without handlers of the application's, records are dropped rather than printed
+logging.getLogger("DC_Client").addHandler(logging.NullHandler())
+
+_client_ids = itertools.count(1)
+
+
+class _ClientRecordFilter(logging.Filter):
+    """Pass only the records logged by one DCClient (tagged by its logger adapter)."""
+
+    def __init__(self, client_id: int):
+        super().__init__()
+        self.client_id = client_id
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return getattr(record, "dc_client", None) == self.client_id
+
 
 class MemoryBufferHandler(logging.Handler):
     """
@@ -75,6 +115,237 @@ class JsonLineFormatter(logging.Formatter):
         return json.dumps(log_entry, ensure_ascii=False)
 
 
+class QueueJsonlFileHandler(logging.Handler):
+    """Logging handler that streams JSONL to disk from a background writer thread.
+
+    emit() only puts the record on a bounded queue and never blocks: when the
+    queue is full the record is dropped and counted, so memory stays constant
+    however long the match is. Message formatting, JSON encoding, file writes,
+    rotation and compression all happen on the writer thread.
+
+        Args:
+            path_factory (Callable[[], Path]): Returns the log file path; called when the first file is opened.
+            max_queue_size (int): Maximum number of records waiting to be written. Defaults to 10000.
+            max_bytes (int | None): Rotate to a new file after this many bytes. Defaults to 64 MiB.
+            rotate_interval (float | None): Rotate to a new file after this many seconds. Defaults to None.
+            compress (bool): Gzip each file once it is rotated or closed. Defaults to False.
+            flush_interval (float): Seconds between periodic flushes of the open file. Defaults to 1.0.
+    """
+    _STOP = object()
+
+    def __init__(
+        self,
+        path_factory: Callable[[], Path],
+        max_queue_size: int = 10000,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        rotate_interval: Optional[float] = None,
+        compress: bool = False,
+        flush_interval: float = 1.0,
+    ):
+        super().__init__()
+        self.setFormatter(JsonLineFormatter())
+        self.path_factory = path_factory
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self.dropped: int = 0
+        self.paths: List[Path] = []
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._base_path: Optional[Path] = None
+        self._file = None
+        self._file_bytes = 0
+        self._file_opened_at = 0.0
+        self._reported_dropped = 0
+        self._thread = threading.Thread(target=self._run, name="dc4-log-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Queue a record for the writer thread (drops it if the queue is full)."""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def request_flush(self) -> None:
+        """Ask the writer thread to flush the open file, without waiting."""
+        try:
+            self._queue.put_nowait(threading.Event())
+        except queue.Full:
+            pass
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until every record queued so far is written (or the timeout expires).
+        Do not call this from the event loop; use request_flush there.
+        """
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def close(self) -> None:
+        """Write all queued records, close (and compress) the file and stop the writer thread."""
+        if self._thread.is_alive():
+            try:
+                self._queue.put(self._STOP, timeout=5.0)
+            except queue.Full:
+                pass
+            self._thread.join(timeout=5.0)
+        super().close()
+
+    def _segment_path(self, index: int) -> Path:
+        if index == 0:
+            return self._base_path
+        return self._base_path.with_name(f"{self._base_path.stem}_{index:03d}{self._base_path.suffix}")
+
+    def _open(self) -> None:
+        if self._base_path is None:
+            self._base_path = Path(self.path_factory())
+            self._base_path.parent.mkdir(parents=True, exist_ok=True)
+        path = self._segment_path(len(self.paths))
+        self._file = open(path, "w", encoding="utf-8")
+        self._file_bytes = 0
+        self._file_opened_at = time.monotonic()
+        self.paths.append(path)
+
+    def _close_file(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        if self.compress:
+            path = self.paths[-1]
+            compressed_path = path.with_name(path.name + ".gz")
+            with open(path, "rb") as source, gzip.open(compressed_path, "wb") as target:
+                shutil.copyfileobj(source, target)
+            path.unlink()
+            self.paths[-1] = compressed_path
+
+    def _should_rotate(self) -> bool:
+        if self._file is None:
+            return False
+        if self.max_bytes is not None and self._file_bytes >= self.max_bytes:
+            return True
+        return (
+            self.rotate_interval is not None
+            and time.monotonic() - self._file_opened_at >= self.rotate_interval
+        )
+
+    def _write_line(self, line: str) -> None:
+        if self._should_rotate():
+            self._close_file()
+        if self._file is None:
+            self._open()
+        self._file.write(line)
+        self._file_bytes += len(line)
+
+    def _write(self, record: logging.LogRecord) -> None:
+        dropped = self.dropped
+        if dropped != self._reported_dropped:
+            notice = logging.LogRecord(
+                record.name, logging.WARNING, __file__, 0,
+                f"{dropped - self._reported_dropped} log record(s) dropped: log queue full", None, None,
+            )
+            self._reported_dropped = dropped
+            self._write_line(self.format(notice) + "\n")
+        self._write_line(self.format(record) + "\n")
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                try:
+                    if self._file is not None:
+                        self._file.flush()
+                        if self._should_rotate():
+                            self._close_file()
+                except Exception as e:
+                    print(f"Failed to write log file: {e}", file=sys.stderr)
+                continue
+            try:
+                if item is self._STOP:
+                    self._close_file()
+                    return
+                if isinstance(item, threading.Event):
+                    if self._file is not None:
+                        self._file.flush()
+                    item.set()
+                    continue
+                self._write(item)
+            except Exception as e:
+                print(f"Failed to write log file: {e}", file=sys.stderr)
+
+
+class _SSEStreamClosed(Exception):
+    """Raised to leave the SSE event loop when the server ends the stream."""
+
+
+# Shot requests always carry the same content type; rendered once at import time.
+_SHOT_HEADERS = CIMultiDict({"Content-Type": "application/json"})
+
+
+def _shot_float(name: str, value: Any) -> float:
+    """Return a shot parameter as a float, rejecting what the server cannot accept."""
+    if not isinstance(value, numbers.Real):
+        raise ValueError(f"{name} must be a real number, got {value!r}")
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"{name} must be finite, got {value!r}")
+    return value
+
+
+def _shot_values(
+    translational_velocity: Any,
+    shot_angle: Any,
+    angular_velocity: Any,
+) -> Tuple[float, float, Optional[float]]:
+    """Validate the shot parameters once per public call and return them as floats.
+    Plain finite floats (what the math module and the policies produce) pass with a single
+    check; anything else (ints, numpy scalars, strings) goes through _shot_float.
+    Raises:
+        ValueError: If a value is not a real number (strings included) or is nan/inf.
+    """
+    if (
+        type(translational_velocity) is float
+        and type(shot_angle) is float
+        and type(angular_velocity) is float
+        # x - x is nan for nan and inf, 0.0 otherwise
+        and (translational_velocity - translational_velocity) + (shot_angle - shot_angle)
+        + (angular_velocity - angular_velocity) == 0.0
+    ):
+        return translational_velocity, shot_angle, angular_velocity
+    return (
+        _shot_float("translational_velocity", translational_velocity),
+        _shot_float("shot_angle", shot_angle),
+        None if angular_velocity is None else _shot_float("angular_velocity", angular_velocity),
+    )
+
+
+def _render_shot_body(
+    translational_velocity: float,
+    shot_angle: float,
+    angular_velocity: Optional[float],
+) -> bytes:
+    """Render the ShotInfoModel JSON body directly from three floats.
+    Produces the same document as ``json.dumps(ShotInfoModel(...).model_dump())``
+    without building a model. The values must already have gone through _shot_values.
+    """
+    angular_value = "null" if angular_velocity is None else repr(angular_velocity)
+    return (
+        f'{{"translational_velocity":{translational_velocity!r},'
+        f'"angular_velocity":{angular_value},'
+        f'"shot_angle":{shot_angle!r}}}'
+    ).encode()
+
+
 class DCClient:
     """Initialize the DCClient.
         Args:
@@ -87,6 +358,40 @@ class DCClient:
             enable_tcp_keepalive (bool): Whether to enable TCP Keep-Alive. Defaults to True.
             auto_save_log (bool): Whether to enable log buffering and saving. Defaults to True.
             log_dir (str): Directory to save logs. Defaults to "logs".
+            log_queue_size (int): Maximum number of log records waiting to be written; further records
+                are dropped (and counted) instead of blocking. Defaults to 10000.
+            log_max_bytes (int | None): Rotate the log file after this many bytes. Defaults to 64 MiB.
+            log_rotate_interval (float | None): Rotate the log file after this many seconds. Defaults to None.
+            log_compress (bool): Gzip log files once they are rotated or closed. Defaults to False.
+            http_keepalive_timeout (float): Seconds an idle pooled HTTP connection is kept open. Defaults to 30.
+            http_connection_limit (int): Maximum number of pooled HTTP connections. Defaults to 4.
+            keep_shot_connection_warm (bool): Whether to keep a pooled connection to the shot endpoint open
+                while the match is running, with OPTIONS requests (see warm_shot_connection). Defaults to True.
+            enable_tracing (bool): Whether to record per-phase HTTP latency histograms. Defaults to False.
+            tracer (RequestTracer | None): Tracer to record into, e.g. one shared with a MatchMakerClient.
+                Implies enable_tracing. Defaults to None.
+            time_budget (TimeBudget | None): Deadline estimator fed with state arrival times and
+                HTTP round trips. Defaults to a new TimeBudget().
+            standard_end_count (int | None): Number of regular ends of the match (see ClientDataModel),
+                so that deadlines in extra ends use the extra-end remaining times. Set on time_budget.
+                Defaults to None (the regular remaining times are always used).
+            policy_executor (str): Pool used by run_policy, "thread" or "process". Defaults to "thread".
+            policy_workers (int): Number of run_policy workers. Defaults to 1.
+            logger (logging.Logger | None): Logger to write to. Defaults to ``logging.getLogger("DC_Client")``.
+                ``self.logger`` wraps it in a LoggerAdapter that adds ``match_id``, ``match_team_name`` and
+                ``dc_client`` (a per-client id) to every record, and the client's log file only takes the
+                records of its own client, so several clients in one process share the logger but not log files.
+            connector (aiohttp.BaseConnector | None): Connection pool shared with other clients
+                (e.g. by a MatchOrchestrator). The client does not close it. Defaults to None,
+                in which case the client creates its own connectors.
+
+        The client owns one keep-alive HTTP session shared by all POST requests.
+        Use it as an async context manager (``async with DCClient(...) as client:``)
+        or call :meth:`close` when done. Unlike the per-request sessions of earlier
+        versions, a client that is never closed keeps its pooled connections open
+        until it is garbage collected (aiohttp then warns about an unclosed session).
+        A client used from several event loops (e.g. successive ``asyncio.run`` calls)
+        opens a new session in each loop.
     """
     def __init__(
         self,
@@ -98,73 +403,362 @@ class DCClient:
         socket_read_timeout: Optional[int] = 15,
         enable_tcp_keepalive: bool = True,
         auto_save_log: bool = True,
-        log_dir: str = "logs" 
+        log_dir: str = "logs",
+        log_queue_size: int = 10000,
+        log_max_bytes: Optional[int] = 64 * 1024 * 1024,
+        log_rotate_interval: Optional[float] = None,
+        log_compress: bool = False,
+        http_keepalive_timeout: float = 30.0,
+        http_connection_limit: int = 4,
+        keep_shot_connection_warm: bool = True,
+        enable_tracing: bool = False,
+        tracer: Optional[RequestTracer] = None,
+        time_budget: Optional[TimeBudget] = None,
+        standard_end_count: Optional[int] = None,
+        policy_executor: str = "thread",
+        policy_workers: int = 1,
+        logger: Optional[logging.Logger] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
     ):
-        # Initialize internal logger
-        self.logger = logging.getLogger("DC_Client")
-        self.logger.propagate = False
+        self.match_id: UUID = match_id
+        self.match_team_name: MatchNameModel = match_team_name
+
+        # Initialize internal logger. All clients share one logger (no logger per match is
+        # left behind); the adapter tags records so that each log file gets its client's only.
+        self._client_id = next(_client_ids)
+        self.logger = logging.LoggerAdapter(
+            logger if logger is not None else logging.getLogger("DC_Client"),
+            {
+                "match_id": str(match_id),
+                "match_team_name": getattr(match_team_name, "value", match_team_name),
+                "dc_client": self._client_id,
+            },
+        )
         self.logger.setLevel(log_level)
 
-        # Initialize memory buffer handler for file saving
+        # Initialize background JSONL log writer for file saving
         self.auto_save_log = auto_save_log
         self.log_dir = Path(log_dir)
-        existing_memory_handler = next(
-            (h for h in self.logger.handlers if isinstance(h, MemoryBufferHandler)),
-            None,
-        )
-        if existing_memory_handler is None:
-            self.memory_handler = MemoryBufferHandler()
-            self.logger.addHandler(self.memory_handler)
-        else:
-            self.memory_handler = existing_memory_handler
+        # A caller-supplied logger may bring a JSONL handler of its own, which the client only flushes
+        self.log_handler: Optional[QueueJsonlFileHandler] = None
+        if logger is not None:
+            self.log_handler = next(
+                (
+                    h for h in logger.handlers
+                    if isinstance(h, QueueJsonlFileHandler)
+                    and h._thread.is_alive()
+                    and not any(isinstance(f, _ClientRecordFilter) for f in h.filters)
+                ),
+                None,
+            )
+        # Only the client that created the file handler stops it on close
+        self._owns_log_handler = self.log_handler is None and auto_save_log
+        if self._owns_log_handler:
+            self.log_handler = QueueJsonlFileHandler(
+                self._log_file_path,
+                max_queue_size=log_queue_size,
+                max_bytes=log_max_bytes,
+                rotate_interval=log_rotate_interval,
+                compress=log_compress,
+            )
+            self.log_handler.addFilter(_ClientRecordFilter(self._client_id))
+            self.logger.logger.addHandler(self.log_handler)
+        # Former name of log_handler; records are streamed to disk, not kept in memory
+        self.memory_handler: Optional[QueueJsonlFileHandler] = self.log_handler
 
-        self.match_id: UUID = match_id
-        self.match_team_name: MatchNameModel = match_team_name
         self.username: str = username
         self.password: str = password
-        self.state_data: StateSchema = None
+        self.state_data: Union[StateSchema, CompactState] = None
         self.winner_team: MatchNameModel = None
+        # Shots accepted by the server (see send_shot_info and submit_shot)
+        self.shots_sent: int = 0
 
         self.socket_read_timeout = socket_read_timeout
         self.enable_tcp_keepalive = enable_tcp_keepalive
 
+        # Shared keep-alive HTTP session (created lazily, see _get_session)
+        self.http_keepalive_timeout = http_keepalive_timeout
+        self.http_connection_limit = http_connection_limit
+        self.keep_shot_connection_warm = keep_shot_connection_warm
+        self.connector: Optional[aiohttp.BaseConnector] = connector
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._shot_request_url: Optional[Tuple[str, str, URL]] = None
+        self._warm_task: Optional[asyncio.Task] = None
+        # Session for hedged shot requests (see _post_hedged)
+        self._hedge_session: Optional[aiohttp.ClientSession] = None
+        # Futures waiting for the state to move past a given (end, shot, winner) key
+        self._state_waiters: List[Tuple[Tuple[Any, ...], asyncio.Future]] = []
+        # Key of the newest state read from the stream, and the number of running stream readers
+        self._latest_shot_key: Optional[Tuple[Any, ...]] = None
+        self._stream_readers: int = 0
+        # Id of the last SSE event seen, sent as Last-Event-Id to resume after a reconnect
+        self.last_event_id: str = ""
+        # Conflating receive mode bookkeeping (see receive_state_data(conflate=True))
+        self.last_skipped_updates: int = 0
+        self.total_skipped_updates: int = 0
+
+        # Opt-in HTTP latency tracing (see stats)
+        if tracer is None and enable_tracing:
+            tracer = RequestTracer()
+        self.tracer: Optional[RequestTracer] = tracer
+
+        # Thinking-time bookkeeping (see get_deadline)
+        self.time_budget: TimeBudget = time_budget if time_budget is not None else TimeBudget()
+        if standard_end_count is not None:
+            self.time_budget.standard_end_count = standard_end_count
+
+        # Off-loop policy execution (created lazily, see run_policy)
+        if policy_executor not in ("thread", "process"):
+            raise ValueError(f"policy_executor must be 'thread' or 'process', got {policy_executor!r}")
+        self.policy_executor = policy_executor
+        self.policy_workers = policy_workers
+        self._policy_pool: Optional[Executor] = None
+
         # Initialize URLs (defaults; can be overwritten by set_server_address)
         self.team_info_url = ""
         self.shot_info_url = ""
         self.sse_url = ""
         self.positioned_stones_url = ""
 
-    def save_log_file(self) -> None:
-        """Saves the buffered logs to a JSONL file."""
-        if not self.auto_save_log or not self.memory_handler.buffer:
-            return
+    async def __aenter__(self) -> "DCClient":
+        self._get_session()
+        return self
 
-        try:
-            self.log_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Generate file name including team name to avoid conflicts
-            team_name = self.match_team_name.value if self.match_team_name else "unknown"
-            if isinstance(team_name, MatchNameModel):
-                 team_name = team_name.value
-            
-            safe_team_name = str(team_name).replace(" ", "_")
-            current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_name = f"dc4_{safe_team_name}_{current_time}.jsonl"
-            file_path = self.log_dir / file_name
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
 
-            self.logger.debug(f"Saving log file to: {file_path}")
+    def _create_session(self, force_close: bool = False) -> aiohttp.ClientSession:
+        """Create an authenticated HTTP session with its own connector.
+        Args:
+            force_close (bool): Close each connection after one request (used for hedged requests).
+        """
+        if force_close:
+            connector = aiohttp.TCPConnector(force_close=True)
+        elif self.connector is not None:
+            connector = self.connector
+        else:
+            connector = aiohttp.TCPConnector(
+                limit=self.http_connection_limit,
+                keepalive_timeout=self.http_keepalive_timeout,
+                enable_cleanup_closed=True,
+                force_close=False,
+            )
+        # Authorization is rendered once here instead of per request
+        return aiohttp.ClientSession(
+            connector=connector,
+            connector_owner=connector is not self.connector,
+            headers={"Authorization": self._authorization_header()},
+            trace_configs=[self.tracer.trace_config()] if self.tracer is not None else None,
+        )
 
-            with open(file_path, "w", encoding="utf-8") as f:
-                for entry in self.memory_handler.buffer:
-                    f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
-            
-            # Print directly to stdout to ensure visibility
-            print(f"Log file saved successfully: {file_path}")
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it (and its connector) if needed.
+        A session left behind by another event loop (e.g. an earlier ``asyncio.run``)
+        cannot be used or closed from this one, so a new session replaces it.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = self._create_session()
+            self._session_loop = loop
+        return self._session
+
+    def _authorization_header(self) -> str:
+        """Return the Basic authorization header value for this client."""
+        credentials = f"{self.username}:{self.password}"
+        return f"Basic {base64.b64encode(credentials.encode()).decode()}"
+
+    def _get_shot_request_url(self) -> URL:
+        """Return the shot URL with match_id already in the query string.
+        The URL is built once and reused until shot_info_url or match_id changes.
+        """
+        cached = self._shot_request_url
+        match_id = str(self.match_id)
+        if cached is None or cached[0] != self.shot_info_url or cached[1] != match_id:
+            url = URL(self.shot_info_url).with_query(match_id=match_id)
+            cached = self._shot_request_url = (self.shot_info_url, match_id, url)
+        return cached[2]
+
+    async def rebuild_session(self) -> None:
+        """Drop the shared HTTP session and all pooled connections, then create a fresh one.
+        Called automatically when the server closes a pooled connection.
+        With a connector shared with other clients (see the ``connector`` argument) only the
+        session is replaced: the pooled connections belong to the shared connector and are not
+        dropped, since other clients may be using them. Stale ones are discarded by aiohttp
+        when it next tries to reuse them.
+        """
+        old_session = self._session
+        self._session = None
+        if old_session is not None and not old_session.closed:
+            await old_session.close()
+        self._get_session()
 
+    async def close(self) -> None:
+        """Close the shared HTTP session, stop the connection warm-up task and policy workers,
+        and flush the log file.
+        """
+        if self._warm_task is not None and not self._warm_task.done():
+            self._warm_task.cancel()
+            try:
+                await self._warm_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._warm_task = None
+        # A session of another (finished) event loop cannot be closed from this one
+        if (
+            self._session is not None
+            and not self._session.closed
+            and self._session_loop is asyncio.get_running_loop()
+        ):
+            await self._session.close()
+        self._session = None
+        if self._hedge_session is not None and not self._hedge_session.closed:
+            await self._hedge_session.close()
+        self._hedge_session = None
+        if self._policy_pool is not None:
+            self._policy_pool.shutdown(wait=False, cancel_futures=True)
+            self._policy_pool = None
+        if self.log_handler is not None:
+            # Wait for pending log records off the event loop; the writer thread
+            # is stopped (and the handler removed) by the client that started it
+            handler = self.log_handler
+            if self._owns_log_handler:
+                self.logger.logger.removeHandler(handler)
+                self.log_handler = self.memory_handler = None
+                await asyncio.get_running_loop().run_in_executor(None, handler.close)
+                self._log_saved(handler)
+            else:
+                await self.save_log_file_async()
+
+    async def warm_shot_connection(self) -> None:
+        """Open (or refresh) a pooled keep-alive connection to the shot endpoint,
+        so that the next shot POST does not pay for a TCP handshake.
+        This sends an OPTIONS request to the shot URL. Only the connection matters,
+        so any answer will do: a server without OPTIONS support replies 405, and the
+        connection is still pooled unless the server closes it (then aiohttp drops it
+        and the next shot opens a new one). Set ``keep_shot_connection_warm=False`` to
+        avoid these requests.
+        """
+        if not self.shot_info_url:
+            return
+        session = self._get_session()
+        try:
+            start = time.perf_counter()
+            async with session.options(
+                url=self.shot_info_url,
+                trace_request_ctx={"endpoint": "warm_up"},
+            ) as response:
+                # Read the body so the connection is released back to the pool
+                await response.read()
+                self.time_budget.record_round_trip(time.perf_counter() - start)
+            self.logger.debug("Shot connection warmed up.")
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            import sys
-            print(f"Failed to save log file: {e}", file=sys.stderr)
+            self.logger.debug(f"Failed to warm up shot connection: {e!r}")
+
+    def _schedule_warm_up(self) -> None:
+        """Warm the shot connection in the background (at most one warm-up in flight)."""
+        if not self.keep_shot_connection_warm:
+            return
+        if self._warm_task is not None and not self._warm_task.done():
+            return
+        self._warm_task = asyncio.create_task(self.warm_shot_connection())
 
+    async def _post(
+        self, url: Union[str, URL], endpoint: str, idempotent: bool = False, **kwargs: Any
+    ) -> Tuple[int, Any]:
+        """POST through the shared session and return (status, body).
+        If the connection could not be opened, the request is sent once more. If the
+        server dropped a pooled connection, the session is rebuilt; the request is only
+        sent again when it is idempotent, because the server may already have handled it.
+        Args:
+            url (str | URL): Request URL.
+            endpoint (str): Label used for latency tracing (e.g. "shot").
+            idempotent (bool): Whether sending the request twice is harmless. Defaults to False.
+        """
+        for attempt in range(2):
+            try:
+                return await self._post_once(self._get_session(), url, endpoint, **kwargs)
+            except aiohttp.client_exceptions.ClientConnectorError:
+                # Nothing was sent
+                if attempt > 0:
+                    raise
+            except (
+                aiohttp.client_exceptions.ServerDisconnectedError,
+                aiohttp.client_exceptions.ClientOSError,
+            ):
+                self.logger.warning("Pooled connection was dropped by server. Rebuilding HTTP session.")
+                await self.rebuild_session()
+                if attempt > 0 or not idempotent:
+                    raise
+
+    async def _post_once(
+        self,
+        session: aiohttp.ClientSession,
+        url: Union[str, URL],
+        endpoint: str,
+        **kwargs: Any,
+    ) -> Tuple[int, Any]:
+        """Send exactly one POST through the given session and return (status, body)."""
+        start = time.perf_counter()
+        async with session.post(
+            url=url, trace_request_ctx={"endpoint": endpoint}, **kwargs
+        ) as response:
+            body_start = time.perf_counter()
+            response_body = await self._read_response_body(response)
+            end = time.perf_counter()
+            self.time_budget.record_round_trip(end - start)
+            if self.tracer is not None:
+                self.tracer.record(endpoint, "body", end - body_start)
+                self.tracer.record(endpoint, "total", end - start)
+            return response.status, response_body
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return HTTP latency statistics recorded since the client was created.
+        Returns:
+            Dict[str, Dict[str, Any]]: ``{endpoint: {phase: {"count", "mean", "p50", "p95", "p99", "max"}}}``
+                with times in seconds, plus per-endpoint "errors" and "reused_connections" counters.
+                Empty when tracing is disabled.
+        """
+        if self.tracer is None:
+            return {}
+        return self.tracer.stats()
+
+    def _log_file_path(self) -> Path:
+        """Generate the log file path, including the team name and match_id to avoid conflicts."""
+        team_name = getattr(self.match_team_name, "value", self.match_team_name) or "unknown"
+        safe_team_name = str(team_name).replace(" ", "_")
+        current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return self.log_dir / f"dc4_{safe_team_name}_{current_time}_{self.match_id}.jsonl"
+
+    def save_log_file(self, timeout: float = 5.0) -> None:
+        """Write the logs recorded so far to the JSONL file.
+        Records are streamed to disk by a background thread; this returns once every
+        record logged before the call is on disk (or after ``timeout`` seconds). It
+        blocks the calling thread, so from async code use :meth:`save_log_file_async`.
+        Args:
+            timeout (float): Maximum number of seconds to wait. Defaults to 5.0.
+        """
+        if not self.auto_save_log or self.log_handler is None:
+            return
+        self.log_handler.flush(timeout)
+        self._log_saved(self.log_handler)
+
+    async def save_log_file_async(self, timeout: float = 5.0) -> None:
+        """Like :meth:`save_log_file`, but waits in an executor thread instead of blocking the event loop.
+        Args:
+            timeout (float): Maximum number of seconds to wait. Defaults to 5.0.
+        """
+        if not self.auto_save_log or self.log_handler is None:
+            return
+        handler = self.log_handler
+        await asyncio.get_running_loop().run_in_executor(None, handler.flush, timeout)
+        self._log_saved(handler)
+
+    def _log_saved(self, handler: QueueJsonlFileHandler) -> None:
+        if handler.paths:
+            self.logger.info(f"Log file saved successfully: {', '.join(str(path) for path in handler.paths)}")
 
     def set_server_address(self, host: str, port: int) -> None:
         """Set the server address for the client.
@@ -193,42 +787,41 @@ class DCClient:
             MatchNameModel: The assigned team name in the match.
         """
 
-        async with aiohttp.ClientSession(
-            auth=BasicAuth(login=self.username, password=self.password)
-        ) as session:
-            try:
-                async with session.post(
-                    url=self.team_info_url,
-                    params={
-                        "match_id": self.match_id,
-                        "expected_match_team_name": self.match_team_name.value,
-                    },
-                    json=team_info.model_dump(),
-                ) as response:
-                    response_body = await self._read_response_body(response)
-
-                    if response.status == 200:
-                        self.logger.debug("Team information successfully sent.")
-                        if isinstance(response_body, str):
-                            self.match_team_name = MatchNameModel(response_body)
-                        else:
-                            self.match_team_name = response_body
-                    elif response.status == 400:
-                        self.logger.error(
-                            f"Bad Request: status={response.status}, body={response_body}"
-                        )
-                    elif response.status == 401:
-                        self.logger.error(
-                            f"Unauthorized: status={response.status}, body={response_body}"
-                        )
-                    else:
-                        self.logger.error(
-                            f"Failed to send team information: status={response.status}, body={response_body}"
-                        )
-            except aiohttp.client_exceptions.ServerDisconnectedError:
-                self.logger.error("Server is not running. Please contact the administrator.")
-            except Exception as e:
-                self.logger.error(f"Failed to connect to server: {e}")
+        try:
+            status, response_body = await self._post(
+                self.team_info_url,
+                "team_info",
+                idempotent=True,
+                params={
+                    "match_id": str(self.match_id),
+                    "expected_match_team_name": self.match_team_name.value,
+                },
+                json=team_info.model_dump(),
+            )
+
+            if status == 200:
+                self.logger.debug("Team information successfully sent.")
+                if isinstance(response_body, str):
+                    self.match_team_name = MatchNameModel(response_body)
+                else:
+                    self.match_team_name = response_body
+                self.logger.extra["match_team_name"] = getattr(self.match_team_name, "value", self.match_team_name)
+            elif status == 400:
+                self.logger.error(
+                    f"Bad Request: status={status}, body={response_body}"
+                )
+            elif status == 401:
+                self.logger.error(
+                    f"Unauthorized: status={status}, body={response_body}"
+                )
+            else:
+                self.logger.error(
+                    f"Failed to send team information: status={status}, body={response_body}"
+                )
+        except aiohttp.client_exceptions.ServerDisconnectedError:
+            self.logger.error("Server is not running. Please contact the administrator.")
+        except Exception as e:
+            self.logger.error(f"Failed to connect to server: {e}")
 
         self.logger.debug(f"match_team_name: {self.match_team_name}")
 
@@ -246,13 +839,13 @@ class DCClient:
             vy (float): The y-component of the velocity of the stone.
             rotation (str): The rotation direction of the stone ("cw" for clockwise, "ccw" for counter-clockwise).
         """
-        translational_velocity = np.sqrt(vx**2 + vy**2)
-        shot_angle = np.arctan2(vy, vx)
-        angular_velocity = np.pi / 2
+        translational_velocity = math.hypot(vx, vy)
+        shot_angle = math.atan2(vy, vx)
+        angular_velocity = math.pi / 2
         if rotation == "cw":
-            angular_velocity = np.pi / 2
+            angular_velocity = math.pi / 2
         elif rotation == "ccw":
-            angular_velocity = -np.pi / 2
+            angular_velocity = -math.pi / 2
         else:
             pass
         await self.send_shot_info(
@@ -265,46 +858,266 @@ class DCClient:
         self,
         translational_velocity: float,
         shot_angle: float,
-        angular_velocity=np.pi / 2,
-    ):
+        angular_velocity=math.pi / 2,
+    ) -> bool:
         """Send shot information to the server.
+        The request body (same schema as ShotInfoModel) is written straight from
+        the three floats, and the URL and headers are prepared once per match.
+        This makes preparing a shot about 5x cheaper than building a ShotInfoModel,
+        but a whole shot POST only about 3x (see benchmarks/bench_shot_submission.py):
+        aiohttp's request handling is most of what remains.
+        The shot is sent once: if the connection is lost after the request was
+        written it is not resent, since the server may already have thrown it.
         Args:
             translational_velocity (float): The translational velocity of the stone.
             shot_angle (float): The shot angle of the stone in radians.
             angular_velocity (float): The angular velocity of the stone.
+        Returns:
+            bool: True if the server accepted the shot; failures are logged.
+        Raises:
+            ValueError: If a value is not a finite real number.
         """
-        shot_info = ShotInfoModel(
-            translational_velocity=translational_velocity,
-            angular_velocity=angular_velocity,
-            shot_angle=shot_angle,
+        body = _render_shot_body(*_shot_values(translational_velocity, shot_angle, angular_velocity))
+        try:
+            status, response_body = await self._post(
+                self._get_shot_request_url(),
+                "shot",
+                data=body,
+                headers=_SHOT_HEADERS,
+            )
+            # Successful response
+            if status == 200:
+                self.shots_sent += 1
+                self.logger.debug("Shot information successfully sent.")
+                return True
+            # Unauthorized access
+            elif status == 401:
+                self.logger.error(
+                    f"Unauthorized: status={status}, body={response_body}"
+                )
+            else:
+                self.logger.error(
+                    f"Failed to send shot information: status={status}, body={response_body}"
+                )
+        except aiohttp.client_exceptions.ClientConnectorError:
+            self.logger.error("Server is not running. Please contact the administrator.")
+        except (
+            aiohttp.client_exceptions.ServerDisconnectedError,
+            aiohttp.client_exceptions.ClientOSError,
+        ) as e:
+            # Not resent: the server may already have thrown the stone
+            self.logger.error(f"Connection lost while sending the shot, it may or may not have been accepted: {e!r}")
+        except Exception as e:
+            self.logger.error(f"An error occurred: {e}")
+        return False
+
+    @staticmethod
+    def _shot_key(state: Optional[Union[StateSchema, CompactState]]) -> Optional[Tuple[Any, ...]]:
+        """Identify the turn a state belongs to; it changes whenever a shot is accepted."""
+        if state is None:
+            return None
+        return (state.end_number, state.total_shot_number, state.winner_team)
+
+    def _wait_for_state_change(self, key: Optional[Tuple[Any, ...]]) -> asyncio.Future:
+        """Return a future resolved with the first received state whose turn differs from ``key``."""
+        future = asyncio.get_running_loop().create_future()
+        self._state_waiters.append((key, future))
+        return future
+
+    def _notify_state_waiters(self, state: Union[StateSchema, CompactState]) -> None:
+        """Resolve the waiters of _wait_for_state_change for a state that has just arrived."""
+        key = self._latest_shot_key = self._shot_key(state)
+        for waiter_key, waiter in self._state_waiters:
+            if key != waiter_key and not waiter.done():
+                waiter.set_result(state)
+
+    async def _post_hedged(self, url: URL, body: bytes, timeout: float) -> Tuple[int, Any]:
+        """Send the shot on a fresh, unpooled connection.
+        One session (closing every connection after its request) serves all hedged requests.
+        """
+        if self._hedge_session is None or self._hedge_session.closed:
+            self._hedge_session = self._create_session(force_close=True)
+        return await self._post_once(
+            self._hedge_session, url, "shot_hedge",
+            data=body, headers=_SHOT_HEADERS, timeout=aiohttp.ClientTimeout(total=timeout),
         )
-        
-        async with aiohttp.ClientSession(
-            auth=BasicAuth(login=self.username, password=self.password)
-        ) as session:
-            try:
-                async with session.post(
-                    url=self.shot_info_url,
-                    params={"match_id": self.match_id},
-                    json=shot_info.model_dump(),
-                ) as response:
-                    response_body = await self._read_response_body(response)
-                    # Successful response
-                    if response.status == 200:
+
+    async def _send_shot_attempt(
+        self,
+        url: URL,
+        body: bytes,
+        timeout: float,
+        hedge_after: Optional[float],
+    ) -> Tuple[int, Any]:
+        """Send one shot attempt, optionally hedged, and return the first response."""
+        primary = asyncio.create_task(
+            self._post_once(
+                self._get_session(), url, "shot",
+                data=body, headers=_SHOT_HEADERS, timeout=aiohttp.ClientTimeout(total=timeout),
+            )
+        )
+        if hedge_after is None or hedge_after >= timeout:
+            return await primary
+
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                self.logger.warning(
+                    f"No shot response after {hedge_after:.3f}s. Sending hedged request on a fresh connection."
+                )
+                tasks.add(asyncio.create_task(self._post_hedged(url, body, timeout - hedge_after)))
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        # First response wins
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def submit_shot(
+        self,
+        translational_velocity: float,
+        shot_angle: float,
+        angular_velocity: Optional[float] = math.pi / 2,
+        deadline: Optional[float] = None,
+        attempt_timeout: float = 1.0,
+        hedge_after: Optional[float] = None,
+        retry_interval: float = 0.05,
+    ) -> bool:
+        """Send shot information, retrying with short timeouts until a deadline.
+
+        Whether a failed or timed-out attempt was actually accepted is decided by
+        watching the SSE stream: once a state for a later turn arrives, the shot
+        counts as accepted and no further attempt is sent, so a retry never
+        throws twice. receive_state_data reads the stream in a background task, so
+        this also works from inside ``async for state in client.receive_state_data()``.
+        Without a running receive_state_data there is no way to tell, so an attempt
+        is then only retried if it never reached the server (connection refused);
+        any other failure returns False.
+
+        The shot is meant for the turn of ``state_data``. When an attempt's outcome
+        is unknown (timeout or dropped connection), the stream gets up to
+        ``attempt_timeout`` (capped at the deadline) to confirm it, since the server
+        still has to simulate the shot and broadcast the result. Nothing is sent
+        once the stream has moved past that turn: a later turn can be ours again
+        (the last stone of an end is often followed by the first of the next), and
+        the server would take the resend as a new throw.
+
+        Args:
+            translational_velocity (float): The translational velocity of the stone.
+            shot_angle (float): The shot angle of the stone in radians.
+            angular_velocity (float): The angular velocity of the stone.
+            deadline (float | None): ``time.monotonic()`` value after which no attempt is started.
+                Defaults to get_deadline(), or ``3 * attempt_timeout`` from now before the first state.
+            attempt_timeout (float): Timeout in seconds of a single attempt. Defaults to 1.0.
+            hedge_after (float | None): If set, send a second copy of a still-unanswered attempt on a
+                fresh connection after this many seconds; the first response wins. Defaults to None.
+            retry_interval (float): Seconds to wait before retrying an attempt the server answered without
+                accepting or never received. Defaults to 0.05.
+        Returns:
+            bool: True if the server accepted the shot before the deadline.
+        Raises:
+            ValueError: If a value is not a finite real number.
+        """
+        if deadline is None:
+            deadline = self.get_deadline()
+        if deadline is None:
+            deadline = time.monotonic() + 3 * attempt_timeout
+
+        body = _render_shot_body(*_shot_values(translational_velocity, shot_angle, angular_velocity))
+        url = self._get_shot_request_url()
+        # The turn this shot is for; the stream may already be ahead of the consumer
+        target_key = self._shot_key(self.state_data) if self.state_data is not None else self._latest_shot_key
+        accepted = self._wait_for_state_change(target_key)
+        attempt = 0
+        attempt_task: Optional[asyncio.Task] = None
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if accepted.done() or (attempt and self._latest_shot_key != target_key):
+                    self.shots_sent += 1
+                    self.logger.debug("Shot acceptance confirmed by state update.")
+                    return True
+                if self._latest_shot_key != target_key:
+                    self.logger.error("The state has moved past the turn this shot was for; not sending it.")
+                    return False
+                if remaining <= 0:
+                    self.logger.error(f"Shot not accepted before deadline after {attempt} attempt(s).")
+                    return False
+
+                attempt += 1
+                rejected = False
+                # Whether the server may have received this attempt, and whether it answered
+                sent = True
+                answered = False
+                attempt_task = asyncio.create_task(
+                    self._send_shot_attempt(url, body, min(attempt_timeout, remaining), hedge_after)
+                )
+                # Stop waiting for the response as soon as the stream confirms the shot
+                await asyncio.wait({attempt_task, accepted}, return_when=asyncio.FIRST_COMPLETED)
+                if not attempt_task.done():
+                    attempt_task.cancel()
+                    self.shots_sent += 1
+                    self.logger.debug("Shot acceptance confirmed by state update.")
+                    return True
+                try:
+                    status, response_body = attempt_task.result()
+                except asyncio.CancelledError:
+                    raise
+                except aiohttp.client_exceptions.ClientConnectorError as e:
+                    sent = False
+                    self.logger.warning(f"Shot attempt {attempt} could not connect: {e!r}")
+                except (
+                    aiohttp.client_exceptions.ServerDisconnectedError,
+                    aiohttp.client_exceptions.ClientOSError,
+                ) as e:
+                    self.logger.warning(f"Shot attempt {attempt} lost connection: {e!r}. Rebuilding HTTP session.")
+                    await self.rebuild_session()
+                except Exception as e:
+                    self.logger.warning(f"Shot attempt {attempt} failed: {e!r}")
+                else:
+                    answered = True
+                    if status == 200:
+                        self.shots_sent += 1
                         self.logger.debug("Shot information successfully sent.")
-                    # Unauthorized access
-                    elif response.status == 401:
-                        self.logger.error(
-                            f"Unauthorized: status={response.status}, body={response_body}"
-                        )
-                    else:
-                        self.logger.error(
-                            f"Failed to send shot information: status={response.status}, body={response_body}"
-                        )
-            except aiohttp.client_exceptions.ServerDisconnectedError:
-                self.logger.error("Server is not running. Please contact the administrator.")
-            except Exception as e:
-                self.logger.error(f"An error occurred: {e}")
+                        return True
+                    self.logger.warning(
+                        f"Shot attempt {attempt} rejected: status={status}, body={response_body}"
+                    )
+                    # A 4xx (other than timeout/throttling) will not succeed on retry, unless an
+                    # earlier attempt was in fact accepted and the stream is about to say so.
+                    rejected = 400 <= status < 500 and status not in (408, 429)
+
+                if sent and not answered and not self._stream_readers:
+                    # Nothing can confirm or rule out that the server took this attempt
+                    self.logger.error(
+                        f"Shot attempt {attempt} outcome unknown and no state stream is running; not retrying."
+                    )
+                    return False
+
+                # An answered or unsent attempt only needs a short pause; when the outcome is unknown
+                # the server may still be simulating the shot, so give the stream a full attempt
+                grace = retry_interval if answered or not sent else attempt_timeout
+                grace = min(grace, deadline - time.monotonic())
+                if grace > 0:
+                    try:
+                        await asyncio.wait_for(asyncio.shield(accepted), grace)
+                    except asyncio.TimeoutError:
+                        pass
+                if rejected and not accepted.done():
+                    self.logger.error("Shot rejected by server.")
+                    return False
+        finally:
+            if attempt_task is not None and not attempt_task.done():
+                attempt_task.cancel()
+            accepted.cancel()
+            self._state_waiters = [(key, waiter) for key, waiter in self._state_waiters if waiter is not accepted]
 
     # This method is for mix doubles positioned stones info
     async def send_positioned_stones_info(
@@ -319,65 +1132,215 @@ class DCClient:
         """
         url = f"{self.positioned_stones_url}/{self.match_id}/end-setup"
 
-        async with aiohttp.ClientSession(
-            auth=BasicAuth(login=self.username, password=self.password)
-        ) as session:
+        try:
+            status, response_body = await self._post(
+                url,
+                "positioned_stones",
+                params={
+                    "match_id": str(self.match_id),
+                    "request": positioned_stones.value,
+                },
+            )
+            # Successful response
+            if status == 200:
+                self.logger.debug("Positioned stones information successfully sent.")
+            # Bad Request
+            elif status == 400:
+                self.logger.error(
+                    f"Bad Request: status={status}, body={response_body}"
+                )
+            # Unauthorized access
+            elif status == 401:
+                self.logger.error(
+                    f"Unauthorized: status={status}, body={response_body}"
+                )
+            # Conflict error
+            elif status == 409:
+                self.logger.error(
+                    f"Conflict: status={status}, body={response_body}"
+                )
+            # Other errors
+            else:
+                self.logger.error(
+                    f"Failed to send positioned stones information: status={status}, body={response_body}"
+                )
+        except aiohttp.client_exceptions.ServerDisconnectedError:
+            self.logger.error("Server is not running. Please contact the administrator.")
+        except Exception as e:
+            self.logger.error(f"An error occurred: {e}")
+
+    @staticmethod
+    def _parse_state_schema(payload: Dict[str, Any]) -> StateSchema:
+        return StateSchema(**payload)
+
+    def feed_state(
+        self,
+        state: Union[StateSchema, CompactState],
+        received_at: Optional[float] = None,
+        warm: bool = False,
+    ) -> None:
+        """Update the client with a state that did not come from its own stream, e.g. from a
+        MatchReplay, so that the getters, get_deadline and run_policy work on it.
+        Args:
+            state (StateSchema | CompactState): The state.
+            received_at (float | None): ``time.monotonic()`` value the state counts as arrived at,
+                e.g. its recorded time mapped onto this clock. Defaults to now.
+            warm (bool): Whether to keep the shot connection warm on the opponent's turn, as for a
+                streamed state. Defaults to False, so feeding states sends nothing to the server.
+        """
+        self._on_state_received(state, received_at, warm=warm)
+
+    def _on_state_received(
+        self,
+        state: Union[StateSchema, CompactState],
+        received_at: Optional[float] = None,
+        notify: bool = True,
+        warm: bool = True,
+    ) -> None:
+        """Update client-side bookkeeping for a newly received state.
+        Args:
+            state (StateSchema): The received state.
+            received_at (float | None): ``time.monotonic()`` when the event arrived. Defaults to now.
+            notify (bool): Whether to resolve submit_shot's waiters; False when the stream reader
+                already did so on arrival. Defaults to True.
+            warm (bool): Whether to schedule a shot connection warm-up on the opponent's turn. Defaults to True.
+        """
+        self.state_data = state
+        self.time_budget.record_state(state, received_at)
+        if notify:
+            self._notify_state_waiters(state)
+        if warm and state.winner_team is None and state.next_shot_team != self.match_team_name:
+            # The opponent is throwing: make sure our next shot POST finds an open socket.
+            self._schedule_warm_up()
+
+    @staticmethod
+    def _on_sse_error(event_source: client.EventSource) -> None:
+        """EventSource error callback.
+        When the server ends an open stream, EventSource would sleep and reconnect on
+        its own; raise instead so receive_state_data decides how to reconnect.
+        Connection failures are left to EventSource, which raises them itself.
+        """
+        if event_source.ready_state == client.READY_STATE_CONNECTING:
+            raise _SSEStreamClosed()
+
+    async def _receive_latest_state(
+        self, compact: bool
+    ) -> AsyncGenerator[Union[StateSchema, CompactState], None]:
+        """Drain the SSE stream in a background task and yield only the newest state."""
+        latest: List[Union[StateSchema, CompactState]] = []
+        skipped = 0
+        state_ready = asyncio.Event()
+
+        async def reader() -> None:
+            nonlocal skipped
+            async for state, received_at in self._read_state_stream(compact):
+                self._on_state_received(state, received_at, notify=False)
+                if latest:
+                    # The consumer has not taken the previous state yet: overwrite it
+                    skipped += 1
+                    latest[0] = state
+                else:
+                    latest.append(state)
+                state_ready.set()
+
+        reader_task = asyncio.create_task(reader())
+        try:
+            while True:
+                ready_task = asyncio.ensure_future(state_ready.wait())
+                try:
+                    await asyncio.wait({ready_task, reader_task}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    ready_task.cancel()
+                if not latest:
+                    # The reader stopped without a pending state
+                    reader_task.result()
+                    return
+                state = latest.pop()
+                state_ready.clear()
+                self.last_skipped_updates = skipped
+                self.total_skipped_updates += skipped
+                if skipped:
+                    self.logger.debug(f"Skipped {skipped} stale state update(s).")
+                skipped = 0
+                yield state
+        finally:
+            reader_task.cancel()
             try:
-                async with session.post(
-                    url=url,
-                    params={
-                        "match_id": self.match_id,
-                        "request": positioned_stones.value,
-                    },
-                ) as response:
-                    response_body = await self._read_response_body(response)
-                    # Successful response
-                    if response.status == 200:
-                        self.logger.debug("Positioned stones information successfully sent.")
-                    # Bad Request
-                    elif response.status == 400:
-                        self.logger.error(
-                            f"Bad Request: status={response.status}, body={response_body}"
-                        )
-                    # Unauthorized access
-                    elif response.status == 401:
-                        self.logger.error(
-                            f"Unauthorized: status={response.status}, body={response_body}"
-                        )
-                    # Conflict error
-                    elif response.status == 409:
-                        self.logger.error(
-                            f"Conflict: status={response.status}, body={response_body}"
-                        )
-                    # Other errors
-                    else:
-                        self.logger.error(
-                            f"Failed to send positioned stones information: status={response.status}, body={response_body}"
-                        )
-            except aiohttp.client_exceptions.ServerDisconnectedError:
-                self.logger.error("Server is not running. Please contact the administrator.")
-            except Exception as e:
-                self.logger.error(f"An error occurred: {e}")
+                await reader_task
+            except (asyncio.CancelledError, Exception):
+                pass
 
-    async def receive_state_data(self) -> AsyncGenerator[StateSchema, None]:
+    async def receive_state_data(
+        self, compact: bool = False, conflate: bool = False
+    ) -> AsyncGenerator[Union[StateSchema, CompactState], None]:
         """
         Robust SSE receiver with:
           - explicit reconnect loop (exponential backoff + jitter)
           - Authorization header (Basic) for wider compatibility
           - TCP connector with keepalive options
           - clear logging for connect / disconnect / parse errors
+        The stream is read by a background task, so it keeps being read (and
+        submit_shot keeps seeing shot confirmations) while the consumer is busy
+        with a state; states that arrive meanwhile are queued and yielded in order.
+        state_data is updated as each state is yielded.
+        Args:
+            compact (bool): Yield array-backed CompactState objects instead of StateSchema. Defaults to False.
+            conflate (bool): Always yield only the newest state, dropping intermediate ones that
+                arrived while the consumer was busy. The number of dropped updates is available as
+                last_skipped_updates / total_skipped_updates. Defaults to False.
         """
+        if conflate:
+            async for state in self._receive_latest_state(compact):
+                yield state
+            return
+
+        pending: "asyncio.Queue[Optional[Tuple[Union[StateSchema, CompactState], float]]]" = asyncio.Queue()
+
+        async def reader() -> None:
+            try:
+                async for item in self._read_state_stream(compact):
+                    pending.put_nowait(item)
+            finally:
+                pending.put_nowait(None)
+
+        reader_task = asyncio.create_task(reader())
+        try:
+            while True:
+                item = await pending.get()
+                if item is None:
+                    # The reader stopped: raise its error, if any
+                    await reader_task
+                    return
+                state, received_at = item
+                self._on_state_received(state, received_at, notify=False)
+                yield state
+        finally:
+            reader_task.cancel()
+            try:
+                await reader_task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    async def _read_state_stream(
+        self, compact: bool
+    ) -> AsyncGenerator[Tuple[Union[StateSchema, CompactState], float], None]:
+        """Read the SSE stream, reconnecting as needed, and yield ``(state, received_at)`` pairs.
+        submit_shot's waiters are resolved as soon as a state arrives.
+        """
+        if compact:
+            from dc4client.compact_state import CompactState
+            parse_state = CompactState.from_payload
+        else:
+            parse_state = self._parse_state_schema
         # Note: 'base64' and 'random' are now imported at the top of the file
         
         url = f"{self.sse_url}/{self.match_id}/stream"
         self.logger.info(f"SSE loop start -> {url}")
 
         # Basic auth header construction
-        credentials = f"{self.username}:{self.password}"
-        b64 = base64.b64encode(credentials.encode()).decode()
         headers = {
             "Accept": "text/event-stream",
-            "Authorization": f"Basic {b64}",
+            "Authorization": self._authorization_header(),
         }
 
         # Application level timeout (Socket Read Timeout)
@@ -391,32 +1354,45 @@ class DCClient:
         consecutive_auth_errors = 0
         AUTH_ERROR_THRESHOLD = 5
 
-        while True:
-            self.logger.info(f"Attempting SSE connect (next retry in approx {backoff:.1f}s if fail)")
-            
-            # Create a new connector and session on each loop iteration
-            connector = None
-            if self.enable_tcp_keepalive:
-                connector = aiohttp.TCPConnector(
-                    ssl=False,
-                    enable_cleanup_closed=True,
-                    keepalive_timeout=30,
-                    force_close=False,
+        # One connector and session for the whole loop, reused by every reconnect
+        connector = self.connector
+        if connector is None and self.enable_tcp_keepalive:
+            connector = aiohttp.TCPConnector(
+                ssl=False,
+                enable_cleanup_closed=True,
+                keepalive_timeout=30,
+                force_close=False,
+            )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            connector_owner=connector is None or connector is not self.connector,
+            timeout=timeout_settings,
+        )
+
+        self._stream_readers += 1
+        try:
+            while True:
+                self.logger.info(f"Attempting SSE connect (next retry in approx {backoff:.1f}s if fail)")
+
+                # Resume from the last event we saw
+                request_headers = dict(headers)
+                if self.last_event_id:
+                    request_headers["Last-Event-Id"] = self.last_event_id
+
+                event_source = client.EventSource(
+                    url=url,
+                    headers=request_headers,
+                    session=session, # Pass the session here
+                    reconnection_time=timedelta(0),
+                    max_connect_retry=0,
+                    on_error=lambda: self._on_sse_error(event_source),
                 )
+                has_received_valid_data = False
+
+                try:
+                    async with event_source as sse_client:
 
-            try:
-                # Create the session first and pass it into EventSource
-                async with aiohttp.ClientSession(connector=connector, timeout=timeout_settings) as session:
-                    async with client.EventSource(
-                        url=url,
-                        headers=headers,
-                        session=session, # Pass the session here
-                        reconnection_time=1,
-                        max_connect_retry=None,
-                    ) as sse_client:
-                        
                         self.logger.debug("SSE connection established.")
-                        has_received_valid_data = False
 
                         async for event in sse_client:
                             if not has_received_valid_data:
@@ -425,21 +1401,24 @@ class DCClient:
                                 has_received_valid_data = True
                                 self.logger.debug("First packet received. Backoff reset.")
 
+                            received_at = time.monotonic()
+                            if event.last_event_id:
+                                self.last_event_id = event.last_event_id
                             try:
                                 payload = json.loads(event.data) if event.data else None
 
                                 if event.type == "latest_state_update" and payload is not None:
-                                    latest_state = StateSchema(**payload)
-                                    self.state_data = latest_state
-                                    # Log state data here. 
-                                    self.logger.info(f"latest_state_data: {latest_state}")
-                                    yield latest_state
+                                    latest_state = parse_state(payload)
+                                    self._notify_state_waiters(latest_state)
+                                    # Log state data here (formatted on the log writer thread).
+                                    self.logger.info("latest_state_data: %s", latest_state)
+                                    yield latest_state, received_at
 
                                 elif event.type == "state_update" and payload is not None:
-                                    state = StateSchema(**payload)
-                                    self.state_data = state
-                                    self.logger.info(f"state_data: {state}")
-                                    yield state
+                                    state = parse_state(payload)
+                                    self._notify_state_waiters(state)
+                                    self.logger.info("state_data: %s", state)
+                                    yield state, received_at
 
                             except asyncio.CancelledError:
                                 self.logger.debug("receive_state_data cancelled during processing.")
@@ -448,51 +1427,143 @@ class DCClient:
                                 self.logger.exception("Failed to parse/handle SSE event data")
                                 continue
 
-                # Exited async for => server closed the stream normally
-                self.logger.warning("SSE stream closed by server. Reconnecting...")
+                    # Exited async for => server answered 204 (no content)
+                    raise _SSEStreamClosed()
+
+                except _SSEStreamClosed:
+                    if has_received_valid_data:
+                        # Graceful close of a healthy stream: resume right away
+                        self.logger.warning("SSE stream closed by server. Reconnecting immediately.")
+                        continue
+                    # Closed before delivering anything: do not hammer the server
+                    sleep_time = backoff + random.uniform(0, 0.5 * backoff)
+                    self.logger.warning(f"SSE stream closed without data. Reconnecting in {sleep_time:.2f}s")
+                    await asyncio.sleep(sleep_time)
+                    backoff = min(max_backoff, backoff * 2)
 
-            except asyncio.CancelledError:
-                self.logger.warning("receive_state_data cancelled; exiting loop.")
-                raise
+                except asyncio.CancelledError:
+                    self.logger.debug("SSE reader stopped; exiting loop.")
+                    raise
 
-            except aiohttp.ClientResponseError as e:
-                status = getattr(e, "status", None)
-                self.logger.warning(f"ClientResponseError: status={status}; {e}")
+                except aiohttp.ClientResponseError as e:
+                    status = getattr(e, "status", None)
+                    self.logger.warning(f"ClientResponseError: status={status}; {e}")
                 
-                if status in (401, 403):
-                    consecutive_auth_errors += 1
-                    self.logger.warning(f"Auth error count: {consecutive_auth_errors}")
-                    if consecutive_auth_errors >= AUTH_ERROR_THRESHOLD:
-                        backoff = min(max_backoff, backoff * 4)
-                        self.logger.error("Too many auth errors. Check credentials.")
+                    if status in (401, 403):
+                        consecutive_auth_errors += 1
+                        self.logger.warning(f"Auth error count: {consecutive_auth_errors}")
+                        if consecutive_auth_errors >= AUTH_ERROR_THRESHOLD:
+                            backoff = min(max_backoff, backoff * 4)
+                            self.logger.error("Too many auth errors. Check credentials.")
                 
-                sleep_time = backoff + random.uniform(0, 0.5 * backoff)
-                await asyncio.sleep(sleep_time)
-                backoff = min(max_backoff, backoff * 2)
+                    sleep_time = backoff + random.uniform(0, 0.5 * backoff)
+                    await asyncio.sleep(sleep_time)
+                    backoff = min(max_backoff, backoff * 2)
 
-            except (
-                TimeoutError,
-                asyncio.TimeoutError,
-                aiohttp.client_exceptions.ServerTimeoutError,
-                aiohttp.client_exceptions.ClientPayloadError,
-                aiohttp.client_exceptions.ClientConnectorError,
-                aiohttp.client_exceptions.ClientConnectionError,
-                aiohttp.client_exceptions.ClientOSError,
-                OSError,
-                aiohttp.client_exceptions.ServerDisconnectedError,
-            ) as e:
-                sleep_time = backoff + random.uniform(0, 0.5 * backoff)
-                self.logger.warning(f"Network error: {e!r}. Reconnecting in {sleep_time:.2f}s")
+                except (
+                    TimeoutError,
+                    asyncio.TimeoutError,
+                    aiohttp.client_exceptions.ServerTimeoutError,
+                    aiohttp.client_exceptions.ClientPayloadError,
+                    aiohttp.client_exceptions.ClientConnectorError,
+                    aiohttp.client_exceptions.ClientConnectionError,
+                    aiohttp.client_exceptions.ClientOSError,
+                    OSError,
+                    aiohttp.client_exceptions.ServerDisconnectedError,
+                ) as e:
+                    sleep_time = backoff + random.uniform(0, 0.5 * backoff)
+                    self.logger.warning(f"Network error: {e!r}. Reconnecting in {sleep_time:.2f}s")
                 
-                await asyncio.sleep(sleep_time)
-                backoff = min(max_backoff, backoff * 2)
+                    await asyncio.sleep(sleep_time)
+                    backoff = min(max_backoff, backoff * 2)
 
-            except Exception as e:
-                sleep_time = backoff + random.uniform(0, 0.5 * backoff)
-                self.logger.exception(f"Unexpected error: {e!r}. Reconnecting in {sleep_time:.2f}s")
+                except Exception as e:
+                    sleep_time = backoff + random.uniform(0, 0.5 * backoff)
+                    self.logger.exception(f"Unexpected error: {e!r}. Reconnecting in {sleep_time:.2f}s")
                 
-                await asyncio.sleep(sleep_time)
-                backoff = min(max_backoff, backoff * 2)
+                    await asyncio.sleep(sleep_time)
+                    backoff = min(max_backoff, backoff * 2)
+
+        finally:
+            self._stream_readers -= 1
+            await session.close()
+
+    def _get_policy_pool(self) -> Executor:
+        if self._policy_pool is None:
+            if self.policy_executor == "process":
+                self._policy_pool = ProcessPoolExecutor(max_workers=self.policy_workers)
+            else:
+                self._policy_pool = ThreadPoolExecutor(
+                    max_workers=self.policy_workers, thread_name_prefix="dc4-policy"
+                )
+        return self._policy_pool
+
+    async def run_policy(
+        self,
+        decide: Callable[[Any, Optional[float]], Tuple[float, float, float]],
+        state: Optional[Union[StateSchema, CompactState]] = None,
+        deadline: Optional[float] = None,
+        fallback: Optional[Tuple[float, float, float]] = None,
+        executor: Optional[Executor] = None,
+    ) -> Optional[Tuple[float, float, float]]:
+        """Run a CPU-bound decision function off the event loop, under a deadline.
+
+        While ``decide`` runs in a worker thread or process, the event loop stays
+        free, so receive_state_data keeps reading the SSE socket (no
+        socket_read_timeout drop mid-turn) and HTTP keep-alive continues.
+
+        A running ``decide`` cannot be interrupted, so it must itself return by
+        the ``deadline`` it is given. If it does not, the fallback is returned and
+        the client's pool is replaced, so the next turn does not queue behind the
+        late call; that call keeps its worker busy until it returns.
+
+        Args:
+            decide (Callable): Called as ``decide(state, deadline)`` in a worker and returns
+                ``(translational_velocity, shot_angle, angular_velocity)``. ``deadline`` is a
+                ``time.monotonic()`` value (or None) an anytime search should poll and honour. With the
+                "process" executor it must be picklable (e.g. a top-level function).
+            state (StateSchema | CompactState | None): The state to decide on. Defaults to the latest state.
+            deadline (float | None): ``time.monotonic()`` value to wait until. Defaults to get_deadline().
+            fallback (Tuple[float, float, float] | None): Returned if ``decide`` misses the deadline or fails.
+            executor (Executor | None): Executor to run on instead of the client's own pool.
+        Returns:
+            Optional[Tuple[float, float, float]]: The shot to submit, e.g. ``await client.submit_shot(*shot)``.
+        """
+        if state is None:
+            state = self.state_data
+        if deadline is None:
+            deadline = self.get_deadline()
+        loop = asyncio.get_running_loop()
+        pool = executor or self._get_policy_pool()
+        future = loop.run_in_executor(pool, decide, state, deadline)
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning("Policy missed its deadline; using fallback shot.")
+            if pool is self._policy_pool:
+                # The late call still occupies a worker: give later turns a fresh pool
+                self.logger.warning("Replacing the policy pool; decide should return by its deadline.")
+                self._policy_pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.logger.exception("Policy failed; using fallback shot.")
+        return fallback
+
+    def get_deadline(self, shots_left: Optional[int] = None) -> Optional[float]:
+        """Get the local ``time.monotonic()`` value by which our shot must be submitted.
+        Args:
+            shots_left (int | None): When given, spread the remaining time over this many shots
+                instead of returning the hard deadline.
+        Returns:
+            Optional[float]: The deadline, or None before the first state arrives.
+        """
+        team = getattr(self.match_team_name, "value", self.match_team_name)
+        if shots_left is None:
+            return self.time_budget.deadline(team)
+        return self.time_budget.planned_deadline(team, shots_left)
 
     def get_end_number(self):
         """Get the current end number from the state data."""
@@ -503,23 +1574,51 @@ class DCClient:
         return self.state_data.total_shot_number
 
     def get_score(self):
-        """Get the current score from the state data."""
+        """Get the current score from the state data.
+        Returns:
+            Optional[Tuple[list, list]]: Per-end scores of team0 and team1, or None if the
+                state has no score. The same for StateSchema and CompactState states.
+        """
         score = self.state_data.score
-        return score.first_team_score, score.second_team_score
+        if score is None:
+            return None
+        if isinstance(score, dict):
+            # CompactState keeps the score as sent by the server
+            return score["team0"], score["team1"]
+        return score.team0, score.team1
 
     def get_next_team(self):
         """Get the next team to shot from the state data."""
         return self.state_data.next_shot_team
 
     def get_last_move(self):
-        """Get the last move information from the state data."""
-        return self.state_data.last_move
+        """Get the last move information from the state data.
+        Returns:
+            Optional[ShotInfoSchema]: The last shot, or None before the first one. A CompactState's
+                ``(translational_velocity, angular_velocity, shot_angle)`` tuple is converted.
+        """
+        last_move = self.state_data.last_move
+        if isinstance(last_move, tuple):
+            translational_velocity, angular_velocity, shot_angle = last_move
+            return ShotInfoSchema.model_construct(
+                translational_velocity=translational_velocity,
+                angular_velocity=angular_velocity,
+                shot_angle=shot_angle,
+            )
+        return last_move
 
     def get_winner_team(self):
         """Get the winner team from the state data."""
         winner_team = self.state_data.winner_team
         return winner_team
 
+    def get_board_features(self) -> BoardFeatures:
+        """Get vectorized board features (distances, house/guard masks, shot rock, counting stones)
+        of the current state. Computed once per state.
+        """
+        from dc4client.board import board_features
+        return board_features(self.state_data)
+
     def get_stone_coordinates(self):
         """Get the stone coordinates for both teams from the state data.
         Returns:
@@ -528,6 +1627,9 @@ class DCClient:
                 The first list contains the coordinates of team0's stones,
                 and the second list contains the coordinates of team1's stones.
         """
+        if not isinstance(self.state_data, StateSchema):
+            # CompactState
+            return self.state_data.stone_coordinates()
         # Access the nested data properly from the StoneCoordinateSchema instance
         stone_coordinate_data = self.state_data.stone_coordinate.data
         # Extract coordinates for each team
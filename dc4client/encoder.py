@@ -0,0 +1,199 @@
+from typing import Any, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from dc4client.board import BACK_LINE_Y, HOG_LINE_Y, NO_TEAM, SIDE_LINE_X, TEAM0, TEAM1
+from dc4client.compact_state import CompactState, StateCache, stone_array
+from dc4client.receive_data import StateSchema
+
+
+__all__ = ["SCALAR_FEATURES", "score_difference", "hammer_team", "StateEncoder"]
+
+
+# Names of the scalar features, in the order they appear in the scalar vector.
+SCALAR_FEATURES = (
+    "end_number",
+    "shot_number",
+    "total_shot_number",
+    "next_shot_is_team0",
+    "hammer_is_team0",
+    "first_team_remaining_time",
+    "second_team_remaining_time",
+    "first_team_extra_end_remaining_time",
+    "second_team_extra_end_remaining_time",
+    "team0_score",
+    "team1_score",
+    "score_difference",
+    "is_mix_doubles",
+    "positioned_stones_pattern",
+    "team0_power_play_end",
+    "team1_power_play_end",
+    "team0_stones_in_play",
+    "team1_stones_in_play",
+)
+
+
+def _field(value: Any, name: str) -> Any:
+    """Read a field from a pydantic model or a plain dict (CompactState keeps raw dicts)."""
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return value.get(name)
+    return getattr(value, name, None)
+
+
+def _score_total(score: Any, team: str) -> float:
+    return float(sum(points for points in (_field(score, team) or ()) if points is not None))
+
+
+def score_difference(state: Union[StateSchema, CompactState]) -> float:
+    """Total score of team0 minus total score of team1."""
+    return _score_total(state.score, "team0") - _score_total(state.score, "team1")
+
+
+def hammer_team(state: Union[StateSchema, CompactState]) -> int:
+    """Return the team with the last stone of the current end (TEAM0/TEAM1), or NO_TEAM if unknown."""
+    if state.next_shot_team is None:
+        return NO_TEAM
+    next_team = TEAM0 if state.next_shot_team == "team0" else TEAM1
+    # Teams alternate, so the team throwing first this end is known from the parity
+    return next_team if (state.total_shot_number or 0) % 2 else 1 - next_team
+
+
+class StateEncoder:
+    """Encode states into image-like planes plus a scalar feature vector for ML policies.
+
+    Planes have shape ``(2, height, width)``: channel 0 marks team0 stones and
+    channel 1 team1 stones (one-hot on the grid cell containing the stone's
+    centre) over the area ``x_range`` x ``y_range`` of the sheet; row 0 starts
+    at ``y_range[0]`` and column 0 at ``x_range[0]``. Scalars are
+    float32 in the order of :data:`SCALAR_FEATURES`; remaining times are
+    divided by ``time_scale``. Everything is written into preallocated float32
+    buffers, and single-state encodings are cached per state instance.
+
+        Args:
+            height (int): Grid cells along y. Defaults to 64.
+            width (int): Grid cells along x. Defaults to 32.
+            x_range (Tuple[float, float]): Sheet x extent covered by the planes. Defaults to the side lines.
+            y_range (Tuple[float, float]): Sheet y extent covered by the planes. Defaults to hog line to back line.
+            time_scale (float): Divisor applied to remaining times. Defaults to 1.0 (seconds).
+    """
+
+    def __init__(
+        self,
+        height: int = 64,
+        width: int = 32,
+        x_range: Tuple[float, float] = (-SIDE_LINE_X, SIDE_LINE_X),
+        y_range: Tuple[float, float] = (HOG_LINE_Y, BACK_LINE_Y),
+        time_scale: float = 1.0,
+    ):
+        self.height = height
+        self.width = width
+        self.x_range = x_range
+        self.y_range = y_range
+        self.time_scale = time_scale
+        self._cache = StateCache()
+
+    @property
+    def plane_shape(self) -> Tuple[int, int, int]:
+        return (2, self.height, self.width)
+
+    @property
+    def scalar_size(self) -> int:
+        return len(SCALAR_FEATURES)
+
+    def allocate(self, batch_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Allocate zeroed ``(N, 2, H, W)`` plane and ``(N, S)`` scalar float32 buffers."""
+        return (
+            np.zeros((batch_size,) + self.plane_shape, dtype=np.float32),
+            np.zeros((batch_size, self.scalar_size), dtype=np.float32),
+        )
+
+    def rasterize(self, stones: np.ndarray, planes_out: np.ndarray) -> np.ndarray:
+        """Write ``(N, 2, 8, 2)`` stone positions into ``(N, 2, H, W)`` planes (overwriting them)."""
+        planes_out[...] = 0.0
+        x = stones[..., 0]
+        y = stones[..., 1]
+        (x_min, x_max), (y_min, y_max) = self.x_range, self.y_range
+        col = np.floor((x - x_min) / (x_max - x_min) * self.width).astype(np.intp)
+        row = np.floor((y - y_min) / (y_max - y_min) * self.height).astype(np.intp)
+        visible = (
+            ((x != 0.0) | (y != 0.0))
+            & (col >= 0) & (col < self.width)
+            & (row >= 0) & (row < self.height)
+        )
+        board_index, team_index, _ = np.nonzero(visible)
+        planes_out[board_index, team_index, row[visible], col[visible]] = 1.0
+        return planes_out
+
+    def encode_scalars(self, state: Union[StateSchema, CompactState], out: np.ndarray, stones: np.ndarray) -> np.ndarray:
+        """Write the scalar features of one state into a ``(S,)`` buffer."""
+        total_shot_number = state.total_shot_number or 0
+        next_shot_team = state.next_shot_team
+        hammer_is_team0 = float(hammer_team(state) == TEAM0)
+
+        team0_score = _score_total(state.score, "team0")
+        team1_score = _score_total(state.score, "team1")
+        mix_doubles = state.mix_doubles_settings
+        power_play_end = _field(mix_doubles, "power_play_end")
+        team0_power_play = _field(power_play_end, "team0")
+        team1_power_play = _field(power_play_end, "team1")
+        in_play = (stones[..., 0] != 0.0) | (stones[..., 1] != 0.0)
+
+        scale = self.time_scale
+        out[:] = (
+            state.end_number,
+            state.shot_number or 0,
+            total_shot_number,
+            float(next_shot_team == "team0"),
+            hammer_is_team0,
+            state.first_team_remaining_time / scale,
+            state.second_team_remaining_time / scale,
+            state.first_team_extra_end_remaining_time / scale,
+            state.second_team_extra_end_remaining_time / scale,
+            team0_score,
+            team1_score,
+            team0_score - team1_score,
+            float(mix_doubles is not None),
+            _field(mix_doubles, "positioned_stones_pattern") or 0,
+            -1 if team0_power_play is None else team0_power_play,
+            -1 if team1_power_play is None else team1_power_play,
+            in_play[0].sum(),
+            in_play[1].sum(),
+        )
+        return out
+
+    def encode_batch(
+        self,
+        states: Sequence[Union[StateSchema, CompactState]],
+        planes_out: Optional[np.ndarray] = None,
+        scalars_out: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Encode many states into ``(N, 2, H, W)`` planes and ``(N, S)`` scalars.
+        Pass both buffers from :meth:`allocate` to reuse memory across batches.
+        Raises:
+            ValueError: If only one of the two buffers is given.
+        """
+        if (planes_out is None) != (scalars_out is None):
+            raise ValueError("Pass both planes_out and scalars_out, or neither")
+        if planes_out is None:
+            planes_out, scalars_out = self.allocate(len(states))
+        stones = np.empty((len(states), 2, 8, 2), dtype=np.float64)
+        for index, state in enumerate(states):
+            stones[index] = stone_array(state)
+        self.rasterize(stones, planes_out[: len(states)])
+        for index, state in enumerate(states):
+            self.encode_scalars(state, scalars_out[index], stones[index])
+        return planes_out, scalars_out
+
+    def _encode_uncached(self, state: Union[StateSchema, CompactState]) -> Tuple[np.ndarray, np.ndarray]:
+        planes, scalars = self.encode_batch([state])
+        planes, scalars = planes[0], scalars[0]
+        # Cached arrays are shared between callers
+        planes.flags.writeable = False
+        scalars.flags.writeable = False
+        return planes, scalars
+
+    def encode(self, state: Union[StateSchema, CompactState]) -> Tuple[np.ndarray, np.ndarray]:
+        """Encode one state into read-only ``(2, H, W)`` planes and ``(S,)`` scalars, cached per state."""
+        return self._cache.get(state, self._encode_uncached)
@@ -0,0 +1,256 @@
+import os
+import time
+from collections import OrderedDict
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, Optional, Union
+
+import numpy as np
+
+from dc4client.compact_state import CompactState, StateCache, stone_array
+from dc4client.encoder import hammer_team, score_difference
+from dc4client.receive_data import StateSchema
+
+
+__all__ = ["board_keys", "state_key", "SharedEvaluationCache", "EvaluationCache"]
+
+
+_MISSING = object()
+
+# Fixed odd multipliers so keys are identical in every process and run
+_KEY_MULTIPLIERS = np.random.default_rng(0x5EED).integers(1, 2**63, size=20, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+
+def _mix64(z: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer (uint64 arithmetic wraps around)."""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def board_keys(
+    boards: np.ndarray,
+    end_number: Union[int, np.ndarray],
+    total_shot_number: Union[int, np.ndarray],
+    score_difference: Union[float, np.ndarray],
+    hammer: Union[int, np.ndarray],
+    quantum: float = 0.01,
+) -> np.ndarray:
+    """Hash ``(..., 2, 8, 2)`` boards plus match context into uint64 keys (never 0).
+
+    Positions are rounded to ``quantum`` metres and each team's stones are
+    sorted first, so boards that differ only by stone numbering or by less than
+    the quantum share a key. Keys are the same in every process.
+    """
+    boards = np.asarray(boards, dtype=np.float64)
+    batch_shape = boards.shape[:-3]
+    quantized = np.rint(boards / quantum).astype(np.int64)
+    # One sortable int64 per stone: x in the high half, y in the low half
+    packed = np.sort((quantized[..., 0] << 32) + (quantized[..., 1] & 0xFFFFFFFF), axis=-1)
+    # The trailing zeros only broadcast the context to the batch shape
+    context = np.stack(np.broadcast_arrays(
+        np.asarray(end_number, dtype=np.int64),
+        np.asarray(total_shot_number, dtype=np.int64),
+        np.rint(np.asarray(score_difference, dtype=np.float64)).astype(np.int64),
+        np.asarray(hammer, dtype=np.int64),
+        np.zeros(batch_shape, dtype=np.int64),
+    ), axis=-1)[..., :4]
+    values = np.concatenate((packed.reshape(batch_shape + (16,)), context), axis=-1).view(np.uint64)
+    with np.errstate(over="ignore"):
+        keys = _mix64((values * _KEY_MULTIPLIERS).sum(axis=-1, dtype=np.uint64))
+    return np.where(keys == 0, np.uint64(1), keys)
+
+
+def state_key(state: Union[StateSchema, CompactState], quantum: float = 0.01) -> int:
+    """Key of a state's board and context (end, shot, score difference, hammer team)."""
+    return int(board_keys(
+        stone_array(state),
+        state.end_number,
+        state.total_shot_number or 0,
+        score_difference(state),
+        hammer_team(state),
+        quantum,
+    ))
+
+
+class SharedEvaluationCache:
+    """Fixed-size key -> float table in shared memory, usable from several processes.
+
+    Keys hash to a bucket of ``ways`` slots; a full bucket evicts its least
+    recently used slot, so eviction is LRU within each bucket. No lock is
+    taken: each slot stores a checksum, and a slot torn by concurrent writers
+    is read as a miss. Pickling an instance (e.g. passing it to a pool worker)
+    attaches to the same memory by name.
+
+        Args:
+            capacity (int): Total slots (rounded up to a multiple of ``ways``). Defaults to 65536.
+            ways (int): Slots per bucket. Defaults to 4.
+            name (str | None): Attach to an existing table instead of creating one. Defaults to None.
+    """
+
+    _FIELDS = 4  # key, value bits, checksum, last use
+
+    def __init__(self, capacity: int = 1 << 16, ways: int = 4, name: Optional[str] = None):
+        self.ways = ways
+        self.buckets = max(1, -(-capacity // ways))
+        size = self.buckets * ways * self._FIELDS * 8
+        if name is None:
+            self._memory = shared_memory.SharedMemory(create=True, size=size)
+            self._owner = True
+        else:
+            try:
+                # Only the creator frees the memory (track is available from Python 3.13)
+                self._memory = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                # Before 3.13 attaching registers the memory with this process's resource tracker,
+                # which unlinks it when the process exits. A tracker that was already running may be
+                # shared with the creator (a pool worker's), and then the registration is the creator's.
+                own_tracker = getattr(resource_tracker._resource_tracker, "_fd", None) is None
+                self._memory = shared_memory.SharedMemory(name=name)
+                if own_tracker and os.name == "posix":
+                    resource_tracker.unregister(self._memory._name, "shared_memory")
+            self._owner = False
+        self._table = np.ndarray((self.buckets, ways, self._FIELDS), dtype=np.uint64, buffer=self._memory.buf)
+        if self._owner:
+            self._table[:] = 0
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def __reduce__(self):
+        return (SharedEvaluationCache, (self.buckets * self.ways, self.ways, self.name))
+
+    def get(self, key: int) -> Optional[float]:
+        key = int(key)
+        bucket = self._table[key % self.buckets]
+        for slot in bucket:
+            stored_key, bits, checksum = int(slot[0]), int(slot[1]), int(slot[2])
+            if stored_key == key and checksum == stored_key ^ bits:
+                slot[3] = time.monotonic_ns()
+                return float(np.uint64(bits).view(np.float64))
+        return None
+
+    def put(self, key: int, value: float) -> None:
+        key = int(key)
+        bucket = self._table[key % self.buckets]
+        keys = bucket[:, 0]
+        match = np.flatnonzero(keys == key)
+        slot = bucket[match[0] if len(match) else int(np.argmin(bucket[:, 3]))]
+        bits = int(np.float64(value).view(np.uint64))
+        slot[0] = 0
+        slot[1] = bits
+        slot[2] = key ^ bits
+        slot[3] = time.monotonic_ns()
+        slot[0] = key
+
+    def clear(self) -> None:
+        self._table[:] = 0
+
+    def close(self) -> None:
+        """Detach from the shared memory; the creating instance also frees it."""
+        self._table = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+
+class EvaluationCache:
+    """Bounded LRU cache of evaluations keyed by a quantized board and its match context.
+
+    The key covers the stone positions (rounded to ``quantum``, stone numbering
+    ignored), end_number, total_shot_number, score difference and hammer team,
+    so consecutive turns and noise samples that reach the same board reuse one
+    evaluation. Keys of StateSchema/CompactState objects from
+    ``DCClient.receive_state_data`` are computed once per state instance.
+
+    With a ``shared`` backend, float values are also published to and looked
+    up in a SharedEvaluationCache, so pool workers reuse each other's results.
+
+        Args:
+            max_entries (int): Entries kept in this process before evicting the least recently used. Defaults to 100000.
+            quantum (float): Position rounding in metres. Defaults to 0.01.
+            shared (SharedEvaluationCache | None): Optional cross-process backend. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        quantum: float = 0.01,
+        shared: Optional[SharedEvaluationCache] = None,
+    ):
+        self.max_entries = max_entries
+        self.quantum = quantum
+        self.shared = shared
+        self._entries: "OrderedDict[int, Any]" = OrderedDict()
+        self._keys = StateCache()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._entries
+
+    def key(self, state: Union[StateSchema, CompactState]) -> int:
+        """Key of a state, computed once per state instance."""
+        return self._keys.get(state, lambda s: state_key(s, self.quantum))
+
+    def get(self, key: int, default: Any = None) -> Any:
+        """Look up a key, counting a hit or a miss."""
+        value = self._entries.get(key, _MISSING)
+        if value is not _MISSING:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+        if self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.shared_hits += 1
+                self._store(key, value)
+                return value
+        self.misses += 1
+        return default
+
+    def _store(self, key: int, value: Any) -> None:
+        entries = self._entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def put(self, key: int, value: Any) -> None:
+        """Store a value (floats are also published to the shared backend)."""
+        self._store(key, value)
+        if self.shared is not None and isinstance(value, (float, int, np.floating, np.integer)):
+            self.shared.put(key, float(value))
+
+    def evaluate(self, state: Union[StateSchema, CompactState], evaluate: Callable[[Any], Any]) -> Any:
+        """Return the cached evaluation of a state, calling ``evaluate(state)`` on a miss."""
+        key = self.key(state)
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = evaluate(state)
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop all local entries and reset the counters."""
+        self._entries.clear()
+        self.hits = self.shared_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hits, shared_hits, misses, evictions, size and hit_rate."""
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "hit_rate": (self.hits + self.shared_hits) / lookups if lookups else None,
+        }
+
@@ -0,0 +1,220 @@
+import math
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+
+__all__ = ["TRACE_PHASES", "LatencyHistogram", "RequestTracer"]
+
+
+# Phases recorded for every traced request, in the order they happen.
+TRACE_PHASES = ("queue", "dns", "connect", "send", "ttfb", "body", "total")
+
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram with logarithmic buckets.
+
+    Memory does not grow with the number of samples: each sample only increments
+    one bucket counter. Percentiles are accurate to the bucket width
+    (about ``growth - 1``, i.e. 5% by default).
+
+        Args:
+            min_value (float): Smallest resolvable latency in seconds. Defaults to 1e-6.
+            max_value (float): Largest resolvable latency in seconds. Defaults to 600.
+            growth (float): Ratio between consecutive bucket edges. Defaults to 1.05.
+    """
+    __slots__ = ("min_value", "max_value", "_log_growth", "_counts", "count", "total", "max")
+
+    def __init__(self, min_value: float = 1e-6, max_value: float = 600.0, growth: float = 1.05):
+        self.min_value = min_value
+        self.max_value = max_value
+        self._log_growth = math.log(growth)
+        n_buckets = int(math.ceil(math.log(max_value / min_value) / self._log_growth)) + 1
+        self._counts: List[int] = [0] * n_buckets
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def _bucket(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        index = int(math.log(value / self.min_value) / self._log_growth)
+        return min(index, len(self._counts) - 1)
+
+    def record(self, value: float) -> None:
+        """Add one latency sample.
+        Args:
+            value (float): Latency in seconds.
+        """
+        self._counts[self._bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Return the q-th percentile (0-100) in seconds, or None if empty."""
+        if self.count == 0:
+            return None
+        rank = max(1, int(math.ceil(q / 100.0 * self.count)))
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= rank:
+                # Geometric midpoint of the bucket, capped by the observed maximum
+                value = self.min_value * math.exp((index + 0.5) * self._log_growth)
+                return min(value, self.max)
+        return self.max
+
+    def reset(self) -> None:
+        """Forget all recorded samples."""
+        self._counts = [0] * len(self._counts)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Return count, mean, p50/p95/p99 and max (seconds) as a dict."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max if self.count else None,
+        }
+
+
+class RequestTracer:
+    """Per-endpoint, per-phase HTTP latency recorder built on aiohttp trace hooks.
+
+    Pass :meth:`trace_config` to ``aiohttp.ClientSession(trace_configs=[...])``
+    and label each request with ``trace_request_ctx={"endpoint": "<name>"}``.
+    The phases are:
+
+        - queue: waiting for a free connection in the pool
+        - dns: host name resolution
+        - connect: opening a new connection (zero on a reused keep-alive socket)
+        - send: writing the request
+        - ttfb: request sent until response headers arrived
+        - body: reading the response body (recorded by the caller)
+        - total: whole request including the body (recorded by the caller)
+    """
+
+    def __init__(self):
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._errors: Dict[str, int] = {}
+        self._reused: Dict[str, int] = {}
+
+    def _histogram(self, endpoint: str, phase: str) -> LatencyHistogram:
+        phases = self._histograms.get(endpoint)
+        if phases is None:
+            phases = self._histograms[endpoint] = {}
+        histogram = phases.get(phase)
+        if histogram is None:
+            histogram = phases[phase] = LatencyHistogram()
+        return histogram
+
+    def record(self, endpoint: str, phase: str, seconds: float) -> None:
+        """Record one timing sample for an endpoint/phase pair."""
+        self._histogram(endpoint, phase).record(seconds)
+
+    def record_error(self, endpoint: str) -> None:
+        """Count one failed request for an endpoint."""
+        self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return ``{endpoint: {phase: summary, "errors": n, "reused_connections": n}}``."""
+        result: Dict[str, Dict[str, Any]] = {}
+        for endpoint, phases in self._histograms.items():
+            entry: Dict[str, Any] = {
+                phase: phases[phase].summary() for phase in TRACE_PHASES if phase in phases
+            }
+            entry["errors"] = self._errors.get(endpoint, 0)
+            entry["reused_connections"] = self._reused.get(endpoint, 0)
+            result[endpoint] = entry
+        for endpoint, errors in self._errors.items():
+            if endpoint not in result:
+                result[endpoint] = {"errors": errors, "reused_connections": 0}
+        return result
+
+    def reset(self) -> None:
+        """Forget all recorded samples."""
+        self._histograms.clear()
+        self._errors.clear()
+        self._reused.clear()
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Build an aiohttp TraceConfig that feeds this tracer."""
+        trace_config = aiohttp.TraceConfig(trace_config_ctx_factory=self._context_factory)
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_queued_start.append(self._on_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_queued_end)
+        trace_config.on_dns_resolvehost_start.append(self._on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(self._on_dns_end)
+        trace_config.on_connection_create_start.append(self._on_connect_start)
+        trace_config.on_connection_create_end.append(self._on_connect_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuse)
+        trace_config.on_request_headers_sent.append(self._on_sent)
+        trace_config.on_request_chunk_sent.append(self._on_sent)
+        trace_config.on_request_end.append(self._on_request_end)
+        trace_config.on_request_exception.append(self._on_request_exception)
+        return trace_config
+
+    @staticmethod
+    def _context_factory(trace_request_ctx: Any = None) -> SimpleNamespace:
+        endpoint = "other"
+        if isinstance(trace_request_ctx, dict):
+            endpoint = trace_request_ctx.get("endpoint", endpoint)
+        return SimpleNamespace(
+            trace_request_ctx=trace_request_ctx,
+            endpoint=endpoint,
+            start=0.0,
+            connection_ready=None,
+            sent=None,
+            marks={},
+        )
+
+    async def _on_request_start(self, session, ctx, params) -> None:
+        ctx.start = time.perf_counter()
+        ctx.connection_ready = None
+        ctx.sent = None
+
+    async def _on_queued_start(self, session, ctx, params) -> None:
+        ctx.marks["queue"] = time.perf_counter()
+
+    async def _on_queued_end(self, session, ctx, params) -> None:
+        self.record(ctx.endpoint, "queue", time.perf_counter() - ctx.marks.pop("queue", ctx.start))
+
+    async def _on_dns_start(self, session, ctx, params) -> None:
+        ctx.marks["dns"] = time.perf_counter()
+
+    async def _on_dns_end(self, session, ctx, params) -> None:
+        self.record(ctx.endpoint, "dns", time.perf_counter() - ctx.marks.pop("dns", ctx.start))
+
+    async def _on_connect_start(self, session, ctx, params) -> None:
+        ctx.marks["connect"] = time.perf_counter()
+
+    async def _on_connect_end(self, session, ctx, params) -> None:
+        now = time.perf_counter()
+        self.record(ctx.endpoint, "connect", now - ctx.marks.pop("connect", ctx.start))
+        ctx.connection_ready = now
+
+    async def _on_connection_reuse(self, session, ctx, params) -> None:
+        ctx.connection_ready = time.perf_counter()
+        self._reused[ctx.endpoint] = self._reused.get(ctx.endpoint, 0) + 1
+
+    async def _on_sent(self, session, ctx, params) -> None:
+        ctx.sent = time.perf_counter()
+
+    async def _on_request_end(self, session, ctx, params) -> None:
+        now = time.perf_counter()
+        connection_ready = ctx.connection_ready if ctx.connection_ready is not None else ctx.start
+        sent = ctx.sent if ctx.sent is not None else connection_ready
+        self.record(ctx.endpoint, "send", max(0.0, sent - connection_ready))
+        self.record(ctx.endpoint, "ttfb", max(0.0, now - sent))
+
+    async def _on_request_exception(self, session, ctx, params) -> None:
+        self.record_error(ctx.endpoint)
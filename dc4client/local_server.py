@@ -0,0 +1,480 @@
+"""Local stand-in for the DC server, for offline load tests, benchmarks and reconnect testing.
+
+It serves the endpoints DCClient and MatchMakerClient use:
+
+    - POST /matches                      create a match (ClientDataModel), returns its id
+    - POST /store-team-config            register a team (TeamModel), returns "team0"/"team1"
+    - POST /shots                        throw the next stone (ShotInfoModel)
+    - POST /matches/{match_id}/end-setup mixed doubles positioned stones
+    - GET  /matches/{match_id}/stream    SSE stream of ``latest_state_update``/``state_update`` events
+
+Usage:
+    python -m dc4client.local_server [--host HOST] [--port PORT] [--latency SECONDS]
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from aiohttp import BasicAuth, web
+from pydantic import ValidationError
+
+from dc4client.board import BACK_LINE_Y, HOG_LINE_Y, SIDE_LINE_X, STONE_RADIUS, TEE_Y, end_scores
+from dc4client.simulator import FRICTION_DECELERATION
+from dc4client.send_data import (
+    ClientDataModel,
+    GameMode,
+    MatchNameModel,
+    PositionedStonesModel,
+    ShotInfoModel,
+    TeamModel,
+)
+
+
+__all__ = ["PhysicsStep", "TEAM_NAMES", "straight_line_physics", "LocalDCServer"]
+
+
+# physics(stones, team, stone_index, shot) -> stones after the shot came to rest.
+# stones is a (2, 8, 2) array in the StoneCoordinateSchema frame, (0, 0) = not in play.
+PhysicsStep = Callable[[np.ndarray, int, int, ShotInfoModel], np.ndarray]
+
+TEAM_NAMES = ("team0", "team1")
+
+# Mixed doubles positioned stones: (guard position, house position) per pattern.
+_POSITIONED_STONES = {
+    PositionedStonesModel.center_guard: ((0.0, 35.0), (0.0, TEE_Y + 0.61)),
+    PositionedStonesModel.center_house: ((0.0, 35.0), (0.0, TEE_Y + 0.61)),
+    PositionedStonesModel.pp_left: ((-0.9, 35.0), (-1.2, TEE_Y)),
+    PositionedStonesModel.pp_right: ((0.9, 35.0), (1.2, TEE_Y)),
+}
+
+
+class _RequestDropped(Exception):
+    """Raised by a handler after it closed the connection on purpose."""
+
+
+@web.middleware
+async def _drop_middleware(request: web.Request, handler):
+    try:
+        return await handler(request)
+    except _RequestDropped:
+        # The transport is already closed; this response never reaches the client
+        return web.Response(status=503)
+
+
+def straight_line_physics(stones: np.ndarray, team: int, index: int, shot: ShotInfoModel) -> np.ndarray:
+    """Minimal physics: the stone slides in a straight line from (0, 0) under constant friction.
+    Curl and collisions are ignored; pass ``CurlingSimulator().physics`` to LocalDCServer for those.
+    A stone that stops short of the hog line or leaves the sheet is removed.
+    """
+    stones = stones.copy()
+    distance = shot.translational_velocity ** 2 / (2.0 * FRICTION_DECELERATION)
+    x = distance * math.cos(shot.shot_angle)
+    y = distance * math.sin(shot.shot_angle)
+    if y < HOG_LINE_Y or y > BACK_LINE_Y + STONE_RADIUS or abs(x) > SIDE_LINE_X - STONE_RADIUS:
+        x = y = 0.0
+    stones[team, index] = (x, y)
+    return stones
+
+
+class _Match:
+    """Server-side state of one match."""
+
+    def __init__(self, match_id: str, settings: ClientDataModel):
+        self.match_id = match_id
+        self.mix_doubles = settings.game_mode == GameMode.mix_doubles
+        self.standard_end_count = settings.standard_end_count
+        self.extra_end_time_limit = float(settings.extra_end_time_limit)
+        self.shots_per_end = 10 if self.mix_doubles else 16
+        self.positioned_stones_pattern = settings.positioned_stones_pattern
+
+        self.owners: Dict[str, str] = {}
+        self.stones = np.zeros((2, 8, 2), dtype=np.float64)
+        self.end_number = 0
+        self.total_shot_number = 0
+        self.first_team = 0
+        self.end_setup_team = 0
+        self.remaining_time = [float(settings.time_limit)] * 2
+        self.extra_end_remaining_time = [self.extra_end_time_limit] * 2
+        self.score: List[List[int]] = [[0] * self.standard_end_count for _ in range(2)]
+        self.winner_team: Optional[str] = None
+        self.last_move: Optional[dict] = None
+        self.end_setup_pending = self.mix_doubles
+        self.power_play_end: List[Optional[int]] = [None, None]
+        self.turn_started_at = time.monotonic()
+
+        # Every emitted state as (event id, JSON text); subscribers get (event id, JSON text) or None
+        self.history: List[Tuple[int, str]] = []
+        self.subscribers: Set[asyncio.Queue] = set()
+
+    @property
+    def next_team(self) -> int:
+        return self.first_team if self.total_shot_number % 2 == 0 else 1 - self.first_team
+
+    @property
+    def extra_end(self) -> bool:
+        return self.end_number >= self.standard_end_count
+
+    def payload(self) -> dict:
+        mix_doubles_settings = None
+        if self.mix_doubles:
+            mix_doubles_settings = {
+                "end_setup_team": TEAM_NAMES[self.end_setup_team],
+                "positioned_stones_pattern": self.positioned_stones_pattern or 0,
+                "power_play_end": {"team0": self.power_play_end[0], "team1": self.power_play_end[1]},
+            }
+        return {
+            "winner_team": self.winner_team,
+            "end_number": self.end_number,
+            "shot_number": self.total_shot_number // 2,
+            "total_shot_number": self.total_shot_number,
+            "next_shot_team": None if self.winner_team else TEAM_NAMES[self.next_team],
+            "first_team_remaining_time": self.remaining_time[0],
+            "second_team_remaining_time": self.remaining_time[1],
+            "first_team_extra_end_remaining_time": self.extra_end_remaining_time[0],
+            "second_team_extra_end_remaining_time": self.extra_end_remaining_time[1],
+            "mix_doubles_settings": mix_doubles_settings,
+            "last_move": self.last_move,
+            "stone_coordinate": {
+                "data": {
+                    name: [{"x": float(x), "y": float(y)} for x, y in self.stones[team]]
+                    for team, name in enumerate(TEAM_NAMES)
+                }
+            },
+            "score": {"team0": list(self.score[0]), "team1": list(self.score[1])},
+        }
+
+    def emit(self) -> None:
+        """Append the current state to the history and push it to every open stream."""
+        event = (len(self.history), json.dumps(self.payload()))
+        self.history.append(event)
+        for subscriber in self.subscribers:
+            subscriber.put_nowait(event)
+
+    def charge_time(self, team: int) -> bool:
+        """Deduct the thinking time of the current turn; return False when the team ran out."""
+        now = time.monotonic()
+        elapsed = now - self.turn_started_at
+        self.turn_started_at = now
+        remaining = self.extra_end_remaining_time if self.extra_end else self.remaining_time
+        remaining[team] = max(0.0, remaining[team] - elapsed)
+        return remaining[team] > 0.0
+
+    def finish_end(self) -> None:
+        score = int(end_scores(self.stones))
+        self.score[0][self.end_number] = max(score, 0)
+        self.score[1][self.end_number] = max(-score, 0)
+        # The scoring team throws first in the next end; a blank end keeps the order
+        if score > 0:
+            self.first_team = 0
+        elif score < 0:
+            self.first_team = 1
+        self.end_number += 1
+        self.total_shot_number = 0
+        self.stones[:] = 0.0
+        self.end_setup_pending = self.mix_doubles
+        self.end_setup_team = self.first_team
+
+        totals = (sum(self.score[0]), sum(self.score[1]))
+        if self.end_number >= self.standard_end_count:
+            if totals[0] != totals[1]:
+                self.winner_team = TEAM_NAMES[0 if totals[0] > totals[1] else 1]
+                return
+            for team_score in self.score:
+                team_score.append(0)
+            self.extra_end_remaining_time = [self.extra_end_time_limit] * 2
+
+    def stone_index(self) -> int:
+        thrown = self.total_shot_number // 2
+        # Mixed doubles keeps index 0 for the positioned stone
+        return thrown + 1 if self.mix_doubles else thrown
+
+
+class LocalDCServer:
+    """In-process aiohttp server that behaves like the DC server for DCClient and MatchMakerClient.
+
+    Many matches run concurrently, each with its own state and SSE subscribers.
+    Every emitted state gets an SSE id, so a reconnect with ``Last-Event-Id``
+    replays exactly the missed ``state_update`` events; a fresh connection gets
+    the current state as ``latest_state_update``. A team's clock runs from the
+    previous state until its shot arrives. Anyone may shoot for a team that has
+    not been claimed through /store-team-config; a claimed team only accepts
+    shots from the username that claimed it.
+
+        Args:
+            host (str): Address to bind. Defaults to "127.0.0.1".
+            port (int): Port to bind; 0 picks a free port (see :attr:`port`). Defaults to 0.
+            physics (PhysicsStep | None): Where a thrown stone comes to rest. Defaults to straight_line_physics.
+            users (Dict[str, str] | None): Accepted username/password pairs; None accepts anyone. Defaults to None.
+            latency (float): Seconds added before every response. Defaults to 0.0.
+            jitter (float): Extra uniformly random delay (0..jitter seconds) per response. Defaults to 0.0.
+            stream_disconnect_every (int | None): Gracefully close a stream after this many events. Defaults to None.
+            stream_abort_probability (float): Chance to drop a stream's TCP connection before an event. Defaults to 0.0.
+            request_drop_probability (float): Chance to drop a POST's connection without answering. Defaults to 0.0.
+            seed (int | None): Seed for the latency/disconnect injection. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        physics: Optional[PhysicsStep] = None,
+        users: Optional[Dict[str, str]] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        stream_disconnect_every: Optional[int] = None,
+        stream_abort_probability: float = 0.0,
+        request_drop_probability: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.physics: PhysicsStep = physics or straight_line_physics
+        self.users = users
+        self.latency = latency
+        self.jitter = jitter
+        self.stream_disconnect_every = stream_disconnect_every
+        self.stream_abort_probability = stream_abort_probability
+        self.request_drop_probability = request_drop_probability
+        self._random = random.Random(seed)
+        self.matches: Dict[str, _Match] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+    async def __aenter__(self) -> "LocalDCServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[_drop_middleware])
+        app.router.add_post("/matches", self._create_match)
+        app.router.add_post("/store-team-config", self._store_team_config)
+        app.router.add_post("/shots", self._shots)
+        app.router.add_post("/matches/{match_id}/end-setup", self._end_setup)
+        app.router.add_get("/matches/{match_id}/stream", self._stream)
+        return app
+
+    async def start(self) -> None:
+        """Start serving; afterwards :attr:`port` holds the bound port."""
+        self._runner = web.AppRunner(self.make_app(), handle_signals=False, shutdown_timeout=1.0)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port, backlog=1024)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Close every open stream and stop serving."""
+        for match in self.matches.values():
+            for subscriber in match.subscribers:
+                subscriber.put_nowait(None)
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def create_match(self, settings: Optional[ClientDataModel] = None, match_id: Optional[str] = None) -> str:
+        """Create a match directly (without an HTTP request) and return its id.
+        Args:
+            settings (ClientDataModel | None): Match settings. Defaults to a standard 10-end match.
+            match_id (str | None): Id to use. Defaults to a random UUID.
+        """
+        if settings is None:
+            settings = ClientDataModel(
+                tournament={"tournament_name": "local"},
+                simulator={"simulator_name": "local"},
+                applied_rule="standard",
+                time_limit=600.0,
+                extra_end_time_limit=60.0,
+                standard_end_count=10,
+                match_name="local",
+            )
+        match_id = match_id or str(uuid.uuid4())
+        match = self.matches[match_id] = _Match(match_id, settings)
+        match.emit()
+        return match_id
+
+    async def _delay(self) -> None:
+        delay = self.latency + (self._random.uniform(0.0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _username(self, request: web.Request) -> str:
+        """Return the Basic auth username, raising 401 when ``users`` is set and the credentials are wrong."""
+        header = request.headers.get("Authorization")
+        auth = None
+        if header:
+            try:
+                auth = BasicAuth.decode(header)
+            except ValueError:
+                auth = None
+        if self.users is not None and (auth is None or self.users.get(auth.login) != auth.password):
+            raise web.HTTPUnauthorized(text="Invalid credentials")
+        return auth.login if auth is not None else ""
+
+    def _match(self, match_id: Optional[str]) -> _Match:
+        match = self.matches.get(match_id or "")
+        if match is None:
+            raise web.HTTPNotFound(text=f"Unknown match: {match_id}")
+        return match
+
+    async def _begin_post(self, request: web.Request) -> str:
+        username = self._username(request)
+        await self._delay()
+        if self.request_drop_probability and self._random.random() < self.request_drop_probability:
+            if request.transport is not None:
+                request.transport.close()
+            raise _RequestDropped()
+        return username
+
+    @staticmethod
+    async def _read_model(request: web.Request, model):
+        try:
+            return model(**await request.json())
+        except (ValueError, TypeError, ValidationError) as e:
+            raise web.HTTPBadRequest(text=str(e))
+
+    async def _create_match(self, request: web.Request) -> web.Response:
+        await self._begin_post(request)
+        settings = await self._read_model(request, ClientDataModel)
+        return web.json_response(self.create_match(settings))
+
+    async def _store_team_config(self, request: web.Request) -> web.Response:
+        username = await self._begin_post(request)
+        match = self._match(request.query.get("match_id"))
+        await self._read_model(request, TeamModel)
+        expected = request.query.get("expected_match_team_name", MatchNameModel.team1.value)
+        if expected not in TEAM_NAMES:
+            raise web.HTTPBadRequest(text=f"Unknown team name: {expected}")
+
+        other = TEAM_NAMES[1 - TEAM_NAMES.index(expected)]
+        for team_name in (expected, other):
+            if match.owners.get(team_name) in (None, username):
+                match.owners[team_name] = username
+                return web.json_response(team_name)
+        raise web.HTTPConflict(text="Both teams are already registered")
+
+    def _check_turn(self, match: _Match, username: str) -> int:
+        if match.winner_team is not None:
+            raise web.HTTPConflict(text="The match is over")
+        team = match.next_team
+        owner = match.owners.get(TEAM_NAMES[team])
+        if owner is not None and owner != username:
+            raise web.HTTPConflict(text=f"It is {TEAM_NAMES[team]}'s turn")
+        return team
+
+    async def _shots(self, request: web.Request) -> web.Response:
+        username = await self._begin_post(request)
+        match = self._match(request.query.get("match_id"))
+        shot = await self._read_model(request, ShotInfoModel)
+        team = self._check_turn(match, username)
+        if match.end_setup_pending:
+            raise web.HTTPConflict(text="Waiting for the end setup")
+        if not all(math.isfinite(value) for value in (shot.translational_velocity, shot.shot_angle)):
+            raise web.HTTPBadRequest(text="Shot values must be finite")
+
+        if match.charge_time(team):
+            match.stones = self.physics(match.stones, team, match.stone_index(), shot)
+            match.last_move = shot.model_dump()
+            match.total_shot_number += 1
+            if match.total_shot_number >= match.shots_per_end:
+                match.finish_end()
+        else:
+            match.winner_team = TEAM_NAMES[1 - team]
+        match.emit()
+        return web.json_response(None)
+
+    async def _end_setup(self, request: web.Request) -> web.Response:
+        username = await self._begin_post(request)
+        match = self._match(request.match_info["match_id"])
+        try:
+            pattern = PositionedStonesModel(request.query.get("request"))
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=str(e))
+        if not match.end_setup_pending:
+            raise web.HTTPConflict(text="No end setup expected")
+        team = self._check_turn(match, username)
+
+        # The team whose stone sits in the house gets the hammer (throws second)
+        house_team = team if pattern != PositionedStonesModel.center_guard else 1 - team
+        guard, house = _POSITIONED_STONES[pattern]
+        match.stones[house_team, 0] = house
+        match.stones[1 - house_team, 0] = guard
+        match.first_team = 1 - house_team
+        if pattern in (PositionedStonesModel.pp_left, PositionedStonesModel.pp_right):
+            match.power_play_end[house_team] = match.end_number
+        match.end_setup_pending = False
+        match.emit()
+        return web.json_response(None)
+
+    async def _stream(self, request: web.Request) -> web.StreamResponse:
+        self._username(request)
+        match = self._match(request.match_info["match_id"])
+        await self._delay()
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+        subscriber: asyncio.Queue = asyncio.Queue()
+        match.subscribers.add(subscriber)
+        try:
+            last_event_id = request.headers.get("Last-Event-Id", "")
+            if last_event_id.isdigit() and int(last_event_id) < len(match.history):
+                backlog = [("state_update", event) for event in match.history[int(last_event_id) + 1:]]
+            else:
+                backlog = [("latest_state_update", match.history[-1])] if match.history else []
+
+            sent = 0
+            last_sent = backlog[-1][1][0] if backlog else len(match.history) - 1
+            while True:
+                for event_type, (event_id, data) in backlog:
+                    if self.stream_abort_probability and self._random.random() < self.stream_abort_probability:
+                        if request.transport is not None:
+                            request.transport.close()
+                        return response
+                    await response.write(f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n".encode())
+                    sent += 1
+                    if self.stream_disconnect_every and sent >= self.stream_disconnect_every:
+                        await response.write_eof()
+                        return response
+                event = await subscriber.get()
+                if event is None:
+                    await response.write_eof()
+                    return response
+                # Events emitted before the backlog snapshot are already covered by it
+                backlog = [("state_update", event)] if event[0] > last_sent else []
+                if backlog:
+                    last_sent = event[0]
+        except ConnectionResetError:
+            return response
+        finally:
+            match.subscribers.discard(subscriber)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--stream-disconnect-every", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = LocalDCServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        stream_disconnect_every=args.stream_disconnect_every,
+        seed=args.seed,
+    )
+    web.run_app(server.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
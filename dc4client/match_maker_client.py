@@ -1,8 +1,46 @@
+from __future__ import annotations
+
 import aiohttp
 from aiohttp import BasicAuth
-from typing import Any
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Tuple
+
+from dc4client.http_trace import RequestTracer
+
+if TYPE_CHECKING:
+    # Only used in annotations; callers build the models, so pydantic is not loaded here
+    from dc4client.send_data import ClientDataModel
+
+
+__all__ = ["MatchCreationResult", "MatchMakerClient"]
+
 
-from dc4client.send_data import ClientDataModel
+class MatchCreationResult:
+    """Outcome of one entry of MatchMakerClient.create_matches.
+
+        Attributes:
+            index (int): Position of the entry in the input.
+            match_id (Any): Body returned by the server (typically a match_id), or None on failure.
+            status (int | None): HTTP status, or None if no response was received.
+            error (str | None): Failure description, None on success.
+    """
+    __slots__ = ("index", "match_id", "status", "error")
+
+    def __init__(self, index: int, match_id: Any = None, status: Optional[int] = None, error: Optional[str] = None):
+        self.index = index
+        self.match_id = match_id
+        self.status = status
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        if self.ok:
+            return f"MatchCreationResult(index={self.index}, match_id={self.match_id})"
+        return f"MatchCreationResult(index={self.index}, status={self.status}, error={self.error})"
 
 
 class MatchMakerClient:
@@ -12,10 +50,45 @@ class MatchMakerClient:
             port (int): Server port number.
             username (str): Username for authentication.
             password (str): Password for authentication.
+            tracer (RequestTracer | None): Records per-phase HTTP latency when given. Defaults to None.
     """    
-    def __init__(self, host: str, port: int, username: str, password: str):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        tracer: Optional[RequestTracer] = None,
+    ):
         self._base_url = f"http://{host}:{port}"
         self._auth = BasicAuth(login=username, password=password)
+        self.tracer: Optional[RequestTracer] = tracer
+
+    def _create_session(self, connector: Optional[aiohttp.BaseConnector] = None) -> aiohttp.ClientSession:
+        trace_configs = [self.tracer.trace_config()] if self.tracer is not None else None
+        return aiohttp.ClientSession(auth=self._auth, connector=connector, trace_configs=trace_configs)
+
+    async def _post_match(self, session: aiohttp.ClientSession, data: ClientDataModel) -> Tuple[int, Any]:
+        """POST one match and return ``(status, parsed body)``."""
+        url = f"{self._base_url}/matches"
+        start = time.perf_counter()
+        async with session.post(
+            url=url,
+            json=data.model_dump(),
+            trace_request_ctx={"endpoint": "create_match"},
+        ) as response:
+            body_start = time.perf_counter()
+            try:
+                body: Any = await response.json()
+            except Exception:
+                body = await response.text()
+
+            if self.tracer is not None:
+                end = time.perf_counter()
+                self.tracer.record("create_match", "body", end - body_start)
+                self.tracer.record("create_match", "total", end - start)
+
+            return response.status, body
 
     async def create_match(self, data: ClientDataModel) -> Any:
         """Create a match on the server.
@@ -26,16 +99,51 @@ class MatchMakerClient:
         Raises:
             RuntimeError: When the request fails (includes status/body).
         """
-        url = f"{self._base_url}/matches"
+        async with self._create_session() as session:
+            status, body = await self._post_match(session, data)
+
+        if status == 200:
+            return body
+
+        raise RuntimeError(f"Create match failed: status={status}, body={body}")
+
+    async def create_matches(
+        self,
+        data: Iterable[ClientDataModel],
+        max_concurrency: int = 16,
+    ) -> List[MatchCreationResult]:
+        """Create many matches concurrently over one pooled keep-alive session.
+
+        Failures do not raise: each entry gets a MatchCreationResult, in input
+        order, carrying either the match_id or the status and error. Use
+        :meth:`match_ids` to keep only the created ones.
+
+        Args:
+            data (Iterable[ClientDataModel]): Settings of each match.
+            max_concurrency (int): Requests in flight (and pooled connections) at once. Defaults to 16.
+        Returns:
+            List[MatchCreationResult]: One result per entry.
+        """
+        items = list(data)
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-        async with aiohttp.ClientSession(auth=self._auth) as session:
-            async with session.post(url=url, json=data.model_dump()) as response:
+        async def create(index: int, entry: ClientDataModel) -> MatchCreationResult:
+            async with semaphore:
                 try:
-                    body: Any = await response.json()
-                except Exception:
-                    body = await response.text()
+                    status, body = await self._post_match(session, entry)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    return MatchCreationResult(index, error=repr(e))
+            if status == 200:
+                return MatchCreationResult(index, match_id=body, status=status)
+            return MatchCreationResult(index, status=status, error=f"Create match failed: status={status}, body={body}")
 
-                if response.status == 200:
-                    return body
+        connector = aiohttp.TCPConnector(limit=max_concurrency, keepalive_timeout=30, enable_cleanup_closed=True)
+        async with self._create_session(connector) as session:
+            return list(await asyncio.gather(*(create(index, entry) for index, entry in enumerate(items))))
 
-                raise RuntimeError(f"Create match failed: status={response.status}, body={body}")
+    @staticmethod
+    def match_ids(results: Iterable[MatchCreationResult]) -> List[Any]:
+        """Return the match_ids of the successful results, in input order."""
+        return [result.match_id for result in results if result.ok]
@@ -0,0 +1,197 @@
+import math
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from dc4client.board import end_scores
+from dc4client.send_data import PlayerModel, ShotInfoModel
+from dc4client.simulator import add_execution_noise, default_simulator, shot_array
+
+
+__all__ = [
+    "RolloutFunction",
+    "simulate_end_score",
+    "perturb_shots",
+    "summarize_outcomes",
+    "ShotNoiseSampler",
+]
+
+
+# rollout(board, shots, team, index) -> (K,) outcomes for a (2, 8, 2) board and (K, 3) shots
+# of (translational_velocity, shot_angle, angular_velocity), e.g. signed end scores.
+RolloutFunction = Callable[[np.ndarray, np.ndarray, int, int], np.ndarray]
+
+
+def simulate_end_score(board: np.ndarray, shots: np.ndarray, team: int, index: int) -> np.ndarray:
+    """Default rollout: simulate every shot and score the board as if the end finished now.
+    Scores are signed, positive when team0 scores (see board.end_scores).
+    """
+    return end_scores(default_simulator().simulate(board, shots, team, index)).astype(np.float64)
+
+
+def perturb_shots(
+    shot: Union[ShotInfoModel, Sequence[float]],
+    count: int,
+    player: PlayerModel,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Expand one intended shot into ``count`` noisy shots.
+    Adds normal noise with the player's ``shot_std_dev`` to the translational velocity
+    (clipped to ``[0, max_velocity]``) and ``angle_std_dev`` to the shot angle.
+    Returns:
+        np.ndarray: ``(count, 3)`` array of (translational_velocity, shot_angle, angular_velocity).
+    """
+    return add_execution_noise(np.repeat(shot_array(shot)[:1], count, axis=0), player, rng)
+
+
+def _rollout_chunk(
+    rollout: RolloutFunction,
+    board: np.ndarray,
+    shot: Tuple[float, float, float],
+    count: int,
+    player: PlayerModel,
+    seed: np.random.SeedSequence,
+    team: int,
+    index: int,
+) -> np.ndarray:
+    shots = perturb_shots(shot, count, player, np.random.default_rng(seed))
+    return np.asarray(rollout(board, shots, team, index), dtype=np.float64)
+
+
+def summarize_outcomes(outcomes: np.ndarray) -> Dict[str, Any]:
+    """Return samples, mean, variance, std, min, max and the probability of each integer outcome."""
+    outcomes = np.asarray(outcomes, dtype=np.float64)
+    if outcomes.size == 0:
+        return {"samples": 0, "mean": None, "variance": None, "std": None, "min": None, "max": None, "distribution": {}}
+    values, counts = np.unique(np.rint(outcomes).astype(np.int64), return_counts=True)
+    return {
+        "samples": int(outcomes.size),
+        "mean": float(outcomes.mean()),
+        "variance": float(outcomes.var()),
+        "std": float(outcomes.std()),
+        "min": float(outcomes.min()),
+        "max": float(outcomes.max()),
+        "distribution": {int(value): float(count / outcomes.size) for value, count in zip(values, counts)},
+    }
+
+
+class ShotNoiseSampler:
+    """Monte Carlo view of how risky a shot is for a given player.
+
+    One intended shot is expanded into K noisy shots drawn from the player's
+    dispersion (``shot_std_dev``, ``angle_std_dev``, clipped to
+    ``max_velocity``), every noisy shot is rolled out, and the outcomes are
+    aggregated. K is split into fixed-size chunks, each with its own child of
+    ``SeedSequence(seed)``, so a given seed gives the same samples whether the
+    chunks run serially or on any number of worker processes.
+
+        Args:
+            player (PlayerModel): The player executing the shot.
+            rollout (RolloutFunction | None): Outcome of each noisy shot. With processes > 1 it must be a
+                picklable top-level function. Defaults to simulate_end_score.
+            seed (int | None): Base seed; None draws fresh entropy for every call. Defaults to None.
+            chunk_size (int): Shots per chunk (the unit of work and of seeding). Defaults to 1024.
+            processes (int): Worker processes for rollouts; 1 runs them in the calling process. Defaults to 1.
+    """
+
+    def __init__(
+        self,
+        player: PlayerModel,
+        rollout: Optional[RolloutFunction] = None,
+        seed: Optional[int] = None,
+        chunk_size: int = 1024,
+        processes: int = 1,
+    ):
+        self.player = player
+        self.rollout: RolloutFunction = rollout or simulate_end_score
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.processes = processes
+        self._pool: Optional[Executor] = None
+
+    def __enter__(self) -> "ShotNoiseSampler":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker processes, if any."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.processes)
+        return self._pool
+
+    def _chunks(self, count: int, seed: Optional[int]) -> List[Tuple[int, np.random.SeedSequence]]:
+        n_chunks = max(1, math.ceil(count / self.chunk_size))
+        seeds = np.random.SeedSequence(self.seed if seed is None else seed).spawn(n_chunks)
+        sizes = [min(self.chunk_size, count - i * self.chunk_size) for i in range(n_chunks)]
+        return list(zip(sizes, seeds))
+
+    def sample(
+        self,
+        shot: Union[ShotInfoModel, Sequence[float]],
+        count: int,
+        seed: Optional[int] = None,
+    ) -> np.ndarray:
+        """Draw ``count`` noisy versions of ``shot`` (the same ones :meth:`rollouts` uses for this seed).
+        Args:
+            shot: Intended shot, as ShotInfoModel or (translational_velocity, shot_angle, angular_velocity).
+            count (int): Number of samples K.
+            seed (int | None): Overrides the sampler's seed for this call.
+        Returns:
+            np.ndarray: ``(K, 3)`` noisy shots.
+        """
+        return np.concatenate([
+            perturb_shots(shot, size, self.player, np.random.default_rng(chunk_seed))
+            for size, chunk_seed in self._chunks(count, seed)
+        ])
+
+    def rollouts(
+        self,
+        board: np.ndarray,
+        shot: Union[ShotInfoModel, Sequence[float]],
+        count: int,
+        team: int = 0,
+        index: int = 0,
+        seed: Optional[int] = None,
+    ) -> np.ndarray:
+        """Roll out ``count`` noisy versions of ``shot`` on ``board`` and return the ``(K,)`` outcomes.
+        Args:
+            board (np.ndarray): ``(2, 8, 2)`` stone positions, e.g. from stone_array(state).
+            shot: Intended shot, as ShotInfoModel or (translational_velocity, shot_angle, angular_velocity).
+            count (int): Number of samples K.
+            team (int): Team of the thrown stone (0 = "team0"). Defaults to 0.
+            index (int): Stone index of the thrown stone. Defaults to 0.
+            seed (int | None): Overrides the sampler's seed for this call.
+        """
+        board = np.asarray(board, dtype=np.float64)
+        intended = tuple(shot_array(shot)[0])
+        jobs = [
+            (self.rollout, board, intended, size, self.player, chunk_seed, team, index)
+            for size, chunk_seed in self._chunks(count, seed)
+        ]
+        if self.processes > 1 and len(jobs) > 1:
+            results = list(self._get_pool().map(_rollout_chunk, *zip(*jobs)))
+        else:
+            results = [_rollout_chunk(*job) for job in jobs]
+        return np.concatenate(results)
+
+    def evaluate(
+        self,
+        board: np.ndarray,
+        shot: Union[ShotInfoModel, Sequence[float]],
+        count: int,
+        team: int = 0,
+        index: int = 0,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Roll out ``count`` noisy shots and summarize the outcomes (see summarize_outcomes).
+        With the default rollout the mean is the expected end score, positive when team0 scores.
+        """
+        return summarize_outcomes(self.rollouts(board, shot, count, team, index, seed))
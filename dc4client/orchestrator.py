@@ -0,0 +1,275 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+from uuid import UUID
+
+import aiohttp
+
+from dc4client.dc_client import DCClient
+from dc4client.send_data import MatchNameModel, TeamModel
+
+
+__all__ = ["PlayFunction", "MatchSpec", "MatchResult", "MatchOrchestrator"]
+
+
+# play(client) plays one side of a match to the end, e.g. by iterating
+# client.receive_state_data() and sending a shot whenever it is the client's turn.
+PlayFunction = Callable[[DCClient], Awaitable[Any]]
+
+
+class MatchSpec:
+    """One client (one side of a match) for MatchOrchestrator to run.
+
+        Args:
+            match_id (UUID): Match to join.
+            username (str): Username for authentication.
+            password (str): Password for authentication.
+            team_info (TeamModel): Team sent with send_team_info before playing.
+            match_team_name (MatchNameModel): Side to play. Defaults to MatchNameModel.team1.
+            client_kwargs (Dict[str, Any] | None): Extra DCClient arguments for this client only. Defaults to None.
+    """
+    __slots__ = ("match_id", "username", "password", "team_info", "match_team_name", "client_kwargs")
+
+    def __init__(
+        self,
+        match_id: UUID,
+        username: str,
+        password: str,
+        team_info: TeamModel,
+        match_team_name: MatchNameModel = MatchNameModel.team1,
+        client_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self.match_id = match_id
+        self.username = username
+        self.password = password
+        self.team_info = team_info
+        self.match_team_name = match_team_name
+        self.client_kwargs: Dict[str, Any] = client_kwargs or {}
+
+
+class MatchResult:
+    """Outcome of one client run by MatchOrchestrator.
+
+        Attributes:
+            match_id (str): Match played.
+            match_team_name (str | None): Side assigned by the server.
+            winner_team (str | None): Winner reported by the server, if the match finished.
+            shots (int): Shots accepted by the server.
+            elapsed (float): Seconds from joining the match to closing the client.
+            result (Any): Return value of the play function.
+            error (str | None): repr of the exception that ended the client, if any.
+    """
+    __slots__ = ("match_id", "match_team_name", "winner_team", "shots", "elapsed", "result", "error")
+
+    def __init__(self, match_id, match_team_name, winner_team, shots, elapsed, result=None, error=None):
+        self.match_id: str = match_id
+        self.match_team_name: Optional[str] = match_team_name
+        self.winner_team: Optional[str] = winner_team
+        self.shots: int = shots
+        self.elapsed: float = elapsed
+        self.result: Any = result
+        self.error: Optional[str] = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return (
+            f"MatchResult(match_id={self.match_id}, match_team_name={self.match_team_name}, "
+            f"winner_team={self.winner_team}, shots={self.shots}, elapsed={self.elapsed:.2f}, error={self.error})"
+        )
+
+
+def _team_value(team: Any) -> Optional[str]:
+    return None if team is None else str(getattr(team, "value", team))
+
+
+def _group_by_match(specs: Sequence[MatchSpec]) -> List[List[int]]:
+    """Group spec indices by match_id (keeping first-seen order) so both sides of a match run together."""
+    groups: Dict[str, List[int]] = {}
+    for index, spec in enumerate(specs):
+        groups.setdefault(str(spec.match_id), []).append(index)
+    return list(groups.values())
+
+
+def _in_spec_order(groups: List[List[int]], results: Iterable[List[MatchResult]], count: int) -> List[MatchResult]:
+    """Put the results of each group of spec indices back at the positions of their specs."""
+    ordered: List[Optional[MatchResult]] = [None] * count
+    for group, group_results in zip(groups, results):
+        for index, result in zip(group, group_results):
+            ordered[index] = result
+    return ordered
+
+
+class MatchOrchestrator:
+    """Run many matches concurrently on one event loop, or sharded across processes.
+
+    Every client gets its own log file (named after its
+    team and match_id), while all clients of a loop share one aiohttp
+    connector, so keep-alive connections to the server are pooled instead of
+    opened per client. At most ``max_concurrency`` matches run at once; the
+    specs of one match_id (e.g. both sides of a self-play game) always run
+    together and count as one match.
+
+    ``run_sharded`` splits the matches over worker processes, each running its
+    own orchestrator and event loop, and merges the results::
+
+        orchestrator = MatchOrchestrator("localhost", 5000, play, max_concurrency=16)
+        results = orchestrator.run_sharded(specs, processes=os.cpu_count())
+        print(orchestrator.stats())
+
+        Args:
+            host (str): Server host address.
+            port (int): Server port number.
+            play (PlayFunction): Coroutine function playing one client's match. With run_sharded it must be
+                a picklable top-level function.
+            max_concurrency (int): Matches running at the same time (per process). Defaults to 8.
+            connection_limit (int): Connections in the shared pool; 0 is unlimited. Every running client
+                holds one connection for its SSE stream. Defaults to 0.
+            keepalive_timeout (float): Seconds an idle pooled connection is kept open. Defaults to 30.
+            log_dir (str): Directory for the per-client log files. Defaults to "logs".
+            client_kwargs (Dict[str, Any] | None): Extra DCClient arguments for every client. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        play: PlayFunction,
+        max_concurrency: int = 8,
+        connection_limit: int = 0,
+        keepalive_timeout: float = 30.0,
+        log_dir: str = "logs",
+        client_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.play = play
+        self.max_concurrency = max_concurrency
+        self.connection_limit = connection_limit
+        self.keepalive_timeout = keepalive_timeout
+        self.log_dir = log_dir
+        self.client_kwargs: Dict[str, Any] = client_kwargs or {}
+        self.logger = logging.getLogger("DC_Orchestrator")
+        self.results: List[MatchResult] = []
+        self.elapsed: float = 0.0
+
+    def _create_connector(self) -> aiohttp.TCPConnector:
+        return aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            limit_per_host=0,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=True,
+        )
+
+    async def _run_client(self, spec: MatchSpec, connector: aiohttp.BaseConnector) -> MatchResult:
+        kwargs = {"log_dir": self.log_dir, **self.client_kwargs, **spec.client_kwargs}
+        client = DCClient(
+            match_id=spec.match_id,
+            username=spec.username,
+            password=spec.password,
+            match_team_name=spec.match_team_name,
+            connector=connector,
+            **kwargs,
+        )
+        client.set_server_address(self.host, self.port)
+        start = time.monotonic()
+        result = error = None
+        try:
+            await client.send_team_info(spec.team_info)
+            result = await self.play(client)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = repr(e)
+            self.logger.error(f"Match {spec.match_id} ({_team_value(spec.match_team_name)}) failed: {error}")
+        finally:
+            await client.close()
+        return MatchResult(
+            match_id=str(spec.match_id),
+            match_team_name=_team_value(client.match_team_name),
+            winner_team=_team_value(client.get_winner_team() if client.state_data is not None else client.winner_team),
+            shots=client.shots_sent,
+            elapsed=time.monotonic() - start,
+            result=result,
+            error=error,
+        )
+
+    async def _run_match(
+        self,
+        group: List[MatchSpec],
+        semaphore: asyncio.Semaphore,
+        connector: aiohttp.BaseConnector,
+    ) -> List[MatchResult]:
+        async with semaphore:
+            return list(await asyncio.gather(*(self._run_client(spec, connector) for spec in group)))
+
+    async def run(self, specs: Iterable[MatchSpec]) -> List[MatchResult]:
+        """Run every spec on the current event loop and return one MatchResult per spec, in order."""
+        specs = list(specs)
+        groups = _group_by_match(specs)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        start = time.monotonic()
+        connector = self._create_connector()
+        try:
+            matches = await asyncio.gather(*(
+                self._run_match([specs[index] for index in group], semaphore, connector) for group in groups
+            ))
+        finally:
+            await connector.close()
+        self.elapsed = time.monotonic() - start
+        self.results = _in_spec_order(groups, matches, len(specs))
+        return self.results
+
+    def run_sharded(self, specs: Iterable[MatchSpec], processes: Optional[int] = None) -> List[MatchResult]:
+        """Split the matches round-robin over worker processes, each running :meth:`run` on its own
+        event loop, and return one MatchResult per spec, in order.
+        Args:
+            specs (Iterable[MatchSpec]): Clients to run.
+            processes (int | None): Worker processes. Defaults to os.cpu_count().
+        """
+        specs = list(specs)
+        groups = _group_by_match(specs)
+        processes = max(1, min(processes or os.cpu_count() or 1, len(groups)))
+        shards = [[index for group in groups[i::processes] for index in group] for i in range(processes)]
+        shard_specs = [[specs[index] for index in shard] for shard in shards]
+        start = time.monotonic()
+        if processes == 1:
+            shard_results = [asyncio.run(self.run(shard_specs[0])) if specs else []]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                shard_results = list(pool.map(_run_shard, [self] * processes, shard_specs))
+        self.elapsed = time.monotonic() - start
+        self.results = _in_spec_order(shards, shard_results, len(specs))
+        return self.results
+
+    def stats(self) -> Dict[str, Any]:
+        """Aggregate throughput of the last run.
+        Returns:
+            Dict[str, Any]: matches, failed_matches, shots, elapsed (s), matches_per_hour and shots_per_second.
+        """
+        failed = {result.match_id for result in self.results if not result.ok}
+        matches = len({result.match_id for result in self.results})
+        shots = sum(result.shots for result in self.results)
+        elapsed = self.elapsed
+        return {
+            "matches": matches,
+            "failed_matches": len(failed),
+            "shots": shots,
+            "elapsed": elapsed,
+            "matches_per_hour": (matches - len(failed)) * 3600.0 / elapsed if elapsed > 0 else 0.0,
+            "shots_per_second": shots / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["results"] = []
+        return state
+
+
+def _run_shard(orchestrator: MatchOrchestrator, specs: Sequence[MatchSpec]) -> List[MatchResult]:
+    return asyncio.run(orchestrator.run(specs))
@@ -4,6 +4,22 @@ from uuid import UUID
 from datetime import datetime
 
 
+__all__ = [
+    "TournamentSchema",
+    "PhysicalSimulatorSchema",
+    "PlayerSchema",
+    "TrajectorySchema",
+    "CoordinateDataSchema",
+    "StoneCoordinateSchema",
+    "ScoreSchema",
+    "ShotInfoSchema",
+    "PowerPlayEndSchema",
+    "MixDoublesSettingsSchema",
+    "StateSchema",
+    "MatchDataSchema",
+]
+
+
 class TournamentSchema(BaseModel):
     tournament_id: UUID
     tournament_name: str
@@ -0,0 +1,379 @@
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from dc4client.board import NO_TEAM, TEAM0, TEAM1
+from dc4client.compact_state import CompactState
+from dc4client.encoder import hammer_team
+from dc4client.receive_data import StateSchema
+
+
+__all__ = ["ROW_COLUMNS", "MATCH_COLUMNS", "INDEXED_COLUMNS", "GameRecordWriter", "GameRecordStore"]
+
+
+_STORE_VERSION = 1
+
+# One row per recorded state: column -> (dtype, per-row shape).
+#   match:            position of the match in GameRecordStore.match_ids.
+#   next_team:        team to throw next (0 = "team0", -1 if none).
+#   hammer:           team with the last stone of the end (-1 if unknown).
+#   score:            team0 and team1 totals so far.
+#   score_difference: team0 total minus team1 total.
+#   last_move:        previous shot as (translational_velocity, shot_angle, angular_velocity), NaN if none.
+ROW_COLUMNS: Dict[str, Tuple[str, Tuple[int, ...]]] = {
+    "match": ("int32", ()),
+    "end_number": ("int16", ()),
+    "shot_number": ("int16", ()),
+    "total_shot_number": ("int16", ()),
+    "next_team": ("int8", ()),
+    "hammer": ("int8", ()),
+    "score": ("int16", (2,)),
+    "score_difference": ("int16", ()),
+    "remaining_time": ("float32", (2,)),
+    "last_move": ("float32", (3,)),
+    "stones": ("float32", (2, 8, 2)),
+}
+
+# One row per match.
+#   final_score: team0 and team1 totals of the last recorded state.
+#   winner:      winning team (-1 if the recording has no winner).
+MATCH_COLUMNS: Dict[str, Tuple[str, Tuple[int, ...]]] = {
+    "row_start": ("int64", ()),
+    "row_count": ("int32", ()),
+    "final_score": ("int16", (2,)),
+    "winner": ("int8", ()),
+}
+
+# Row columns with a sorted index (see GameRecordStore.query)
+INDEXED_COLUMNS = ("total_shot_number", "end_number", "shot_number")
+
+_TEAM_INDEX = {"team0": TEAM0, "team1": TEAM1}
+
+
+def _score_totals(score: Any) -> Tuple[int, int]:
+    if score is None:
+        return 0, 0
+    totals = []
+    for team in ("team0", "team1"):
+        values = score.get(team) if isinstance(score, dict) else getattr(score, team, None)
+        totals.append(sum(points for points in (values or ()) if points is not None))
+    return totals[0], totals[1]
+
+
+def _compact(state: Union[StateSchema, CompactState, Dict[str, Any]]) -> CompactState:
+    if isinstance(state, CompactState):
+        return state
+    if isinstance(state, StateSchema):
+        return CompactState.from_state_schema(state)
+    return CompactState.from_payload(state)
+
+
+def _write_json(path: Path, value: Any) -> None:
+    """Replace a JSON file atomically, so readers never see it half written."""
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_text(json.dumps(value))
+    os.replace(temporary, path)
+
+
+def _truncate(path: Path, size: int) -> None:
+    with open(path, "r+b") as file:
+        file.truncate(size)
+
+
+class GameRecordWriter:
+    """Append matches to a GameRecordStore directory.
+
+    Every match is appended to one raw binary file per column
+    (``rows/<column>.bin``, ``matches/<column>.bin``) and its match_id to
+    ``match_ids.jsonl``, and all of them are flushed before add_match returns.
+    On :meth:`close` the sorted indexes are rebuilt and ``store.json`` is
+    replaced with the new row and match counts; readers only see the matches
+    of the last close. Opening an existing directory appends to it. The
+    counts are taken from the column files rather than ``store.json``, so a
+    writer that was never closed (e.g. a crashed process) loses at most the
+    match it was writing, and the next writer publishes the rest::
+
+        with GameRecordWriter("records") as writer:
+            for path in Path("replays").glob("*.jsonl"):
+                writer.add_recording(path)
+
+        Args:
+            directory (str | Path): Store directory (created if needed).
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        (self.directory / "rows").mkdir(parents=True, exist_ok=True)
+        (self.directory / "matches").mkdir(parents=True, exist_ok=True)
+        (self.directory / "index").mkdir(parents=True, exist_ok=True)
+        self.match_ids: List[str] = []
+        self.rows: int = 0
+        self._recover()
+        self._row_files = {name: open(self.directory / "rows" / f"{name}.bin", "ab") for name in ROW_COLUMNS}
+        self._match_files = {name: open(self.directory / "matches" / f"{name}.bin", "ab") for name in MATCH_COLUMNS}
+        self._match_id_file = open(self.directory / "match_ids.jsonl", "ab")
+        self._closed = False
+
+    def _recover(self) -> None:
+        """Count the complete matches in the column files and cut off a partly written one."""
+        def column_path(group: str, name: str) -> Path:
+            return self.directory / group / f"{name}.bin"
+
+        def row_bytes(dtype: str, shape: Tuple[int, ...]) -> int:
+            return np.dtype(dtype).itemsize * math.prod(shape)
+
+        ids_path = self.directory / "match_ids.jsonl"
+        match_ids = ids_path.read_bytes().splitlines(keepends=True) if ids_path.exists() else []
+        # A match is complete once its match_id line is written (the last of its writes)
+        match_ids = [line for line in match_ids if line.endswith(b"\n")]
+        matches = min([len(match_ids)] + [
+            (column_path("matches", name).stat().st_size if column_path("matches", name).exists() else 0)
+            // row_bytes(dtype, shape)
+            for name, (dtype, shape) in MATCH_COLUMNS.items()
+        ])
+        if matches:
+            (start_dtype, _), (count_dtype, _) = MATCH_COLUMNS["row_start"], MATCH_COLUMNS["row_count"]
+            start = np.fromfile(column_path("matches", "row_start"), dtype=start_dtype, count=matches)[-1]
+            count = np.fromfile(column_path("matches", "row_count"), dtype=count_dtype, count=matches)[-1]
+            self.rows = int(start) + int(count)
+        self.match_ids = [json.loads(line) for line in match_ids[:matches]]
+        for group, columns, count in (("rows", ROW_COLUMNS, self.rows), ("matches", MATCH_COLUMNS, matches)):
+            for name, (dtype, shape) in columns.items():
+                path = column_path(group, name)
+                if path.exists() and path.stat().st_size > count * row_bytes(dtype, shape):
+                    _truncate(path, count * row_bytes(dtype, shape))
+        if ids_path.exists() and ids_path.stat().st_size > sum(map(len, match_ids[:matches])):
+            _truncate(ids_path, sum(map(len, match_ids[:matches])))
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def add_match(
+        self,
+        match_id: Any,
+        states: Iterable[Union[StateSchema, CompactState, Dict[str, Any]]],
+    ) -> int:
+        """Append the states of one match (StateSchema, CompactState or state_update payloads, in order).
+        Returns:
+            int: Number of rows added.
+        """
+        states = [_compact(state) for state in states]
+        n = len(states)
+        columns = {name: np.empty((n,) + shape, dtype=dtype) for name, (dtype, shape) in ROW_COLUMNS.items()}
+        columns["match"][:] = len(self.match_ids)
+        totals = (0, 0)
+        for row, state in enumerate(states):
+            totals = _score_totals(state.score)
+            columns["end_number"][row] = state.end_number
+            columns["shot_number"][row] = -1 if state.shot_number is None else state.shot_number
+            columns["total_shot_number"][row] = -1 if state.total_shot_number is None else state.total_shot_number
+            columns["next_team"][row] = _TEAM_INDEX.get(state.next_shot_team, NO_TEAM)
+            columns["hammer"][row] = hammer_team(state)
+            columns["score"][row] = totals
+            columns["score_difference"][row] = totals[0] - totals[1]
+            columns["remaining_time"][row] = (state.first_team_remaining_time, state.second_team_remaining_time)
+            if state.last_move is None:
+                columns["last_move"][row] = math.nan
+            else:
+                velocity, spin, angle = state.last_move
+                columns["last_move"][row] = (velocity, angle, math.nan if spin is None else spin)
+            columns["stones"][row] = state.stones
+        for name, array in columns.items():
+            self._row_files[name].write(np.ascontiguousarray(array).tobytes())
+            self._row_files[name].flush()
+
+        # Rows first, then the match, then its match_id: a complete match_id line means a complete match
+        winner = _TEAM_INDEX.get(states[-1].winner_team, NO_TEAM) if states else NO_TEAM
+        match_row = {"row_start": self.rows, "row_count": n, "final_score": totals, "winner": winner}
+        for name, (dtype, _) in MATCH_COLUMNS.items():
+            self._match_files[name].write(np.asarray(match_row[name], dtype=dtype).tobytes())
+            self._match_files[name].flush()
+        self._match_id_file.write(json.dumps(str(match_id)).encode() + b"\n")
+        self._match_id_file.flush()
+        self.match_ids.append(str(match_id))
+        self.rows += n
+        return n
+
+    def add_recording(self, path: Union[str, Path]) -> int:
+        """Append a match recorded by MatchRecorder (the match_id comes from its header)."""
+        with open(path, "rb") as file:
+            header = json.loads(file.readline())
+            states = [json.loads(line)["state"] for line in file]
+        return self.add_match(header.get("match_id") or Path(path).stem, states)
+
+    def close(self) -> None:
+        """Close the column files, rebuild the indexes and replace ``store.json``."""
+        if self._closed:
+            return
+        self._closed = True
+        for file in [*self._row_files.values(), *self._match_files.values(), self._match_id_file]:
+            file.close()
+        for name in INDEXED_COLUMNS:
+            dtype, _ = ROW_COLUMNS[name]
+            keys = np.fromfile(self.directory / "rows" / f"{name}.bin", dtype=dtype)
+            order = np.argsort(keys, kind="stable").astype(np.int64)
+            order.tofile(self.directory / "index" / f"{name}.order.bin")
+            keys[order].tofile(self.directory / "index" / f"{name}.keys.bin")
+        _write_json(self.directory / "store.json", {"version": _STORE_VERSION, "rows": self.rows, "matches": len(self.match_ids)})
+
+
+class GameRecordStore:
+    """Read-only, memory-mapped view of a directory written by GameRecordWriter.
+
+    Every column is a ``np.memmap`` opened on first use, so a query only
+    reads the pages of the columns (and rows) it touches. :meth:`query`
+    narrows rows with the sorted indexes on total_shot_number, end_number
+    and shot_number and the per-match table (match, final score, winner)
+    before filtering the remaining conditions on the candidate rows only.
+    "All positions at shot 15 where team1 had hammer and was down by 1"::
+
+        store = GameRecordStore("records")
+        rows = store.query(total_shot_number=15, hammer=1, score_difference=1)
+        boards = store.column("stones")[rows]
+
+        Args:
+            directory (str | Path): Store directory.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        meta = json.loads((self.directory / "store.json").read_text())
+        if meta.get("version") != _STORE_VERSION:
+            raise ValueError(f"Unsupported game record store version {meta.get('version')!r}")
+        self.rows: int = meta["rows"]
+        self.matches: int = meta["matches"]
+        self._match_ids: Optional[List[str]] = None
+        self._match_positions: Optional[Dict[str, int]] = None
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def match_ids(self) -> List[str]:
+        """match_id of every match, by position (loaded on first use)."""
+        if self._match_ids is None:
+            # A writer may have appended matches since store.json was written
+            lines = (self.directory / "match_ids.jsonl").read_bytes().splitlines()[: self.matches]
+            self._match_ids = json.loads(b"[" + b",".join(lines) + b"]")
+        return self._match_ids
+
+    def _map(self, path: Path, dtype: str, shape: Tuple[int, ...], count: int) -> np.ndarray:
+        if count == 0:
+            return np.empty((0,) + shape, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(count,) + shape)
+
+    def column(self, name: str) -> np.ndarray:
+        """Memory-mapped row column (see ROW_COLUMNS)."""
+        if name not in self._columns:
+            dtype, shape = ROW_COLUMNS[name]
+            self._columns[name] = self._map(self.directory / "rows" / f"{name}.bin", dtype, shape, self.rows)
+        return self._columns[name]
+
+    def match_column(self, name: str) -> np.ndarray:
+        """Memory-mapped per-match column (see MATCH_COLUMNS)."""
+        key = "matches/" + name
+        if key not in self._columns:
+            dtype, shape = MATCH_COLUMNS[name]
+            self._columns[key] = self._map(self.directory / "matches" / f"{name}.bin", dtype, shape, self.matches)
+        return self._columns[key]
+
+    def _index(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        key = "index/" + name
+        if key not in self._columns:
+            dtype, _ = ROW_COLUMNS[name]
+            self._columns[key] = (
+                self._map(self.directory / "index" / f"{name}.keys.bin", dtype, (), self.rows),
+                self._map(self.directory / "index" / f"{name}.order.bin", "int64", (), self.rows),
+            )
+        return self._columns[key]
+
+    def _indexed_rows(self, name: str, value: int) -> np.ndarray:
+        keys, order = self._index(name)
+        start, stop = np.searchsorted(keys, [value, value + 1])
+        # The index was built with a stable sort, so equal keys are already in row order
+        return np.asarray(order[start:stop])
+
+    def match_rows(self, match: Union[int, str]) -> np.ndarray:
+        """Rows of one match, given by position or match_id."""
+        if isinstance(match, str):
+            if self._match_positions is None:
+                self._match_positions = {match_id: position for position, match_id in enumerate(self.match_ids)}
+            position = self._match_positions[match]
+        else:
+            position = int(match)
+        start = int(self.match_column("row_start")[position])
+        return np.arange(start, start + int(self.match_column("row_count")[position]))
+
+    def query(
+        self,
+        match: Optional[Union[int, str]] = None,
+        end_number: Optional[int] = None,
+        shot_number: Optional[int] = None,
+        total_shot_number: Optional[int] = None,
+        next_team: Optional[int] = None,
+        hammer: Optional[int] = None,
+        score_difference: Optional[int] = None,
+        final_score: Optional[Sequence[int]] = None,
+        final_score_difference: Optional[int] = None,
+        winner: Optional[int] = None,
+    ) -> np.ndarray:
+        """Return the sorted row numbers matching every given condition (None means any).
+        Args:
+            match (int | str | None): Match position or match_id.
+            end_number, shot_number, total_shot_number (int | None): Turn of the state.
+            next_team, hammer (int | None): TEAM0 or TEAM1.
+            score_difference (int | None): team0 total minus team1 total at the state.
+            final_score (Sequence[int] | None): (team0, team1) totals at the end of the match.
+            final_score_difference (int | None): team0 minus team1 at the end of the match.
+            winner (int | None): Winning team of the match.
+        """
+        rows: Optional[np.ndarray] = None
+        if match is not None:
+            rows = self.match_rows(match)
+        for name, value in (("total_shot_number", total_shot_number), ("end_number", end_number), ("shot_number", shot_number)):
+            if value is None:
+                continue
+            if rows is None:
+                rows = self._indexed_rows(name, value)
+            else:
+                rows = rows[self.column(name)[rows] == value]
+
+        if final_score is not None or final_score_difference is not None or winner is not None:
+            selected = np.ones(self.matches, dtype=bool)
+            final = self.match_column("final_score")
+            if final_score is not None:
+                selected &= (final == np.asarray(final_score)).all(axis=-1)
+            if final_score_difference is not None:
+                selected &= (final[:, 0].astype(np.int32) - final[:, 1]) == final_score_difference
+            if winner is not None:
+                selected &= self.match_column("winner") == winner
+            if rows is None:
+                starts = self.match_column("row_start")[selected]
+                counts = self.match_column("row_count")[selected]
+                rows = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(int(counts.sum()))
+            else:
+                rows = rows[selected[self.column("match")[rows]]]
+
+        for name, value in (("next_team", next_team), ("hammer", hammer), ("score_difference", score_difference)):
+            if value is None:
+                continue
+            if rows is None:
+                rows = np.flatnonzero(self.column(name) == value)
+            else:
+                rows = rows[self.column(name)[rows] == value]
+
+        if rows is None:
+            return np.arange(self.rows)
+        return rows
+
+    def select(self, rows: np.ndarray, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Copy the given rows of some (default all) row columns into memory."""
+        return {name: np.asarray(self.column(name)[rows]) for name in (columns or ROW_COLUMNS)}
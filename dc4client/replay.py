@@ -0,0 +1,254 @@
+import asyncio
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, AsyncGenerator, AsyncIterable, Dict, List, Optional, Tuple, TypeVar, Union
+
+from dc4client.compact_state import CompactState
+from dc4client.receive_data import StateSchema
+
+
+__all__ = ["StateT", "index_path", "MatchRecorder", "MatchReplay"]
+
+
+_INDEX_VERSION = 1
+# States played back between yields to the event loop when not paced
+_YIELD_EVERY = 64
+
+StateT = TypeVar("StateT", StateSchema, CompactState)
+
+
+def index_path(path: Union[str, Path]) -> Path:
+    """Path of the index file written next to a match recording."""
+    path = Path(path)
+    return path.with_name(path.name + ".idx")
+
+
+def _payload(state: Union[StateSchema, CompactState, Dict[str, Any]]) -> Dict[str, Any]:
+    if isinstance(state, CompactState):
+        return state.to_payload()
+    if isinstance(state, StateSchema):
+        return state.model_dump(mode="json")
+    return state
+
+
+class MatchRecorder:
+    """Record the states of one match to a JSONL file that MatchReplay can play back.
+
+    The first line is a header (match_id, team and any extra metadata); every
+    further line is ``{"t": seconds since the first state, "state": payload}``
+    with the payload in the server's state_update format. On :meth:`close` an
+    index of the byte offset of every ``(end_number, total_shot_number)`` is
+    written next to the file (see index_path), so a replay can seek without
+    scanning. Lines are written through a buffered file, so recording costs
+    little on the event loop::
+
+        with MatchRecorder("replays/match.jsonl", match_id=client.match_id) as recorder:
+            async for state in recorder.wrap(client.receive_state_data()):
+                ...
+
+        Args:
+            path (str | Path): File to write (parent directories are created).
+            match_id (Any): Stored in the header. Defaults to None.
+            match_team_name (Any): Stored in the header. Defaults to None.
+            metadata (Dict[str, Any] | None): Extra JSON-compatible header fields. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        match_id: Any = None,
+        match_team_name: Any = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._entries: List[List[Any]] = []
+        self._start: Optional[float] = None
+        header = {
+            "match_id": None if match_id is None else str(match_id),
+            "match_team_name": None if match_team_name is None else str(getattr(match_team_name, "value", match_team_name)),
+            **(metadata or {}),
+        }
+        self._write_line(header)
+
+    def __enter__(self) -> "MatchRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def records(self) -> int:
+        return len(self._entries)
+
+    def _write_line(self, record: Dict[str, Any]) -> int:
+        offset = self._file.tell()
+        self._file.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+        return offset
+
+    def record(
+        self,
+        state: Union[StateSchema, CompactState, Dict[str, Any]],
+        received_at: Optional[float] = None,
+    ) -> None:
+        """Append one state.
+        Args:
+            state: StateSchema, CompactState or a decoded state_update payload.
+            received_at (float | None): ``time.monotonic()`` when the state arrived. Defaults to now.
+        """
+        if received_at is None:
+            received_at = time.monotonic()
+        if self._start is None:
+            self._start = received_at
+        payload = _payload(state)
+        elapsed = round(received_at - self._start, 6)
+        offset = self._write_line({"t": elapsed, "state": payload})
+        self._entries.append([payload["end_number"], payload.get("total_shot_number"), offset, elapsed])
+
+    async def wrap(self, states: AsyncIterable[StateT]) -> AsyncGenerator[StateT, None]:
+        """Record every state of a stream (e.g. ``client.receive_state_data()``) while passing it on."""
+        async for state in states:
+            self.record(state)
+            yield state
+
+    def close(self) -> None:
+        """Close the recording and write its index."""
+        if self._file.closed:
+            return
+        self._file.close()
+        index = {"version": _INDEX_VERSION, "size": self.path.stat().st_size, "entries": self._entries}
+        index_path(self.path).write_text(json.dumps(index, separators=(",", ":")))
+
+
+def _build_index(path: Path) -> Dict[str, Any]:
+    """Scan a recording and return its index (used when the index file is missing or stale)."""
+    entries = []
+    with open(path, "rb") as file:
+        file.readline()
+        offset = file.tell()
+        for line in file:
+            record = json.loads(line)
+            state = record["state"]
+            entries.append([state["end_number"], state.get("total_shot_number"), offset, record["t"]])
+            offset += len(line)
+    return {"version": _INDEX_VERSION, "size": path.stat().st_size, "entries": entries}
+
+
+class MatchReplay:
+    """Play a MatchRecorder file back with the interface of ``DCClient.receive_state_data``.
+
+    ``speed`` sets the pace: 1.0 replays with the recorded gaps between
+    states, 10.0 ten times faster, and None (or inf) as fast as possible.
+    :meth:`seek` jumps to any recorded ``(end_number, total_shot_number)``
+    through the index, without reading the states before it. The index file
+    is rebuilt (one scan) if it is missing or does not match the recording.
+
+    The latest state is kept in ``state_data``; pass a DCClient as ``client``
+    to feed it the states too (see DCClient.feed_state), so its getters,
+    get_deadline and run_policy work on the replayed match. A paced replay
+    stamps each state with its recorded time mapped onto ``time.monotonic()``;
+    an unpaced one with the time it is played back::
+
+        replay = MatchReplay("replays/match.jsonl")
+        replay.seek(end_number=3, total_shot_number=0)
+        async for state in replay.receive_state_data(client=client):
+            shot = await client.run_policy(policy.decide)
+
+        Args:
+            path (str | Path): Recording written by MatchRecorder.
+            speed (float | None): Playback speed relative to real time; None plays as fast as possible.
+                Defaults to None.
+    """
+
+    def __init__(self, path: Union[str, Path], speed: Optional[float] = None):
+        self.path = Path(path)
+        self.speed = speed
+        with open(self.path, "rb") as file:
+            self.header: Dict[str, Any] = json.loads(file.readline())
+        self._index = self._load_index()
+        self._positions: Dict[Tuple[int, Optional[int]], int] = {}
+        for position, (end_number, total_shot_number, _, _) in enumerate(self._index["entries"]):
+            self._positions.setdefault((end_number, total_shot_number), position)
+        self._position = 0
+        self.state_data: Optional[Union[StateSchema, CompactState]] = None
+
+    def _load_index(self) -> Dict[str, Any]:
+        path = index_path(self.path)
+        try:
+            index = json.loads(path.read_text())
+            if index.get("version") == _INDEX_VERSION and index.get("size") == os.path.getsize(self.path):
+                return index
+        except (OSError, ValueError):
+            pass
+        index = _build_index(self.path)
+        try:
+            path.write_text(json.dumps(index, separators=(",", ":")))
+        except OSError:
+            pass
+        return index
+
+    def __len__(self) -> int:
+        return len(self._index["entries"])
+
+    def keys(self) -> List[Tuple[int, Optional[int]]]:
+        """Recorded ``(end_number, total_shot_number)`` pairs, in recording order (with repeats)."""
+        return [(entry[0], entry[1]) for entry in self._index["entries"]]
+
+    def seek(self, end_number: int, total_shot_number: Optional[int] = 0) -> None:
+        """Start the next playback at the first state recorded for this end and shot.
+        Raises:
+            KeyError: If no such state was recorded.
+        """
+        key = (end_number, total_shot_number)
+        if key not in self._positions:
+            raise KeyError(f"No state recorded for end_number={end_number}, total_shot_number={total_shot_number}")
+        self._position = self._positions[key]
+
+    def rewind(self) -> None:
+        """Start the next playback at the first recorded state."""
+        self._position = 0
+
+    async def receive_state_data(
+        self, compact: bool = False, client: Any = None
+    ) -> AsyncGenerator[Union[StateSchema, CompactState], None]:
+        """Yield the recorded states from the current position (see seek) to the end of the recording.
+        Args:
+            compact (bool): Yield CompactState objects instead of StateSchema. Defaults to False.
+            client (DCClient | None): Client fed every state with DCClient.feed_state. Defaults to None.
+        """
+        parse_state = CompactState.from_payload if compact else StateSchema.model_validate
+        entries = self._index["entries"]
+        pace = None if self.speed is None or math.isinf(self.speed) else self.speed
+        started = time.monotonic()
+        first_time = entries[self._position][3] if self._position < len(entries) else 0.0
+        played = 0
+
+        with open(self.path, "rb") as file:
+            if self._position < len(entries):
+                file.seek(entries[self._position][2])
+            while self._position < len(entries):
+                line = file.readline()
+                if not line:
+                    break
+                record = json.loads(line)
+                if pace is not None:
+                    received_at = started + (record["t"] - first_time) / pace
+                    delay = received_at - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                else:
+                    received_at = time.monotonic()
+                    played += 1
+                    if played % _YIELD_EVERY == 0:
+                        # Let other tasks run during a long fast replay
+                        await asyncio.sleep(0)
+                self._position += 1
+                state = parse_state(record["state"])
+                self.state_data = state
+                if client is not None:
+                    client.feed_state(state, received_at)
+                yield state
@@ -0,0 +1,366 @@
+import logging
+import math
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from dc4client.compact_state import CompactState, stone_array
+from dc4client.dc_client import DCClient
+from dc4client.encoder import hammer_team, score_difference
+from dc4client.orchestrator import MatchOrchestrator, MatchSpec
+from dc4client.receive_data import StateSchema
+from dc4client.send_data import ClientDataModel, MatchNameModel, ShotInfoModel, TeamModel
+from dc4client.simulator import default_simulator, shot_array
+
+
+__all__ = [
+    "SAMPLE_SCHEMA",
+    "DEFAULT_FALLBACK_SHOT",
+    "Policy",
+    "ShardWriter",
+    "load_shards",
+    "self_play_specs",
+    "SelfPlayPipeline",
+]
+
+
+# Column name -> (dtype, per-sample shape) of every self-play shard.
+#   team:             thrower (0 = "team0").
+#   stones:           board before the shot, as stone_array.
+#   remaining_time:   first and second team remaining time.
+#   score_difference: team0 total minus team1 total before the shot.
+#   hammer:           team with the last stone of the end (-1 if unknown).
+#   shot:             submitted (translational_velocity, shot_angle, angular_velocity).
+#   end_score:        thrower's points minus the opponent's in this end (NaN if the end never finished).
+#   won:              1 if the thrower's team won the match, 0 if it lost (NaN if unknown).
+SAMPLE_SCHEMA: Dict[str, Tuple[str, Tuple[int, ...]]] = {
+    "match_id": ("U36", ()),
+    "team": ("int8", ()),
+    "end_number": ("int16", ()),
+    "shot_number": ("int16", ()),
+    "total_shot_number": ("int16", ()),
+    "stones": ("float32", (2, 8, 2)),
+    "remaining_time": ("float32", (2,)),
+    "score_difference": ("int16", ()),
+    "hammer": ("int8", ()),
+    "shot": ("float32", (3,)),
+    "end_score": ("float32", ()),
+    "won": ("float32", ()),
+}
+
+# Shot thrown when the policy misses its deadline: a clockwise draw that stops on the tee
+# (within a few centimetres with default_simulator())
+DEFAULT_FALLBACK_SHOT: Tuple[float, float, float] = (2.486, 1.5985, math.pi / 2)
+
+Policy = Callable[[Any, Optional[float]], Union[Tuple[float, float, float], ShotInfoModel]]
+
+
+def _team_scores(score: Any, team: str) -> List[Optional[int]]:
+    if score is None:
+        return []
+    values = score.get(team) if isinstance(score, dict) else getattr(score, team, None)
+    return list(values or ())
+
+
+class ShardWriter:
+    """Append fixed-schema sample batches to sharded compressed ``.npz`` files from a background thread.
+
+    :meth:`write` only puts the batch on a queue, so callers on the event loop
+    never wait for compression or disk I/O. Every ``shard_size`` samples the
+    writer thread saves ``{prefix}_{n:05d}.npz`` (one array per schema column,
+    written to a temporary name and then renamed, so readers never see a
+    partial shard); :meth:`close` saves the remainder.
+
+        Args:
+            directory (str | Path): Directory of the shards (created if needed).
+            prefix (str): Shard file name prefix. Defaults to "selfplay".
+            shard_size (int): Samples per shard. Defaults to 65536.
+            compress (bool): Use np.savez_compressed instead of np.savez. Defaults to True.
+            schema (Dict[str, Tuple[str, Tuple[int, ...]]]): Column dtypes and shapes. Defaults to SAMPLE_SCHEMA.
+    """
+    _STOP = object()
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        prefix: str = "selfplay",
+        shard_size: int = 65536,
+        compress: bool = True,
+        schema: Optional[Dict[str, Tuple[str, Tuple[int, ...]]]] = None,
+    ):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.shard_size = shard_size
+        self.compress = compress
+        self.schema = dict(schema or SAMPLE_SCHEMA)
+        self.paths: List[Path] = []
+        self.samples_written: int = 0
+        self.error: Optional[BaseException] = None
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._pending: Dict[str, List[np.ndarray]] = {name: [] for name in self.schema}
+        self._pending_count = 0
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="dc4-shard-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write(self, columns: Dict[str, Any]) -> None:
+        """Queue a batch given as ``{column: array of shape (n,) + column shape}`` (never blocks).
+        Raises:
+            ValueError: If a column is missing or has the wrong shape.
+        """
+        batch = {}
+        size = None
+        for name, (dtype, shape) in self.schema.items():
+            if name not in columns:
+                raise ValueError(f"Missing column {name!r}")
+            array = np.asarray(columns[name], dtype=dtype)
+            if array.shape[1:] != shape or (size is not None and len(array) != size):
+                raise ValueError(f"Column {name!r} has shape {array.shape}, expected (n,) + {shape}")
+            size = len(array)
+            batch[name] = array
+        if size:
+            self._queue.put_nowait(batch)
+
+    def close(self) -> None:
+        """Write everything queued, save the last partial shard and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return samples (written), shards, queued batches, samples_per_second since creation
+        and the last write error, if any.
+        """
+        elapsed = time.monotonic() - self._started_at
+        return {
+            "samples": self.samples_written,
+            "shards": len(self.paths),
+            "queued": self._queue.qsize(),
+            "samples_per_second": self.samples_written / elapsed if elapsed > 0 else 0.0,
+            "error": repr(self.error) if self.error is not None else None,
+        }
+
+    def _save(self, count: int) -> None:
+        columns = {name: np.concatenate(parts) for name, parts in self._pending.items()}
+        rest = {name: array[count:] for name, array in columns.items()}
+        path = self.directory / f"{self.prefix}_{len(self.paths):05d}.npz"
+        temporary = path.with_name(path.stem + ".tmp.npz")
+        save = np.savez_compressed if self.compress else np.savez
+        save(temporary, **{name: array[:count] for name, array in columns.items()})
+        temporary.replace(path)
+        self.paths.append(path)
+        self.samples_written += count
+        self._pending = {name: [array] for name, array in rest.items()}
+        self._pending_count -= count
+
+    def _run(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is self._STOP:
+                    if self._pending_count:
+                        self._save(self._pending_count)
+                    return
+                for name, array in batch.items():
+                    self._pending[name].append(array)
+                self._pending_count += len(next(iter(batch.values())))
+                while self._pending_count >= self.shard_size:
+                    self._save(self.shard_size)
+            except Exception as e:
+                # Keep draining the queue; the error is reported by stats()
+                self.error = e
+                if batch is self._STOP:
+                    return
+
+
+def load_shards(paths: Iterable[Union[str, Path]]) -> Dict[str, np.ndarray]:
+    """Concatenate the columns of several shards written by ShardWriter."""
+    columns: Dict[str, List[np.ndarray]] = {}
+    for path in paths:
+        with np.load(path) as shard:
+            for name in shard.files:
+                columns.setdefault(name, []).append(shard[name])
+    return {name: np.concatenate(parts) for name, parts in columns.items()}
+
+
+class _MatchSamples:
+    """Samples of one client's match, completed with outcomes when the match ends."""
+
+    def __init__(self, match_id: str, team: int):
+        self.match_id = match_id
+        self.team = team
+        self.rows: List[Tuple[Union[StateSchema, CompactState], np.ndarray]] = []
+
+    def add(self, state: Union[StateSchema, CompactState], shot: np.ndarray) -> None:
+        self.rows.append((state, shot))
+
+    def columns(self, final_state: Optional[Union[StateSchema, CompactState]]) -> Dict[str, np.ndarray]:
+        me, opponent = ("team0", "team1") if self.team == 0 else ("team1", "team0")
+        score = final_state.score if final_state is not None else None
+        mine, theirs = _team_scores(score, me), _team_scores(score, opponent)
+        # Ends before the final state's end are over; all of them are once a winner is known
+        finished_ends = final_state.end_number if final_state is not None else 0
+        winner = final_state.winner_team if final_state is not None else None
+        if winner is not None:
+            finished_ends = len(mine)
+            won = 1.0 if winner == me else 0.0 if winner == opponent else math.nan
+        else:
+            won = math.nan
+
+        n = len(self.rows)
+        columns = {name: np.empty((n,) + shape, dtype=dtype) for name, (dtype, shape) in SAMPLE_SCHEMA.items()}
+        columns["match_id"][:] = self.match_id
+        columns["team"][:] = self.team
+        columns["won"][:] = won
+        for row, (state, shot) in enumerate(self.rows):
+            end = state.end_number
+            columns["end_number"][row] = end
+            columns["shot_number"][row] = state.shot_number or 0
+            columns["total_shot_number"][row] = state.total_shot_number or 0
+            columns["stones"][row] = stone_array(state)
+            columns["remaining_time"][row] = (state.first_team_remaining_time, state.second_team_remaining_time)
+            columns["score_difference"][row] = score_difference(state)
+            columns["hammer"][row] = hammer_team(state)
+            columns["shot"][row] = shot
+            if end < finished_ends and end < len(mine) and end < len(theirs) \
+                    and mine[end] is not None and theirs[end] is not None:
+                columns["end_score"][row] = mine[end] - theirs[end]
+            else:
+                columns["end_score"][row] = math.nan
+        return columns
+
+
+def self_play_specs(
+    match_ids: Iterable[Any],
+    team_info: TeamModel,
+    usernames: Tuple[str, str] = ("player0", "player1"),
+    password: str = "password",
+    opponent_team_info: Optional[TeamModel] = None,
+) -> List[MatchSpec]:
+    """Two MatchSpecs (team0 and team1) per match_id, for a pipeline playing both sides."""
+    specs = []
+    for match_id in match_ids:
+        specs.append(MatchSpec(match_id, usernames[0], password, team_info, MatchNameModel.team0))
+        specs.append(MatchSpec(match_id, usernames[1], password, opponent_team_info or team_info, MatchNameModel.team1))
+    return specs
+
+
+class SelfPlayPipeline:
+    """Generate (state, shot, outcome) training samples by playing matches.
+
+    Each client iterates ``receive_state_data`` and, on its turn, asks
+    ``policy`` for a shot through ``DCClient.run_policy`` (so the event loop
+    keeps reading the stream), submits it and keeps the state and shot. When
+    the match ends, the end scores and the winner are filled in and the
+    match's samples go to the ShardWriter as one batch (see SAMPLE_SCHEMA).
+    Matches run concurrently through a MatchOrchestrator::
+
+        with ShardWriter("data/selfplay") as writer:
+            pipeline = SelfPlayPipeline(search.decide, writer)
+            stats = await pipeline.run_local(settings, matches=100, team_info=team)
+
+        Args:
+            policy (Policy): ``policy(state, deadline)`` returning the shot, as for run_policy.
+            writer (ShardWriter): Destination of the samples.
+            fallback (Tuple[float, float, float]): Shot used when the policy misses its deadline or fails.
+                Defaults to DEFAULT_FALLBACK_SHOT.
+            max_concurrency (int): Matches played at the same time. Defaults to 8.
+            client_kwargs (Dict[str, Any] | None): Extra DCClient arguments. Defaults to no log files and
+                WARNING level.
+    """
+
+    def __init__(
+        self,
+        policy: Policy,
+        writer: ShardWriter,
+        fallback: Tuple[float, float, float] = DEFAULT_FALLBACK_SHOT,
+        max_concurrency: int = 8,
+        client_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self.policy = policy
+        self.writer = writer
+        self.fallback = fallback
+        self.max_concurrency = max_concurrency
+        self.client_kwargs: Dict[str, Any] = {
+            "auto_save_log": False,
+            "log_level": logging.WARNING,
+            **(client_kwargs or {}),
+        }
+        self.samples: int = 0
+        self.orchestrator: Optional[MatchOrchestrator] = None
+
+    async def play(self, client: DCClient) -> int:
+        """Play one side of a match, then queue its samples. Returns the number of samples."""
+        me = getattr(client.match_team_name, "value", client.match_team_name)
+        samples = _MatchSamples(str(client.match_id), 0 if me == "team0" else 1)
+        state = None
+        try:
+            async for state in client.receive_state_data(compact=True):
+                if state.winner_team is not None:
+                    break
+                if state.next_shot_team != me:
+                    continue
+                shot = await client.run_policy(self.policy, state, fallback=self.fallback)
+                shot = shot_array(shot if shot is not None else self.fallback)[0]
+                samples.add(state, shot)
+                await client.submit_shot(float(shot[0]), float(shot[1]), float(shot[2]))
+        finally:
+            if samples.rows:
+                self.writer.write(samples.columns(state))
+                self.samples += len(samples.rows)
+        return len(samples.rows)
+
+    async def run(self, host: str, port: int, specs: Iterable[MatchSpec]) -> Dict[str, Any]:
+        """Play every spec against the server at ``host:port`` and return :meth:`stats`."""
+        self.samples = 0
+        self.orchestrator = MatchOrchestrator(
+            host, port, self.play, max_concurrency=self.max_concurrency, client_kwargs=self.client_kwargs,
+        )
+        await self.orchestrator.run(specs)
+        return self.stats()
+
+    async def run_local(
+        self,
+        settings: ClientDataModel,
+        matches: int,
+        team_info: TeamModel,
+        server_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Start a LocalDCServer (simulator physics unless given), play ``matches`` self-play matches
+        on it and return :meth:`stats`.
+        """
+        # aiohttp.web is only needed here
+        from dc4client.local_server import LocalDCServer
+
+        server_kwargs = {"physics": default_simulator().physics, **(server_kwargs or {})}
+        async with LocalDCServer(**server_kwargs) as server:
+            match_ids = [server.create_match(settings) for _ in range(matches)]
+            specs = self_play_specs(match_ids, team_info)
+            for spec in specs:
+                # Deadlines in extra ends use the extra-end clocks
+                spec.client_kwargs.setdefault("standard_end_count", settings.standard_end_count)
+            return await self.run("127.0.0.1", server.port, specs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return samples (queued), samples_per_second over the last run, plus the orchestrator's
+        match and shot throughput.
+        """
+        stats: Dict[str, Any] = {}
+        if self.orchestrator is not None:
+            stats.update(self.orchestrator.stats())
+        elapsed = stats.get("elapsed", 0.0)
+        stats["samples"] = self.samples
+        stats["samples_per_second"] = self.samples / elapsed if elapsed > 0 else 0.0
+        return stats
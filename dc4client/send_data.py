@@ -4,6 +4,24 @@ from typing import List
 from enum import Enum
 
 
+__all__ = [
+    "MatchModel",
+    "ScoreModel",
+    "PhysicalSimulatorModel",
+    "TournamentModel",
+    "ShotInfoModel",
+    "StateModel",
+    "StoneCoordinates",
+    "MatchNameModel",
+    "PlayerModel",
+    "TeamModel",
+    "GameMode",
+    "MixDoublesTeamModel",
+    "PositionedStonesModel",
+    "ClientDataModel",
+]
+
+
 class MatchModel(BaseModel):
     """To get match_id from server"""
     time_limit: int
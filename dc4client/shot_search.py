@@ -0,0 +1,276 @@
+import math
+import multiprocessing
+import multiprocessing.pool
+import time
+from typing import Callable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from dc4client.board import BoardFeatures, TEAM0, end_scores
+from dc4client.compact_state import CompactState, stone_array
+from dc4client.receive_data import StateSchema
+from dc4client.simulator import default_simulator
+
+
+__all__ = ["Evaluator", "end_score_evaluator", "SearchResult", "ShotSearch"]
+
+
+# evaluator(board, shots, team, index) -> (K,) values, higher is better for ``team``.
+# board is (2, 8, 2); shots is (K, 3) of (translational_velocity, shot_angle, angular_velocity).
+Evaluator = Callable[[np.ndarray, np.ndarray, int, int], np.ndarray]
+
+
+def end_score_evaluator(board: np.ndarray, shots: np.ndarray, team: int, index: int) -> np.ndarray:
+    """Default evaluator: the end score after the shot from the thrower's point of view.
+    Ties are broken towards boards where the thrower's closest stone is nearer the tee.
+    """
+    boards = default_simulator().simulate(board, shots, team, index)
+    sign = 1.0 if team == TEAM0 else -1.0
+    closest = BoardFeatures(boards).distance[:, team].min(axis=-1)
+    return sign * end_scores(boards) - 1e-3 * np.minimum(closest, 10.0)
+
+
+class SearchResult:
+    """Outcome of one ShotSearch.search call.
+
+        Attributes:
+            shot (Tuple[float, float, float]): Best (translational_velocity, shot_angle, angular_velocity) found.
+            value (float): Evaluator value of that shot.
+            nodes (int): Number of candidate shots evaluated.
+            depth (int): Number of refinement rounds completed (1 = the coarse grid).
+            elapsed (float): Seconds spent searching.
+            completed (bool): False if the deadline cut the search short.
+    """
+    __slots__ = ("shot", "value", "nodes", "depth", "elapsed", "completed")
+
+    def __init__(self, shot, value, nodes, depth, elapsed, completed):
+        self.shot: Tuple[float, float, float] = shot
+        self.value: float = value
+        self.nodes: int = nodes
+        self.depth: int = depth
+        self.elapsed: float = elapsed
+        self.completed: bool = completed
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"SearchResult(shot={self.shot}, value={self.value:.3f}, nodes={self.nodes}, depth={self.depth}, "
+            f"nodes_per_second={self.nodes_per_second:.0f}, completed={self.completed})"
+        )
+
+
+class ShotSearch:
+    """Anytime coarse-to-fine search for the shot to submit.
+
+    The first round evaluates a grid over velocity x angle x spin; every
+    further round keeps the ``top_k`` candidates and evaluates their
+    neighbours at half the previous spacing. Each round is split into chunks
+    that run on a process pool (or in-process with ``processes=1``), and the
+    best shot seen so far is always kept, so when the ``time.monotonic()``
+    deadline passes the search returns it at once without waiting for
+    outstanding chunks. If any chunk is still queued or running, the worker
+    processes are terminated (and started again by the next search) so they
+    do not hold up later turns.
+
+    A ShotSearch can be pickled (without its pool), so ``decide`` also works
+    with ``DCClient(policy_executor="process")``.
+
+    ``decide`` has the ``DCClient.run_policy`` signature::
+
+        shot = await client.run_policy(search.decide, fallback=fallback_shot)
+
+        Args:
+            evaluator (Evaluator | None): Values of candidate shots. With processes > 1 it must be a
+                picklable top-level function. Defaults to end_score_evaluator.
+            processes (int): Worker processes; 1 evaluates in the calling process. Defaults to 1.
+            velocity_range (Tuple[float, float]): Translational velocities searched (m/s). Defaults to (2.0, 4.5).
+            angle_range (Tuple[float, float]): Shot angles searched (rad). Defaults to pi/2 +- 0.06.
+            spins (Sequence[float]): Angular velocities tried. Defaults to (pi/2, -pi/2).
+            coarse_shape (Tuple[int, int]): Velocity x angle points of the first round. Defaults to (12, 13).
+            top_k (int): Candidates refined per round. Defaults to 8.
+            max_depth (int): Rounds before the search stops on its own. Defaults to 8.
+            chunk_size (int): Candidates per evaluator call. Defaults to 128.
+    """
+
+    def __init__(
+        self,
+        evaluator: Optional[Evaluator] = None,
+        processes: int = 1,
+        velocity_range: Tuple[float, float] = (2.0, 4.5),
+        angle_range: Tuple[float, float] = (math.pi / 2 - 0.06, math.pi / 2 + 0.06),
+        spins: Sequence[float] = (math.pi / 2, -math.pi / 2),
+        coarse_shape: Tuple[int, int] = (12, 13),
+        top_k: int = 8,
+        max_depth: int = 8,
+        chunk_size: int = 128,
+    ):
+        self.evaluator: Evaluator = evaluator or end_score_evaluator
+        self.processes = processes
+        self.velocity_range = velocity_range
+        self.angle_range = angle_range
+        self.spins = tuple(spins)
+        self.coarse_shape = coarse_shape
+        self.top_k = top_k
+        self.max_depth = max_depth
+        self.chunk_size = chunk_size
+        self._pool: Optional[multiprocessing.pool.Pool] = None
+
+    def __enter__(self) -> "ShotSearch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # Worker processes belong to this instance only
+        state["_pool"] = None
+        return state
+
+    def close(self, terminate: bool = False) -> None:
+        """Shut down the worker processes, if any.
+        Args:
+            terminate (bool): Kill the workers at once, dropping queued and running chunks; otherwise they
+                exit after finishing them. Defaults to False.
+        """
+        pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        if terminate:
+            pool.terminate()
+        else:
+            pool.close()
+
+    def _get_pool(self) -> multiprocessing.pool.Pool:
+        # A multiprocessing Pool rather than a ProcessPoolExecutor: it can stop busy workers
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(processes=self.processes)
+        return self._pool
+
+    def _coarse_grid(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the first-round candidates ``(K, 3)`` and the grid spacing ``(dv, da)``."""
+        velocities = np.linspace(*self.velocity_range, self.coarse_shape[0])
+        angles = np.linspace(*self.angle_range, self.coarse_shape[1])
+        grid = np.array(np.meshgrid(velocities, angles, self.spins, indexing="ij")).reshape(3, -1).T
+        spacing = np.array([
+            np.ptp(self.velocity_range) / max(1, self.coarse_shape[0] - 1),
+            np.ptp(self.angle_range) / max(1, self.coarse_shape[1] - 1),
+        ])
+        return grid, spacing
+
+    def _refine(self, parents: np.ndarray, spacing: np.ndarray) -> np.ndarray:
+        """Neighbours of each parent on a grid with the given spacing, clipped to the search box."""
+        offsets = np.array([(i, j) for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j], dtype=np.float64) * spacing
+        children = np.repeat(parents[:, None, :], len(offsets), axis=1)
+        children[..., :2] += offsets
+        children = children.reshape(-1, 3)
+        children[:, 0] = np.clip(children[:, 0], *self.velocity_range)
+        children[:, 1] = np.clip(children[:, 1], *self.angle_range)
+        return np.unique(children, axis=0)
+
+    def _evaluate(
+        self,
+        board: np.ndarray,
+        candidates: np.ndarray,
+        team: int,
+        index: int,
+        deadline: Optional[float],
+    ) -> np.ndarray:
+        """Evaluate candidates chunk by chunk; chunks not finished by the deadline are NaN."""
+        values = np.full(len(candidates), np.nan)
+        bounds = [(start, min(start + self.chunk_size, len(candidates))) for start in range(0, len(candidates), self.chunk_size)]
+        if self.processes > 1 and len(bounds) > 1:
+            pool = self._get_pool()
+            results = [
+                (pool.apply_async(self.evaluator, (board, candidates[start:stop], team, index)), start, stop)
+                for start, stop in bounds
+            ]
+            outstanding = False
+            for result, start, stop in results:
+                result.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
+                if result.ready():
+                    values[start:stop] = result.get()
+                else:
+                    outstanding = True
+            if outstanding:
+                # Chunks cannot be interrupted: stop their workers rather than let them delay the next search
+                self.close(terminate=True)
+            return values
+
+        for start, stop in bounds:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            values[start:stop] = self.evaluator(board, candidates[start:stop], team, index)
+        return values
+
+    def search(
+        self,
+        board: np.ndarray,
+        team: int,
+        index: int,
+        deadline: Optional[float] = None,
+    ) -> SearchResult:
+        """Search for the best shot on a board until ``max_depth`` rounds or the deadline.
+        Args:
+            board (np.ndarray): ``(2, 8, 2)`` stone positions, e.g. from stone_array(state).
+            team (int): Team to throw (0 = "team0").
+            index (int): Stone index of the thrown stone.
+            deadline (float | None): ``time.monotonic()`` value at which to return the best shot so far.
+        Returns:
+            SearchResult: Best shot and search statistics. If not even one chunk finished in time,
+                the shot is the centre of the coarse grid and the value is -inf.
+        """
+        start_time = time.monotonic()
+        board = np.asarray(board, dtype=np.float64)
+        candidates, spacing = self._coarse_grid()
+        best_shot = tuple(float(v) for v in candidates[len(candidates) // 2])
+        best_value = -math.inf
+        nodes = 0
+        depth = 0
+        completed = True
+
+        while depth < self.max_depth and len(candidates):
+            values = self._evaluate(board, candidates, team, index, deadline)
+            evaluated = ~np.isnan(values)
+            nodes += int(evaluated.sum())
+            if evaluated.any():
+                scores = np.where(evaluated, values, -math.inf)
+                best = int(np.argmax(scores))
+                if scores[best] > best_value:
+                    best_value = float(scores[best])
+                    best_shot = tuple(float(v) for v in candidates[best])
+            if not evaluated.all():
+                completed = False
+                break
+            depth += 1
+            if deadline is not None and time.monotonic() >= deadline:
+                completed = depth >= self.max_depth
+                break
+
+            order = np.argsort(-values, kind="stable")[: self.top_k]
+            spacing = spacing / 2.0
+            candidates = self._refine(candidates[order], spacing)
+
+        return SearchResult(best_shot, best_value, nodes, depth, time.monotonic() - start_time, completed)
+
+    def decide(
+        self,
+        state: Union[StateSchema, CompactState],
+        deadline: Optional[float] = None,
+    ) -> Tuple[float, float, float]:
+        """Return the shot for the team to throw next in ``state`` (``DCClient.run_policy`` signature).
+        Raises:
+            ValueError: If no team is to throw (``next_shot_team`` is None, e.g. the match is over);
+                run_policy then returns its fallback.
+        """
+        if state.next_shot_team not in ("team0", "team1"):
+            raise ValueError(f"No team to throw in this state (next_shot_team={state.next_shot_team!r})")
+        team = 0 if state.next_shot_team == "team0" else 1
+        index = (state.total_shot_number or 0) // 2
+        # Mixed doubles keeps index 0 for the positioned stone
+        if state.mix_doubles_settings is not None:
+            index += 1
+        return self.search(stone_array(state), team, index, deadline).shot
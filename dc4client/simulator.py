@@ -0,0 +1,316 @@
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from dc4client.board import BACK_LINE_Y, HOG_LINE_Y, SIDE_LINE_X, STONE_RADIUS
+from dc4client.send_data import PlayerModel, ShotInfoModel
+
+
+__all__ = [
+    "FRICTION_DECELERATION",
+    "CURL_COEFFICIENT",
+    "CURL_SPEED_OFFSET",
+    "COLLISION_RESTITUTION",
+    "shot_array",
+    "add_execution_noise",
+    "CurlingSimulator",
+    "default_simulator",
+]
+
+
+# Constant deceleration of a sliding stone (m/s^2)
+FRICTION_DECELERATION = 0.0082 * 9.80665
+# Turning rate of a spinning stone is CURL_COEFFICIENT / (speed + CURL_SPEED_OFFSET) rad/s
+CURL_COEFFICIENT = 0.006
+CURL_SPEED_OFFSET = 0.5
+# Fraction of the approach speed kept in a stone-stone collision
+COLLISION_RESTITUTION = 0.95
+
+# A pair closer than this (m) and still approaching is treated as touching
+_CONTACT_EPSILON = 1e-4
+_MIN_TIME_STEP = 1e-3
+_MAX_TIME_STEP = 2.0
+_STONES = 16
+
+_DEFAULT_SIMULATOR: Optional["CurlingSimulator"] = None
+
+
+def shot_array(shots: Union[ShotInfoModel, Iterable, np.ndarray]) -> np.ndarray:
+    """Convert shots to a ``(K, 3)`` float array of (translational_velocity, shot_angle, angular_velocity).
+    Arrays and plain triples are passed through; a missing angular_velocity counts as no spin.
+    """
+    if isinstance(shots, ShotInfoModel):
+        shots = [shots]
+    if not isinstance(shots, np.ndarray):
+        shots = [
+            (shot.translational_velocity, shot.shot_angle, shot.angular_velocity or 0.0)
+            if isinstance(shot, ShotInfoModel) else shot
+            for shot in shots
+        ]
+    return np.atleast_2d(np.asarray(shots, dtype=np.float64))
+
+
+def add_execution_noise(shots: np.ndarray, player: PlayerModel, rng: np.random.Generator) -> np.ndarray:
+    """Return a noisy copy of ``(K, 3)`` shots as the player would throw them.
+    Adds normal noise with the player's ``shot_std_dev`` to the translational velocity
+    (clipped to ``[0, max_velocity]``) and ``angle_std_dev`` to the shot angle; the spin is kept.
+    """
+    noisy = np.array(shots, dtype=np.float64)
+    noisy[:, 0] = np.clip(rng.normal(noisy[:, 0], player.shot_std_dev), 0.0, player.max_velocity)
+    noisy[:, 1] = rng.normal(noisy[:, 1], player.angle_std_dev)
+    return noisy
+
+
+class CurlingSimulator:
+    """Vectorized curling physics that advances many boards in lockstep.
+
+    Stones slide under constant friction and curl in the direction of their
+    spin (positive angular_velocity = clockwise = curls right). Because the
+    path of a spinning stone depends only on its speed, one reference path is
+    integrated up front and every free-flight step is an exact table lookup.
+    Time steps only get short when two stones are about to touch, and
+    stone-stone collisions are resolved with equal-mass impulses.
+
+    Positions use the StoneCoordinateSchema frame: a shot starts at (0, 0)
+    with heading ``shot_angle`` (pi/2 = straight down the sheet), and
+    ``(0.0, 0.0)`` marks a stone that is not in play. Stones that touch the
+    side lines, pass the back line or stop before the hog line are removed.
+    The physics has no randomness. Execution noise is only applied when
+    ``simulate`` gets a player, and is drawn from its ``rng`` argument, so a
+    seeded Generator makes noisy rollouts reproducible.
+
+        Args:
+            friction (float): Deceleration in m/s^2. Defaults to FRICTION_DECELERATION.
+            curl (float): Curl coefficient. Defaults to CURL_COEFFICIENT.
+            restitution (float): Collision restitution. Defaults to COLLISION_RESTITUTION.
+            max_speed (float): Highest speed in the reference table. Faster shots are simulated with a
+                temporary table built for that call, so they never change later results. Defaults to 8.0.
+            table_size (int): Samples in the reference table. Defaults to 8192.
+    """
+
+    def __init__(
+        self,
+        friction: float = FRICTION_DECELERATION,
+        curl: float = CURL_COEFFICIENT,
+        restitution: float = COLLISION_RESTITUTION,
+        max_speed: float = 8.0,
+        table_size: int = 8192,
+    ):
+        self.friction = friction
+        self.curl = curl
+        self.restitution = restitution
+        self.table_size = table_size
+        self.max_speed = max_speed
+        self._reference = self._build_reference(max_speed)
+
+    def _build_reference(self, max_speed: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Integrate the path of a clockwise stone from ``max_speed`` to rest.
+        The table holds, per speed, the heading and position reached from the
+        start (heading 0 along +x at ``max_speed``), as ``(speeds, heading, x, y)``.
+        """
+        speeds = np.linspace(0.0, max_speed, self.table_size)
+        ds = speeds[1] - speeds[0]
+        mid_speed = speeds[:-1] + ds / 2.0
+        dt = ds / self.friction
+        # Clockwise spin turns the heading clockwise (negative)
+        dphi = -self.curl / (mid_speed + CURL_SPEED_OFFSET) * dt
+        heading = np.zeros_like(speeds)
+        heading[:-1] = np.cumsum(dphi[::-1])[::-1]
+        mid_heading = heading[:-1] - dphi / 2.0
+        step = mid_speed * dt
+        x = np.zeros_like(speeds)
+        y = np.zeros_like(speeds)
+        x[:-1] = np.cumsum((step * np.cos(mid_heading))[::-1])[::-1]
+        y[:-1] = np.cumsum((step * np.sin(mid_heading))[::-1])[::-1]
+
+        return speeds, heading, x, y
+
+    def _advance(self, reference, position, speed, heading, spin, dt) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Move stones along their exact paths for ``dt`` seconds (all arrays 1-D, position ``(n, 2)``)."""
+        new_speed = np.maximum(speed - self.friction * dt, 0.0)
+        table, table_heading, table_x, table_y = reference
+        phi0 = np.interp(speed, table, table_heading)
+        phi1 = np.interp(new_speed, table, table_heading)
+        straight = (speed * speed - new_speed * new_speed) / (2.0 * self.friction)
+        curled = spin != 0.0
+        dx = np.where(curled, np.interp(new_speed, table, table_x) - np.interp(speed, table, table_x), straight)
+        dy = spin * (np.interp(new_speed, table, table_y) - np.interp(speed, table, table_y))
+        # Rotate the reference step into the stone's frame; counter-clockwise spin mirrors it
+        theta = heading - spin * phi0
+        cos_theta = np.cos(theta)
+        sin_theta = np.sin(theta)
+        new_position = position + np.stack((dx * cos_theta - dy * sin_theta, dx * sin_theta + dy * cos_theta), axis=-1)
+        return new_position, new_speed, heading + spin * (phi1 - phi0)
+
+    def simulate(
+        self,
+        stones: np.ndarray,
+        shots: Union[ShotInfoModel, Iterable, np.ndarray],
+        team: Union[int, np.ndarray] = 0,
+        index: Union[int, np.ndarray] = 0,
+        player: Optional[PlayerModel] = None,
+        rng: Optional[np.random.Generator] = None,
+    ) -> np.ndarray:
+        """Throw one stone on each board and return where every stone comes to rest.
+
+        ``stones`` and ``shots`` broadcast against each other: one board with K
+        shots gives K rollouts, N boards with one shot give N rollouts, and N
+        boards with N shots pair them up.
+
+        Args:
+            stones (np.ndarray): ``(2, 8, 2)`` board or ``(N, 2, 8, 2)`` boards.
+            shots: ``(K, 3)`` array of (translational_velocity, shot_angle, angular_velocity),
+                or ShotInfoModel instances.
+            team (int | np.ndarray): Team of the thrown stone (0 = "team0"). Defaults to 0.
+            index (int | np.ndarray): Stone index of the thrown stone (0-7). Defaults to 0.
+            player (PlayerModel | None): Throw every rollout with this player's execution noise
+                (see add_execution_noise); None throws the shots exactly. Defaults to None.
+            rng (np.random.Generator | None): Source of the execution noise; None draws fresh entropy.
+                Ignored without a player. Defaults to None.
+        Returns:
+            np.ndarray: ``(N, 2, 8, 2)`` final positions, ``(0.0, 0.0)`` for stones out of play.
+        """
+        stones = np.asarray(stones, dtype=np.float64)
+        if stones.ndim == 3:
+            stones = stones[None]
+        if stones.shape[1:] != (2, 8, 2):
+            raise ValueError(f"stones must have shape (2, 8, 2) or (N, 2, 8, 2), got {stones.shape}")
+        shots = shot_array(shots)
+        count = max(len(stones), len(shots))
+        position = np.broadcast_to(stones, (count, 2, 8, 2)).reshape(count, _STONES, 2).copy()
+        shots = np.broadcast_to(shots, (count, 3))
+        if player is not None:
+            shots = add_execution_noise(shots, player, rng if rng is not None else np.random.default_rng())
+        reference = self._reference
+        if shots[:, 0].max(initial=0.0) > self.max_speed:
+            # Local table: the shared one (e.g. default_simulator()) must not change between calls
+            reference = self._build_reference(float(shots[:, 0].max()) * 1.1)
+
+        rows = np.arange(count)
+        slot = np.broadcast_to(np.asarray(team) * 8 + np.asarray(index), (count,))
+        in_play = (position[..., 0] != 0.0) | (position[..., 1] != 0.0)
+        position[rows, slot] = 0.0
+        in_play[rows, slot] = True
+        speed = np.zeros((count, _STONES))
+        heading = np.zeros((count, _STONES))
+        spin = np.zeros((count, _STONES))
+        speed[rows, slot] = shots[:, 0]
+        heading[rows, slot] = shots[:, 1]
+        spin[rows, slot] = np.sign(shots[:, 2])
+
+        result = np.zeros((count, _STONES, 2))
+        active = rows
+        while len(active):
+            moving = (speed > 0.0) & in_play
+            done = ~moving.any(axis=1)
+            if done.any():
+                # Stones that came to rest before the hog line are out of play
+                finished = in_play[done] & (position[done][..., 1] >= HOG_LINE_Y)
+                result[active[done]] = np.where(finished[..., None], position[done], 0.0)
+                keep = ~done
+                active = active[keep]
+                position, speed, heading, spin, in_play, moving = (
+                    position[keep], speed[keep], heading[keep], spin[keep], in_play[keep], moving[keep]
+                )
+                if not len(active):
+                    break
+
+            rows, rows_valid = self._moving_rows(moving)
+            pairs = self._pairs(position, speed, heading, in_play, moving, rows, rows_valid)
+            if self._collide(position, speed, heading, rows, *pairs):
+                # Struck stones start moving: pair again with the new velocities
+                moving = (speed > 0.0) & in_play
+                rows, rows_valid = self._moving_rows(moving)
+                pairs = self._pairs(position, speed, heading, in_play, moving, rows, rows_valid)
+
+            dt = self._time_step(speed, rows, pairs[1], pairs[4])
+            step_dt = np.broadcast_to(dt[:, None], moving.shape)[moving]
+            position[moving], speed[moving], heading[moving] = self._advance(
+                reference, position[moving], speed[moving], heading[moving], spin[moving], step_dt
+            )
+
+            out = in_play & (
+                (np.abs(position[..., 0]) > SIDE_LINE_X - STONE_RADIUS)
+                | (position[..., 1] > BACK_LINE_Y + STONE_RADIUS)
+            )
+            in_play &= ~out
+            speed[out] = 0.0
+        return result.reshape(count, 2, 8, 2)
+
+    @staticmethod
+    def _moving_rows(moving: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(M, m)`` indices of each board's moving stones (padded with resting ones) and their mask."""
+        width = int(moving.sum(axis=1).max())
+        rows = np.argsort(~moving, axis=1, kind="stable")[:, :width]
+        return rows, np.take_along_axis(moving, rows, axis=1)
+
+    @staticmethod
+    def _pairs(position, speed, heading, in_play, moving, rows, rows_valid):
+        """Pair every moving stone (rows) with every stone in play (columns).
+        Returns offsets ``p_j - p_i`` ``(M, m, 16, 2)``, distances, velocities ``(M, 16, 2)``,
+        approach rates (> 0 when closing in) and the mask of pairs that can collide.
+        """
+        velocity = np.stack((speed * np.cos(heading), speed * np.sin(heading)), axis=-1)
+        row_position = np.take_along_axis(position, rows[..., None], axis=1)
+        row_velocity = np.take_along_axis(velocity, rows[..., None], axis=1)
+        offset = position[:, None, :, :] - row_position[:, :, None, :]
+        distance = np.sqrt((offset * offset).sum(axis=-1))
+        approach = ((row_velocity[:, :, None, :] - velocity[:, None, :, :]) * offset).sum(axis=-1)
+        columns = np.arange(_STONES)
+        # Skip the stone itself, and count a pair of two moving stones only once
+        pair = (
+            rows_valid[..., None]
+            & in_play[:, None, :]
+            & (approach > 0.0)
+            & (columns != rows[..., None])
+            & ~(moving[:, None, :] & (columns < rows[..., None]))
+        )
+        return offset, distance, velocity, approach, pair
+
+    @staticmethod
+    def _time_step(speed, rows, distance, pair) -> np.ndarray:
+        """Largest per-board step after which no approaching pair can have overlapped."""
+        closing_speed = np.take_along_axis(speed, rows, axis=1)[..., None] + speed[:, None, :]
+        gap = np.maximum(distance - 2.0 * STONE_RADIUS, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pair_dt = np.where(pair, gap / closing_speed, np.inf)
+        return np.clip(pair_dt.min(axis=(1, 2)), _MIN_TIME_STEP, _MAX_TIME_STEP)
+
+    def _collide(self, position, speed, heading, rows, offset, distance, velocity, approach, pair) -> bool:
+        """Resolve every touching, approaching pair with an equal-mass impulse (in place).
+        Returns True if any pair collided.
+        """
+        contact = pair & (distance < 2.0 * STONE_RADIUS + _CONTACT_EPSILON)
+        if not contact.any():
+            return False
+        safe_distance = np.where(contact, distance, 1.0)
+        normal = offset / safe_distance[..., None]
+        # Impulse along the line of centres: the column stone is pushed away, the row stone back
+        impulse = np.where(contact, (1.0 + self.restitution) / 2.0 * approach / safe_distance, 0.0)
+        kick = impulse[..., None] * normal
+        overlap = np.where(contact, np.maximum(2.0 * STONE_RADIUS - distance, 0.0), 0.0)
+        push = 0.5 * overlap[..., None] * normal
+
+        row_index = rows[..., None]
+        velocity += kick.sum(axis=1)
+        position += push.sum(axis=1)
+        np.put_along_axis(velocity, row_index, np.take_along_axis(velocity, row_index, axis=1) - kick.sum(axis=2), axis=1)
+        np.put_along_axis(position, row_index, np.take_along_axis(position, row_index, axis=1) - push.sum(axis=2), axis=1)
+
+        touched = contact.any(axis=1)
+        np.put_along_axis(touched, rows, np.take_along_axis(touched, rows, axis=1) | contact.any(axis=2), axis=1)
+        speed[touched] = np.hypot(velocity[..., 0], velocity[..., 1])[touched]
+        heading[touched] = np.arctan2(velocity[..., 1], velocity[..., 0])[touched]
+        return True
+
+    def physics(self, stones: np.ndarray, team: int, index: int, shot: ShotInfoModel) -> np.ndarray:
+        """Single-shot step with the LocalDCServer ``physics`` signature."""
+        return self.simulate(stones, shot, team, index)[0]
+
+
+def default_simulator() -> CurlingSimulator:
+    """Return the process-wide CurlingSimulator with default parameters (built on first use)."""
+    global _DEFAULT_SIMULATOR
+    if _DEFAULT_SIMULATOR is None:
+        _DEFAULT_SIMULATOR = CurlingSimulator()
+    return _DEFAULT_SIMULATOR
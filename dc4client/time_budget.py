@@ -0,0 +1,145 @@
+import time
+from collections import deque
+from typing import Any, Deque, Optional, Tuple
+
+from dc4client.receive_data import StateSchema
+
+
+__all__ = ["TimeBudget"]
+
+
+class TimeBudget:
+    """Turn the server's remaining-time snapshots into deadlines on the local monotonic clock.
+
+    Every state records when it arrived (``time.monotonic()``), and every HTTP
+    round trip records its duration. The server clock starts our turn at about
+    the moment it emits the state, which reached us one network delay later,
+    and our shot still has to travel back. The hard deadline is therefore::
+
+        received_at + remaining_time - round_trip_time - safety_margin
+
+    where round_trip_time is the largest recent sample (conservative).
+
+    No server clock offset is estimated. A response's Date header could bound
+    the offset between the two wall clocks, but states carry no server
+    timestamp it could be applied to: the only point where the server's clock
+    meets ours is the state's arrival, which is measured locally anyway. The
+    same snapshot can arrive more than once (after an SSE reconnect the server
+    resends its latest state); its first arrival is kept, since the server's
+    clock has been running since then.
+
+        Args:
+            safety_margin (float): Seconds kept in reserve on top of the round trip. Defaults to 0.2.
+            rtt_window (int): Number of recent round-trip samples kept. Defaults to 16.
+            default_rtt (float): Round-trip time assumed before any sample exists. Defaults to 0.1.
+            standard_end_count (int | None): Number of regular ends. From this (0-based) end_number on,
+                the extra end remaining times are used. Defaults to None (always use the regular
+                remaining times).
+    """
+
+    def __init__(
+        self,
+        safety_margin: float = 0.2,
+        rtt_window: int = 16,
+        default_rtt: float = 0.1,
+        standard_end_count: Optional[int] = None,
+    ):
+        self.safety_margin = safety_margin
+        self.default_rtt = default_rtt
+        self.standard_end_count = standard_end_count
+        self._rtt_samples: Deque[float] = deque(maxlen=rtt_window)
+
+        self.state: Optional[StateSchema] = None
+        self.received_at: Optional[float] = None
+
+    def record_state(self, state: StateSchema, received_at: Optional[float] = None) -> None:
+        """Record a newly received state.
+        A state with the same turn and remaining times as the recorded one keeps the earlier arrival time.
+        Args:
+            state (StateSchema): The state received from the server.
+            received_at (float | None): ``time.monotonic()`` when the event arrived. Defaults to now.
+        """
+        if self.received_at is not None and self._snapshot(state) == self._snapshot(self.state):
+            # Resent snapshot (e.g. after a reconnect): the turn started at its first arrival
+            self.state = state
+            return
+        self.state = state
+        self.received_at = time.monotonic() if received_at is None else received_at
+
+    @staticmethod
+    def _snapshot(state: Optional[StateSchema]) -> Optional[Tuple[Any, ...]]:
+        """Turn and remaining times of a state; equal for resends of the same state."""
+        if state is None:
+            return None
+        return (
+            state.end_number,
+            state.total_shot_number,
+            state.winner_team,
+            state.first_team_remaining_time,
+            state.second_team_remaining_time,
+            state.first_team_extra_end_remaining_time,
+            state.second_team_extra_end_remaining_time,
+        )
+
+    def record_round_trip(self, rtt: float) -> None:
+        """Record one HTTP round trip.
+        Args:
+            rtt (float): Seconds between sending the request and receiving the response.
+        """
+        self._rtt_samples.append(rtt)
+
+    @property
+    def rtt(self) -> float:
+        """Conservative round-trip estimate: the largest recent sample."""
+        if not self._rtt_samples:
+            return self.default_rtt
+        return max(self._rtt_samples)
+
+    def remaining_time(self, team: str) -> Optional[float]:
+        """Return the server-side remaining thinking time of a team in the latest state.
+        ``end_number`` is 0-based, as sent by the server: with ``standard_end_count`` regular
+        ends, ends ``0 .. standard_end_count - 1`` use the regular remaining times and every
+        later end the extra-end ones.
+        Args:
+            team (str): "team0" (first team) or "team1" (second team).
+        """
+        state = self.state
+        if state is None:
+            return None
+        extra_end = self.standard_end_count is not None and state.end_number >= self.standard_end_count
+        if team == "team0":
+            return state.first_team_extra_end_remaining_time if extra_end else state.first_team_remaining_time
+        if team == "team1":
+            return state.second_team_extra_end_remaining_time if extra_end else state.second_team_remaining_time
+        raise ValueError(f"Unknown team: {team}")
+
+    def deadline(self, team: str) -> Optional[float]:
+        """Return the local ``time.monotonic()`` value by which the shot must be submitted.
+        Args:
+            team (str): "team0" or "team1".
+        """
+        remaining = self.remaining_time(team)
+        if remaining is None or self.received_at is None:
+            return None
+        return self.received_at + remaining - self.rtt - self.safety_margin
+
+    def planned_deadline(self, team: str, shots_left: int) -> Optional[float]:
+        """Return a deadline that spreads the remaining time evenly over our remaining shots.
+        Never later than :meth:`deadline`.
+        Args:
+            team (str): "team0" or "team1".
+            shots_left (int): Number of shots (including this one) the remaining time must cover.
+        """
+        remaining = self.remaining_time(team)
+        if remaining is None or self.received_at is None:
+            return None
+        overhead = self.rtt + self.safety_margin
+        share = max(0.0, remaining - overhead) / max(1, shots_left)
+        return min(self.received_at + share, self.deadline(team))
+
+    def time_left(self, team: str, now: Optional[float] = None) -> Optional[float]:
+        """Return seconds until :meth:`deadline` (negative when already past)."""
+        deadline = self.deadline(team)
+        if deadline is None:
+            return None
+        return deadline - (time.monotonic() if now is None else now)
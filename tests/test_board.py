@@ -0,0 +1,83 @@
+import asyncio
+import importlib.util
+import math
+from pathlib import Path
+
+import numpy as np
+
+from dc4client import DCClient, LocalDCServer, MatchNameModel
+from dc4client.board import HOUSE_RADIUS, STONE_RADIUS, TEE_X, TEE_Y, end_scores
+from dc4client.simulator import FRICTION_DECELERATION
+
+
+def _load_bench_end_score():
+    path = Path(__file__).resolve().parents[1] / "benchmarks" / "bench_end_score.py"
+    spec = importlib.util.spec_from_file_location("bench_end_score", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+bench_end_score = _load_bench_end_score()
+
+
+def test_end_scores_match_scalar_scorer():
+    boards = bench_end_score.random_boards(3000, seed=1)
+    scores = end_scores(boards)
+    assert scores.shape == (3000,)
+    assert scores.tolist() == [bench_end_score.loop_score(board) for board in boards]
+    # Batch axes are kept
+    assert end_scores(boards.reshape(30, 100, 2, 8, 2)).tolist() == scores.reshape(30, 100).tolist()
+
+
+def test_end_scores_edge_cases():
+    empty = np.zeros((2, 8, 2))
+    assert end_scores(empty) == 0
+
+    edge = HOUSE_RADIUS + STONE_RADIUS
+    touching = empty.copy()
+    touching[1, 0] = (TEE_X + edge - 1e-9, TEE_Y)
+    assert end_scores(touching) == -1
+    outside = empty.copy()
+    outside[1, 0] = (TEE_X + edge + 1e-6, TEE_Y)
+    assert end_scores(outside) == 0
+
+    two_for_team0 = empty.copy()
+    two_for_team0[0, :2] = [(TEE_X, TEE_Y + 0.1), (TEE_X, TEE_Y - 0.2)]
+    two_for_team0[1, 0] = (TEE_X + 0.5, TEE_Y)
+    assert end_scores(two_for_team0) == 2
+
+
+def _throw_to(x: float, y: float):
+    """Shot that the server's straight-line physics stops at (x, y)."""
+    distance = math.hypot(x, y)
+    return math.sqrt(2.0 * FRICTION_DECELERATION * distance), math.atan2(y, x)
+
+
+def test_local_server_scores_an_end_like_the_scalar_scorer():
+    rng = np.random.default_rng(3)
+    targets = rng.uniform([TEE_X - 1.5, TEE_Y - 1.5], [TEE_X + 1.5, TEE_Y + 1.5], size=(15, 2))
+
+    async def scenario():
+        async with LocalDCServer() as server:
+            match_id = server.create_match()
+            async with DCClient(
+                match_id=match_id,
+                username="user",
+                password="password",
+                match_team_name=MatchNameModel.team0,
+                auto_save_log=False,
+                keep_shot_connection_warm=False,
+            ) as client:
+                client.set_server_address("127.0.0.1", server.port)
+                for x, y in targets:
+                    assert await client.send_shot_info(*_throw_to(x, y))
+                board = server.matches[match_id].stones.copy()
+                # The last stone stops short of the hog line and is removed
+                assert await client.send_shot_info(0.5, math.pi / 2)
+                return board, server.matches[match_id].score
+
+    board, score = asyncio.run(scenario())
+    expected = bench_end_score.loop_score(board)
+    assert expected != 0
+    assert (score[0][0], score[1][0]) == (max(expected, 0), max(-expected, 0))
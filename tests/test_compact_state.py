@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from dc4client import CompactState, DCClient, LocalDCServer, MatchNameModel
+
+
+SHOTS = [(2.486, 1.5985), (2.45, 1.58), (2.5, 1.56)]
+
+
+def _client(server: LocalDCServer, match_id: str) -> DCClient:
+    client = DCClient(
+        match_id=match_id,
+        username="user",
+        password="password",
+        match_team_name=MatchNameModel.team0,
+        auto_save_log=False,
+        keep_shot_connection_warm=False,
+    )
+    client.set_server_address("127.0.0.1", server.port)
+    return client
+
+
+def _getters(client: DCClient):
+    features = client.get_board_features()
+    return (
+        client.get_end_number(),
+        client.get_shot_number(),
+        client.get_score(),
+        client.get_next_team(),
+        client.get_last_move(),
+        client.get_winner_team(),
+        client.get_stone_coordinates(),
+        features.distance.tolist(),
+        int(features.shot_rock_team),
+        int(features.counting_stones),
+    )
+
+
+def test_getters_agree_for_both_state_types():
+    async def scenario():
+        async with LocalDCServer() as server:
+            match_id = server.create_match()
+            async with _client(server, match_id) as schema_client, _client(server, match_id) as compact_client:
+                schema_stream = schema_client.receive_state_data()
+                compact_stream = compact_client.receive_state_data(compact=True)
+                results = []
+                for shot in [None, *SHOTS]:
+                    if shot is not None:
+                        assert await schema_client.send_shot_info(*shot)
+                    await schema_stream.__anext__()
+                    await compact_stream.__anext__()
+                    assert isinstance(compact_client.state_data, CompactState)
+                    results.append((_getters(schema_client), _getters(compact_client)))
+                await schema_stream.aclose()
+                await compact_stream.aclose()
+                return results
+
+    for schema_values, compact_values in asyncio.run(scenario()):
+        assert schema_values == compact_values
+
+
+def _payload() -> dict:
+    server = LocalDCServer()
+    return json.loads(server.matches[server.create_match()].history[-1][1])
+
+
+def test_payload_round_trip():
+    payload = _payload()
+    payload["stone_coordinate"]["data"]["team1"][0] = {"x": 0.5, "y": 38.0}
+    state = CompactState.from_payload(payload)
+    assert state.stones.shape == (2, 8, 2)
+    assert state.stones[1, 0].tolist() == [0.5, 38.0]
+    assert CompactState.from_payload(state.to_payload()).stones.tolist() == state.stones.tolist()
+    assert np.array_equal(CompactState.from_state_schema(state.to_state_schema()).stones, state.stones)
+
+
+@pytest.mark.parametrize("broken", ["missing key", "too many stones", "bad coordinate"])
+def test_invalid_payload_raises_value_error(broken):
+    payload = _payload()
+    if broken == "missing key":
+        del payload["last_move"]
+    elif broken == "too many stones":
+        payload["stone_coordinate"]["data"]["team0"].append({"x": 0.0, "y": 0.0})
+    else:
+        payload["stone_coordinate"]["data"]["team0"][0] = {"x": 0.0}
+    with pytest.raises(ValueError):
+        CompactState.from_payload(payload)
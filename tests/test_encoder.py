@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from dc4client import CompactState, DCClient, LocalDCServer, MatchNameModel, StateEncoder
+from dc4client.encoder import SCALAR_FEATURES
+
+
+def _encoder() -> StateEncoder:
+    # 0.5 m cells: x in [-2, 2), y in [34, 40)
+    return StateEncoder(height=12, width=8, x_range=(-2.0, 2.0), y_range=(34.0, 40.0))
+
+
+def _payload() -> dict:
+    server = LocalDCServer()
+    return json.loads(server.matches[server.create_match()].history[-1][1])
+
+
+def test_stones_land_in_the_cell_containing_them():
+    encoder = _encoder()
+    stones = np.zeros((1, 2, 8, 2))
+    stones[0, 0, 0] = (-1.99, 34.01)  # first cell
+    stones[0, 0, 1] = (0.26, 38.4)  # just past a cell boundary in x
+    stones[0, 1, 0] = (1.99, 39.99)  # last cell
+    stones[0, 1, 1] = (2.5, 38.0)  # outside x_range
+    stones[0, 1, 2] = (0.0, 41.0)  # behind y_range
+    planes, _ = encoder.allocate(1)
+    encoder.rasterize(stones, planes)
+
+    assert planes.sum() == 3
+    assert planes[0, 0, 0, 0] == 1.0
+    assert planes[0, 0, 8, 4] == 1.0
+    assert planes[0, 1, 11, 7] == 1.0
+
+
+def test_encode_batch_needs_both_buffers():
+    encoder = _encoder()
+    planes, scalars = encoder.allocate(2)
+    state = CompactState.from_payload(_payload())
+    with pytest.raises(ValueError):
+        encoder.encode_batch([state], planes_out=planes)
+    with pytest.raises(ValueError):
+        encoder.encode_batch([state], scalars_out=scalars)
+    planes_out, scalars_out = encoder.encode_batch([state, state], planes, scalars)
+    assert planes_out is planes and scalars_out is scalars
+
+
+def test_encoding_of_a_local_match():
+    async def scenario():
+        async with LocalDCServer() as server:
+            match_id = server.create_match()
+            async with DCClient(
+                match_id=match_id,
+                username="user",
+                password="password",
+                match_team_name=MatchNameModel.team0,
+                auto_save_log=False,
+                keep_shot_connection_warm=False,
+            ) as client:
+                client.set_server_address("127.0.0.1", server.port)
+                stream = client.receive_state_data(compact=True)
+                states = [await stream.__anext__()]
+                for velocity, angle in [(2.486, 1.5985), (2.45, 1.55), (2.5, 1.57)]:
+                    assert await client.send_shot_info(velocity, angle)
+                    states.append(await stream.__anext__())
+                await stream.aclose()
+                return states
+
+    states = asyncio.run(scenario())
+    encoder = StateEncoder()
+    planes, scalars = encoder.encode_batch(states)
+    assert planes.shape == (4, 2, 64, 32)
+    features = dict(zip(SCALAR_FEATURES, scalars[-1]))
+    assert features["total_shot_number"] == 3
+    assert features["next_shot_is_team0"] == 0.0
+    for state, state_planes, state_scalars in zip(states, planes, scalars):
+        in_play = (state.stones != 0.0).any(axis=-1).sum(axis=-1)
+        # Every stone in play lies in the default area and lights up one cell
+        assert state_planes.sum(axis=(1, 2)).tolist() == in_play.tolist()
+        single_planes, single_scalars = encoder.encode(state)
+        assert np.array_equal(single_planes, state_planes)
+        assert np.array_equal(single_scalars, state_scalars)
+    assert encoder.encode(states[0]) is encoder.encode(states[0])
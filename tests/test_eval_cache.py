@@ -0,0 +1,86 @@
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from dc4client import CompactState, EvaluationCache, LocalDCServer, SharedEvaluationCache
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Pool workers and a separate process publish evaluations of local server states
+# into one shared table; the creator reads them back after all of them exited.
+SCRIPT = textwrap.dedent("""
+    import json
+    import multiprocessing
+    import subprocess
+    import sys
+
+    from dc4client import CompactState, EvaluationCache, LocalDCServer, SharedEvaluationCache
+
+
+    def publish(shared, payload, value):
+        cache = EvaluationCache(shared=shared)
+        state = CompactState.from_payload(payload)
+        cache.evaluate(state, lambda state: value)
+        shared.close()
+        return cache.key(state)
+
+
+    if __name__ == "__main__":
+        context = multiprocessing.get_context(sys.argv[1])
+        # Workers start before the table exists, so they do not inherit a resource tracker
+        pool = context.Pool(2)
+        shared = SharedEvaluationCache(capacity=256)
+        server = LocalDCServer()
+        payloads = [json.loads(server.matches[server.create_match()].history[-1][1]) for _ in range(2)]
+        payloads[1]["end_number"] = 3
+        keys = pool.starmap(publish, [(shared, payloads[0], 1.5), (shared, payloads[1], -2.0)])
+        pool.close()
+        pool.join()
+        attach = (
+            "import sys; from dc4client import SharedEvaluationCache; "
+            "shared = SharedEvaluationCache(capacity=256, name=sys.argv[1]); shared.put(7, 0.25); shared.close()"
+        )
+        subprocess.run([sys.executable, "-c", attach, shared.name], check=True)
+
+        again = SharedEvaluationCache(capacity=256, name=shared.name)
+        print(json.dumps([again.get(key) for key in keys] + [again.get(7)]))
+        again.close()
+        shared.close()
+""")
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_shared_table_round_trip_across_processes(tmp_path, start_method):
+    script = tmp_path / "round_trip.py"
+    script.write_text(SCRIPT)
+    result = subprocess.run(
+        [sys.executable, str(script), start_method],
+        cwd=ROOT,
+        env={"PYTHONPATH": str(ROOT), "PATH": ""},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout) == [1.5, -2.0, 0.25]
+    # No process unlinked the table early or left it behind
+    assert "resource_tracker" not in result.stderr
+    assert "KeyError" not in result.stderr
+
+
+def test_evaluate_reuses_shared_values():
+    server = LocalDCServer()
+    state = CompactState.from_payload(json.loads(server.matches[server.create_match()].history[-1][1]))
+    shared = SharedEvaluationCache(capacity=64)
+    try:
+        EvaluationCache(shared=shared).evaluate(state, lambda s: 0.5)
+        other = EvaluationCache(shared=shared)
+        assert other.evaluate(state, lambda s: pytest.fail("evaluated twice")) == 0.5
+        assert other.stats()["shared_hits"] == 1
+    finally:
+        shared.close()
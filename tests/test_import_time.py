@@ -0,0 +1,29 @@
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+# Budgets are for a typical development machine; raise this on slower ones
+SCALE = float(os.environ.get("DC4_IMPORT_TIME_SCALE", "1.0"))
+
+
+def _load_check_import_time():
+    spec = importlib.util.spec_from_file_location("check_import_time", ROOT / "benchmarks" / "check_import_time.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+check_import_time = _load_check_import_time()
+
+
+@pytest.mark.parametrize(
+    "label, code, budget, forbidden", check_import_time.CASES, ids=[case[0] for case in check_import_time.CASES]
+)
+def test_import_time(label, code, budget, forbidden):
+    elapsed, loaded = check_import_time.measure(code, runs=3)
+    assert not loaded.intersection(forbidden), f"{label} loaded {sorted(loaded.intersection(forbidden))}"
+    assert elapsed * 1e3 <= budget * SCALE, f"{label} took {elapsed * 1e3:.1f} ms (budget {budget * SCALE:.0f} ms)"
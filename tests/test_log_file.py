@@ -0,0 +1,69 @@
+import asyncio
+import json
+import logging
+
+from dc4client import DCClient, MatchNameModel
+
+
+def test_save_log_file_async_writes_records_without_closing(tmp_path):
+    async def scenario():
+        client = DCClient(match_id="match", username="user", password="password", log_dir=str(tmp_path))
+        for index in range(100):
+            client.logger.info("record %d", index)
+        await client.save_log_file_async()
+        saved = [json.loads(line)["message"] for path in tmp_path.iterdir() for line in path.read_text().splitlines()]
+        client.logger.info("after save")
+        await client.close()
+        closed = [json.loads(line)["message"] for path in tmp_path.iterdir() for line in path.read_text().splitlines()]
+        return saved, closed
+
+    saved, closed = asyncio.run(scenario())
+    assert saved[:100] == [f"record {index}" for index in range(100)]
+    assert "after save" in closed
+    assert closed[100].startswith("Log file saved successfully: ")
+
+
+class _Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_clients_share_one_logger_but_not_log_files(tmp_path):
+    collect = _Collect()
+    logging.getLogger("DC_Client").addHandler(collect)
+    loggers_before = set(logging.Logger.manager.loggerDict)
+
+    async def scenario():
+        first = DCClient(match_id="match-a", username="user", password="password", log_dir=str(tmp_path / "a"))
+        second = DCClient(
+            match_id="match-b",
+            username="user",
+            password="password",
+            match_team_name=MatchNameModel.team0,
+            log_dir=str(tmp_path / "b"),
+        )
+        first.logger.info("from a")
+        second.logger.info("from b")
+        await first.close()
+        await second.close()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        logging.getLogger("DC_Client").removeHandler(collect)
+
+    def messages(directory):
+        return [json.loads(line)["message"] for path in directory.iterdir() for line in path.read_text().splitlines()]
+
+    assert messages(tmp_path / "a") == ["from a"]
+    assert messages(tmp_path / "b") == ["from b"]
+    # Handlers on "DC_Client" see every client's records, tagged with their match
+    tagged = {(record.getMessage(), record.match_id, record.match_team_name) for record in collect.records}
+    assert {("from a", "match-a", "team1"), ("from b", "match-b", "team0")} <= tagged
+    assert set(logging.Logger.manager.loggerDict) == loggers_before
+    assert logging.getLogger("DC_Client").propagate
+    assert not [h for h in logging.getLogger("DC_Client").handlers if not isinstance(h, logging.NullHandler)]
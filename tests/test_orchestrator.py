@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+import pytest
+
+from dc4client import LocalDCServer, MatchNameModel, MatchOrchestrator, MatchSpec, PlayerModel, TeamModel
+
+
+PLAYER = PlayerModel(max_velocity=4.0, shot_std_dev=0.1, angle_std_dev=0.01, player_name="player")
+
+
+def _team(name: str) -> TeamModel:
+    return TeamModel(
+        use_default_config=True, team_name=name, player1=PLAYER, player2=PLAYER, player3=PLAYER, player4=PLAYER
+    )
+
+
+async def _play(client):
+    # Finish the larger matches last, so completion order differs from spec order
+    await asyncio.sleep(0.05 * int(str(client.match_id).rsplit("-", 1)[1]))
+    return client.match_team_name.value
+
+
+@pytest.fixture
+def server():
+    started = threading.Event()
+    holder = {}
+
+    def serve():
+        async def main():
+            holder["loop"] = asyncio.get_running_loop()
+            holder["stop"] = asyncio.Event()
+            async with LocalDCServer() as local_server:
+                holder["server"] = local_server
+                started.set()
+                await holder["stop"].wait()
+
+        asyncio.run(main())
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    started.wait()
+    yield holder["server"]
+    holder["loop"].call_soon_threadsafe(holder["stop"].set)
+    thread.join()
+
+
+def _specs(server):
+    match_ids = [server.create_match(match_id=f"match-{number}") for number in (3, 1, 2)]
+    # Both sides of each match, interleaved with the other matches
+    return [
+        MatchSpec(match_id, "user", "password", _team(f"{match_id}-{team.value}"), team)
+        for team in (MatchNameModel.team0, MatchNameModel.team1)
+        for match_id in match_ids
+    ]
+
+
+@pytest.mark.parametrize("processes", [None, 1, 2])
+def test_results_come_back_in_spec_order(tmp_path, server, processes):
+    specs = _specs(server)
+    orchestrator = MatchOrchestrator(
+        "127.0.0.1", server.port, _play, max_concurrency=3, log_dir=str(tmp_path), client_kwargs={"auto_save_log": False}
+    )
+    if processes is None:
+        results = asyncio.run(orchestrator.run(specs))
+    else:
+        results = orchestrator.run_sharded(specs, processes=processes)
+
+    assert [(result.match_id, result.result) for result in results] == [
+        (spec.match_id, spec.match_team_name.value) for spec in specs
+    ]
+    assert all(result.ok for result in results)
+    assert orchestrator.stats()["matches"] == 3
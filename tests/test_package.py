@@ -0,0 +1,31 @@
+import importlib
+import sys
+
+import pytest
+
+import dc4client
+
+
+@pytest.mark.parametrize("module", sorted(dc4client._SUBMODULE_EXPORTS))
+def test_lazy_exports_match_submodule_all(module):
+    submodule = importlib.import_module(f"dc4client.{module}")
+    assert dc4client._SUBMODULE_EXPORTS[module] == tuple(submodule.__all__)
+    for name in submodule.__all__:
+        assert getattr(dc4client, name) is getattr(submodule, name)
+
+
+def test_exported_names_are_unique():
+    names = [name for names in dc4client._SUBMODULE_EXPORTS.values() for name in names]
+    assert len(names) == len(set(names))
+    assert sorted(dc4client.__all__) == sorted(names)
+
+
+@pytest.mark.parametrize("module", sorted(dc4client._SUBMODULE_EXPORTS))
+def test_submodules_are_package_attributes(module):
+    assert getattr(dc4client, module) is sys.modules[f"dc4client.{module}"]
+    assert module in dir(dc4client)
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        dc4client.does_not_exist
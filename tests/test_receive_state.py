@@ -0,0 +1,91 @@
+import asyncio
+
+from dc4client import DCClient, LocalDCServer, MatchNameModel
+
+
+def _client(server: LocalDCServer, match_id: str) -> DCClient:
+    client = DCClient(
+        match_id=match_id,
+        username="user",
+        password="password",
+        match_team_name=MatchNameModel.team0,
+        auto_save_log=False,
+        keep_shot_connection_warm=False,
+    )
+    client.set_server_address("127.0.0.1", server.port)
+    return client
+
+
+async def _wait_for_shot(client: DCClient, total_shot_number: int) -> None:
+    """Wait until the client's stream reader has seen the given shot."""
+    while client._latest_shot_key is None or client._latest_shot_key[1] < total_shot_number:
+        await asyncio.sleep(0.01)
+
+
+def test_conflate_yields_only_the_newest_state():
+    async def scenario():
+        async with LocalDCServer() as server:
+            match_id = server.create_match()
+            async with _client(server, match_id) as client, _client(server, match_id) as shooter:
+                stream = client.receive_state_data(conflate=True)
+                first = await stream.__anext__()
+                # Three states arrive while the consumer is busy
+                for _ in range(3):
+                    assert await shooter.send_shot_info(2.486, 1.5985)
+                await _wait_for_shot(client, 3)
+                newest = await stream.__anext__()
+                await stream.aclose()
+                return first.total_shot_number, newest.total_shot_number, client.last_skipped_updates
+
+    assert asyncio.run(scenario()) == (0, 3, 2)
+
+
+def test_without_conflate_every_state_is_yielded_in_order():
+    async def scenario():
+        async with LocalDCServer() as server:
+            match_id = server.create_match()
+            async with _client(server, match_id) as client, _client(server, match_id) as shooter:
+                stream = client.receive_state_data()
+                seen = [(await stream.__anext__()).total_shot_number]
+                for _ in range(3):
+                    assert await shooter.send_shot_info(2.486, 1.5985)
+                await _wait_for_shot(client, 3)
+                for _ in range(3):
+                    seen.append((await stream.__anext__()).total_shot_number)
+                await stream.aclose()
+                return seen
+
+    assert asyncio.run(scenario()) == [0, 1, 2, 3]
+
+
+class _RecordingServer(LocalDCServer):
+    """Remembers the Last-Event-Id header of every stream request."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.resumed_from = []
+
+    async def _stream(self, request):
+        self.resumed_from.append(request.headers.get("Last-Event-Id"))
+        return await super()._stream(request)
+
+
+def test_reconnect_resumes_after_the_last_event():
+    async def scenario():
+        # The server ends the stream after every event
+        async with _RecordingServer(stream_disconnect_every=1) as server:
+            match_id = server.create_match()
+            async with _client(server, match_id) as client, _client(server, match_id) as shooter:
+                stream = client.receive_state_data()
+                seen = [(await stream.__anext__()).total_shot_number]
+                for _ in range(3):
+                    assert await shooter.send_shot_info(2.486, 1.5985)
+                    seen.append((await stream.__anext__()).total_shot_number)
+                await stream.aclose()
+                return seen, server.resumed_from, client.last_event_id
+
+    seen, resumed_from, last_event_id = asyncio.run(scenario())
+    # Every state exactly once: no latest_state_update resend after a reconnect
+    assert seen == [0, 1, 2, 3]
+    assert resumed_from[:4] == [None, "0", "1", "2"]
+    assert last_event_id == "3"
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import numpy as np
+
+from dc4client import DCClient, GameRecordStore, GameRecordWriter, LocalDCServer, MatchNameModel, MatchRecorder
+
+
+def _record_match(path, shots: int) -> None:
+    async def scenario():
+        async with LocalDCServer() as server:
+            match_id = server.create_match()
+            async with DCClient(
+                match_id=match_id,
+                username="user",
+                password="password",
+                match_team_name=MatchNameModel.team0,
+                auto_save_log=False,
+                keep_shot_connection_warm=False,
+            ) as client:
+                client.set_server_address("127.0.0.1", server.port)
+                with MatchRecorder(path, match_id=match_id) as recorder:
+                    stream = recorder.wrap(client.receive_state_data())
+                    await stream.__anext__()
+                    for _ in range(shots):
+                        assert await client.send_shot_info(2.486, 1.5985)
+                        await stream.__anext__()
+                    await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+def _recording_states(path):
+    lines = path.read_text().splitlines()
+    return json.loads(lines[0])["match_id"], [json.loads(line)["state"] for line in lines[1:]]
+
+
+def test_append_reopen_and_query(tmp_path):
+    recordings = [tmp_path / f"match{number}.jsonl" for number in range(3)]
+    for number, path in enumerate(recordings):
+        _record_match(path, shots=4 + number)
+    directory = tmp_path / "records"
+
+    with GameRecordWriter(directory) as writer:
+        assert writer.add_recording(recordings[0]) == 5
+        assert writer.add_recording(recordings[1]) == 6
+    # Reopening appends
+    with GameRecordWriter(directory) as writer:
+        assert writer.rows == 11
+        assert writer.add_recording(recordings[2]) == 7
+
+    store = GameRecordStore(directory)
+    match_ids = [_recording_states(path)[0] for path in recordings]
+    assert len(store) == 18
+    assert store.match_ids == match_ids
+    assert store.match_rows(match_ids[2]).tolist() == list(range(11, 18))
+    assert store.query(total_shot_number=4).tolist() == [4, 9, 15]
+    assert store.query(match=1, total_shot_number=4).tolist() == [9]
+    assert store.query(total_shot_number=1, next_team=1).tolist() == [1, 6, 12]
+    assert store.query(total_shot_number=1, next_team=0).tolist() == []
+    _, states = _recording_states(recordings[2])
+    # One more stone in play after every shot
+    in_play = (store.column("stones")[11:18] != 0.0).any(axis=-1).sum(axis=(1, 2))
+    assert in_play.tolist() == list(range(7))
+    assert store.column("total_shot_number")[11:18].tolist() == [state["total_shot_number"] for state in states]
+
+
+def test_writer_that_was_never_closed(tmp_path):
+    path = tmp_path / "match.jsonl"
+    _record_match(path, shots=3)
+    match_id, states = _recording_states(path)
+    directory = tmp_path / "records"
+
+    with GameRecordWriter(directory) as writer:
+        writer.add_match("closed", states)
+    crashed = GameRecordWriter(directory)
+    crashed.add_match("unpublished", states)
+    # A torn write of one more match: some row bytes, no match record
+    crashed._row_files["stones"].write(b"\0" * 100)
+    crashed._row_files["stones"].flush()
+    # Readers still see the last close
+    assert GameRecordStore(directory).match_ids == ["closed"]
+
+    with GameRecordWriter(directory) as writer:
+        assert writer.rows == 8
+        writer.add_match(match_id, states)
+    store = GameRecordStore(directory)
+    assert store.match_ids == ["closed", "unpublished", match_id]
+    assert len(store) == 12
+    assert store.query(total_shot_number=0).tolist() == [0, 4, 8]
+    assert np.array_equal(store.column("stones")[8:], store.column("stones")[:4])
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from dc4client import DCClient, LocalDCServer, MatchNameModel, MatchRecorder, MatchReplay
+from dc4client.replay import index_path
+
+
+def _client(server: LocalDCServer, match_id: str, **kwargs) -> DCClient:
+    client = DCClient(
+        match_id=match_id,
+        username="user",
+        password="password",
+        match_team_name=MatchNameModel.team0,
+        auto_save_log=False,
+        **{"keep_shot_connection_warm": False, **kwargs},
+    )
+    client.set_server_address("127.0.0.1", server.port)
+    return client
+
+
+def _record_match(path, shots: int) -> None:
+    async def scenario():
+        async with LocalDCServer() as server:
+            match_id = server.create_match()
+            async with _client(server, match_id) as client, _client(server, match_id) as shooter:
+                with MatchRecorder(path, match_id=match_id, match_team_name=client.match_team_name) as recorder:
+                    stream = recorder.wrap(client.receive_state_data())
+                    await stream.__anext__()
+                    for _ in range(shots):
+                        assert await shooter.send_shot_info(2.486, 1.5985)
+                        await stream.__anext__()
+                    await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+async def _collect(replay: MatchReplay, **kwargs):
+    return [state async for state in replay.receive_state_data(**kwargs)]
+
+
+def test_seek_replays_from_a_recorded_shot(tmp_path):
+    path = tmp_path / "match.jsonl"
+    _record_match(path, shots=5)
+
+    replay = MatchReplay(path)
+    assert replay.header["match_team_name"] == "team0"
+    assert replay.keys() == [(0, shot) for shot in range(6)]
+    replay.seek(end_number=0, total_shot_number=3)
+    assert [state.total_shot_number for state in asyncio.run(_collect(replay))] == [3, 4, 5]
+    replay.rewind()
+    assert len(asyncio.run(_collect(replay, compact=True))) == 6
+    with pytest.raises(KeyError):
+        replay.seek(end_number=4, total_shot_number=0)
+
+    # A missing index is rebuilt from the recording
+    index = json.loads(index_path(path).read_text())
+    index_path(path).unlink()
+    assert MatchReplay(path)._index == index
+
+
+def test_replay_feeds_a_client_without_contacting_the_server(tmp_path):
+    path = tmp_path / "match.jsonl"
+    _record_match(path, shots=3)
+
+    async def scenario():
+        # Nothing listens on this port
+        client = DCClient(
+            match_id="match", username="user", password="password", auto_save_log=False, keep_shot_connection_warm=True
+        )
+        client.set_server_address("127.0.0.1", 9)
+        replay = MatchReplay(path, speed=1000.0)
+        replay.seek(end_number=0, total_shot_number=1)
+        start = time.monotonic()
+        states = await _collect(replay, client=client)
+        warm_task = client._warm_task
+        await client.close()
+        return client, states, start, warm_task
+
+    client, states, start, warm_task = asyncio.run(scenario())
+    assert client.state_data is states[-1]
+    assert client.get_end_number() == 0
+    # No warm-up request was scheduled for the opponent's turns
+    assert warm_task is None
+    # Stamped with the recorded time on the playback clock, not when the loop got to it
+    recorded = [json.loads(line)["t"] for line in path.read_text().splitlines()[1:]]
+    assert client.time_budget.received_at == pytest.approx(start + (recorded[-1] - recorded[1]) / 1000.0, abs=0.05)
+
+
+def test_fast_replay_yields_to_the_event_loop(tmp_path):
+    path = tmp_path / "synthetic.jsonl"
+    server = LocalDCServer()
+    payload = json.loads(server.matches[server.create_match()].history[-1][1])
+    with MatchRecorder(path) as recorder:
+        for number in range(1000):
+            recorder.record({**payload, "total_shot_number": number % 16, "end_number": number // 16}, received_at=number)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        # The consumer never awaits anything else
+        count = len(await _collect(MatchReplay(path), compact=True))
+        task.cancel()
+        return count, ticks
+
+    count, ticks = asyncio.run(scenario())
+    assert count == 1000
+    assert ticks >= 1000 // 64
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+from dc4client import DCClient, LocalDCServer, MatchNameModel
+
+
+FALLBACK = (2.486, 1.5985, 1.5708)
+
+
+def _client(server: LocalDCServer, match_id: str) -> DCClient:
+    client = DCClient(
+        match_id=match_id,
+        username="user",
+        password="password",
+        match_team_name=MatchNameModel.team0,
+        auto_save_log=False,
+        keep_shot_connection_warm=False,
+    )
+    client.set_server_address("127.0.0.1", server.port)
+    return client
+
+
+def _slow_decide(state, deadline):
+    # Ignores its deadline
+    time.sleep(1.0)
+    return (2.4, 1.6, 1.5708)
+
+
+def _fast_decide(state, deadline):
+    return (2.5, 1.55, -1.5708)
+
+
+def test_missed_deadline_returns_fallback_and_replaces_the_pool():
+    async def scenario():
+        async with LocalDCServer() as server:
+            match_id = server.create_match()
+            async with _client(server, match_id) as client, _client(server, match_id) as shooter:
+                stream = client.receive_state_data()
+                await stream.__anext__()
+                slow = asyncio.create_task(
+                    client.run_policy(_slow_decide, deadline=time.monotonic() + 0.2, fallback=FALLBACK)
+                )
+                # The event loop is free while decide runs: the stream reader sees the new state
+                await asyncio.sleep(0.05)
+                assert await shooter.send_shot_info(2.486, 1.5985)
+                next_state = await stream.__anext__()
+                assert not slow.done()
+
+                first_pool = client._policy_pool
+                shot = await slow
+                # The late call still holds the old pool's only worker
+                start = time.monotonic()
+                fast = await client.run_policy(_fast_decide, deadline=time.monotonic() + 0.5, fallback=FALLBACK)
+                elapsed = time.monotonic() - start
+                await stream.aclose()
+                return next_state.total_shot_number, shot, first_pool is not client._policy_pool, fast, elapsed
+
+    total_shot_number, shot, replaced, fast, elapsed = asyncio.run(scenario())
+    assert total_shot_number == 1
+    assert shot == FALLBACK
+    assert replaced
+    assert fast == (2.5, 1.55, -1.5708)
+    assert elapsed < 0.5
+
+
+def test_failing_decide_returns_fallback():
+    def broken(state, deadline):
+        raise RuntimeError("no shot")
+
+    async def scenario():
+        client = DCClient(match_id="match", username="user", password="password", auto_save_log=False)
+        try:
+            return await client.run_policy(broken, state=None, deadline=time.monotonic() + 1.0, fallback=FALLBACK)
+        finally:
+            await client.close()
+
+    assert asyncio.run(scenario()) == FALLBACK
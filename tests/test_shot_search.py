@@ -0,0 +1,45 @@
+import json
+import math
+import time
+
+import numpy as np
+
+from dc4client import LocalDCServer, ShotSearch, end_score_evaluator
+from dc4client.receive_data import StateSchema
+
+
+def _stalling_evaluator(board, shots, team, index):
+    # Chunks with the fastest shots never finish in time
+    if shots[:, 0].max() > 4.3:
+        time.sleep(30.0)
+    return end_score_evaluator(board, shots, team, index)
+
+
+def test_deadline_terminates_busy_workers():
+    search = ShotSearch(_stalling_evaluator, processes=2, chunk_size=64)
+    board = np.zeros((2, 8, 2))
+    try:
+        start = time.monotonic()
+        result = search.search(board, team=0, index=0, deadline=time.monotonic() + 2.0)
+        elapsed = time.monotonic() - start
+        assert elapsed < 4.0
+        assert not result.completed
+        assert result.value > -math.inf
+        assert search._pool is None
+
+        # The next search starts a fresh pool
+        result = search.search(board, team=0, index=0, deadline=time.monotonic() + 2.0)
+        assert result.nodes > 0
+    finally:
+        search.close(terminate=True)
+
+
+def test_decide_on_a_local_server_state():
+    server = LocalDCServer()
+    payload = json.loads(server.matches[server.create_match()].history[-1][1])
+    state = StateSchema(**payload)
+    with ShotSearch(coarse_shape=(4, 5), max_depth=2) as search:
+        velocity, angle, spin = search.decide(state)
+    assert 2.0 <= velocity <= 4.5
+    assert abs(angle - math.pi / 2) <= 0.06
+    assert spin in (math.pi / 2, -math.pi / 2)
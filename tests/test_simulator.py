@@ -0,0 +1,38 @@
+import numpy as np
+
+from dc4client import CurlingSimulator, PlayerModel, ShotNoiseSampler, perturb_shots
+
+
+PLAYER = PlayerModel(max_velocity=4.0, shot_std_dev=0.05, angle_std_dev=0.01, player_name="player")
+DRAW = (2.486, 1.5985, 1.5708)
+
+
+def test_noisy_rollouts_repeat_under_a_seed():
+    simulator = CurlingSimulator()
+    board = np.zeros((2, 8, 2))
+    shots = np.repeat(np.array([DRAW]), 8, axis=0)
+
+    exact = simulator.simulate(board, shots)
+    first = simulator.simulate(board, shots, player=PLAYER, rng=np.random.default_rng(7))
+    again = simulator.simulate(board, shots, player=PLAYER, rng=np.random.default_rng(7))
+    other = simulator.simulate(board, shots, player=PLAYER, rng=np.random.default_rng(8))
+
+    assert (exact == exact[0]).all()
+    assert np.array_equal(first, again)
+    assert not np.array_equal(first, other)
+    assert len({tuple(stone) for stone in first[:, 0, 0]}) == 8
+
+
+def test_sampler_draws_the_same_noise_as_the_simulator():
+    shots = perturb_shots(DRAW, 8, PLAYER, np.random.default_rng(3))
+    simulator = CurlingSimulator()
+    board = np.zeros((2, 8, 2))
+    expected = simulator.simulate(board, np.repeat(np.array([DRAW]), 8, axis=0), player=PLAYER, rng=np.random.default_rng(3))
+    assert np.array_equal(simulator.simulate(board, shots), expected)
+
+
+def test_sampler_seed_is_independent_of_chunking():
+    board = np.zeros((2, 8, 2))
+    serial = ShotNoiseSampler(PLAYER, seed=11, chunk_size=64)
+    with ShotNoiseSampler(PLAYER, seed=11, chunk_size=64, processes=2) as pooled:
+        assert np.array_equal(serial.rollouts(board, DRAW, 200), pooled.rollouts(board, DRAW, 200))
@@ -0,0 +1,127 @@
+import asyncio
+import time
+
+from dc4client import DCClient, LocalDCServer, MatchNameModel
+
+
+def _client(server: LocalDCServer, match_id: str, **kwargs) -> DCClient:
+    client = DCClient(
+        match_id=match_id,
+        username="user",
+        password="password",
+        match_team_name=MatchNameModel.team0,
+        auto_save_log=False,
+        keep_shot_connection_warm=False,
+        **kwargs,
+    )
+    client.set_server_address("127.0.0.1", server.port)
+    return client
+
+
+async def _shoot_while_streaming(server: LocalDCServer, **submit_kwargs):
+    """Take the first state from the stream, submit one shot and return (result, shots the server took)."""
+    match_id = server.create_match()
+    async with _client(server, match_id) as client:
+        stream = client.receive_state_data()
+        await stream.__anext__()
+        try:
+            accepted = await client.submit_shot(2.486, 1.5985, deadline=time.monotonic() + 5.0, **submit_kwargs)
+        finally:
+            await stream.aclose()
+        # Let requests still in flight on the server finish
+        await asyncio.sleep(0.8)
+        return accepted, server.matches[match_id].total_shot_number, client.shots_sent
+
+
+def test_dropped_attempt_is_retried():
+    async def scenario():
+        async with LocalDCServer() as server:
+            # The first shot request loses its connection before the server handles it
+            server.request_drop_probability = 1.0
+            asyncio.get_running_loop().call_later(0.05, setattr, server, "request_drop_probability", 0.0)
+            return await _shoot_while_streaming(server, attempt_timeout=0.4)
+
+    assert asyncio.run(scenario()) == (True, 1, 1)
+
+
+class _SlowAnswer(LocalDCServer):
+    """Throws the stone at once but answers after ``answer_delay`` seconds."""
+
+    answer_delay = 0.5
+
+    async def _shots(self, request):
+        response = await super()._shots(request)
+        await asyncio.sleep(self.answer_delay)
+        return response
+
+
+class _SlowThrow(LocalDCServer):
+    """Throws the stone ``throw_delay`` seconds after the request arrived, then answers."""
+
+    throw_delay = 0.6
+
+    async def _shots(self, request):
+        await request.read()
+        await asyncio.sleep(self.throw_delay)
+        return await super()._shots(request)
+
+
+def test_slow_throw_is_confirmed_by_the_stream_not_resent():
+    async def scenario():
+        # The attempt times out before the server throws; the stream confirms the throw before a resend is due
+        async with _SlowThrow() as server:
+            return await _shoot_while_streaming(server, attempt_timeout=0.4)
+
+    assert asyncio.run(scenario()) == (True, 1, 1)
+
+
+class _StallFirstShot(LocalDCServer):
+    """Never answers the first shot request."""
+
+    stalled = False
+
+    async def _shots(self, request):
+        if not self.stalled:
+            self.stalled = True
+            await asyncio.sleep(30)
+        return await super()._shots(request)
+
+
+def test_hedged_request_answers_a_stalled_attempt():
+    async def scenario():
+        async with _StallFirstShot() as server:
+            return await _shoot_while_streaming(server, attempt_timeout=1.0, hedge_after=0.1)
+
+    assert asyncio.run(scenario()) == (True, 1, 1)
+
+
+def test_shot_for_a_stale_turn_is_not_sent():
+    async def scenario():
+        async with LocalDCServer() as server:
+            match_id = server.create_match()
+            async with _client(server, match_id) as client, _client(server, match_id) as other:
+                stream = client.receive_state_data()
+                await stream.__anext__()
+                # The turn is taken before this client shoots; its reader sees the new state first
+                assert await other.send_shot_info(2.486, 1.5985)
+                while client._latest_shot_key == client._shot_key(client.state_data):
+                    await asyncio.sleep(0.01)
+                try:
+                    accepted = await client.submit_shot(2.486, 1.5985)
+                finally:
+                    await stream.aclose()
+                return accepted, server.matches[match_id].total_shot_number
+
+    assert asyncio.run(scenario()) == (False, 1)
+
+
+def test_without_a_stream_an_unknown_outcome_is_not_retried():
+    async def scenario():
+        async with _SlowAnswer() as server:
+            match_id = server.create_match()
+            async with _client(server, match_id) as client:
+                accepted = await client.submit_shot(2.486, 1.5985, attempt_timeout=0.1)
+            return accepted, server.matches[match_id].total_shot_number
+
+    # The timed-out attempt still reached the server; it must not have been sent twice
+    assert asyncio.run(scenario()) == (False, 1)
@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import pytest
+
+from dc4client import DCClient, LocalDCServer, MatchNameModel, StateSchema, TimeBudget
+
+
+def _state(**changes) -> StateSchema:
+    server = LocalDCServer()
+    match = server.matches[server.create_match()]
+    payload = json.loads(match.history[-1][1])
+    payload.update(changes)
+    return StateSchema.model_validate(payload)
+
+
+def test_deadline_subtracts_largest_round_trip_and_margin():
+    budget = TimeBudget(safety_margin=0.2, default_rtt=0.1)
+    budget.record_state(_state(first_team_remaining_time=30.0), received_at=100.0)
+    assert budget.deadline("team0") == pytest.approx(100.0 + 30.0 - 0.1 - 0.2)
+
+    budget.record_round_trip(0.3)
+    budget.record_round_trip(0.05)
+    assert budget.rtt == 0.3
+    assert budget.deadline("team0") == pytest.approx(100.0 + 30.0 - 0.3 - 0.2)
+    assert budget.time_left("team0", now=120.0) == pytest.approx(10.0 - 0.3 - 0.2)
+
+
+def test_planned_deadline_spreads_remaining_time():
+    budget = TimeBudget(safety_margin=0.2, default_rtt=0.1)
+    budget.record_state(_state(second_team_remaining_time=80.3), received_at=0.0)
+    assert budget.planned_deadline("team1", shots_left=8) == pytest.approx(10.0)
+    # Never later than the hard deadline
+    assert budget.planned_deadline("team1", shots_left=1) == pytest.approx(budget.deadline("team1"))
+
+
+def test_extra_ends_use_extra_end_time():
+    budget = TimeBudget(safety_margin=0.0, default_rtt=0.0, standard_end_count=10)
+    budget.record_state(_state(end_number=9), received_at=0.0)
+    assert budget.deadline("team0") == pytest.approx(600.0)
+    budget.record_state(_state(end_number=10), received_at=0.0)
+    assert budget.deadline("team0") == pytest.approx(60.0)
+
+
+def test_resent_state_keeps_first_arrival():
+    budget = TimeBudget()
+    state = _state()
+    budget.record_state(state, received_at=100.0)
+    deadline = budget.deadline("team0")
+
+    budget.record_state(_state(), received_at=130.0)
+    assert budget.deadline("team0") == deadline
+
+    budget.record_state(_state(total_shot_number=1, first_team_remaining_time=590.0), received_at=130.0)
+    assert budget.deadline("team0") == pytest.approx(deadline + 30.0 - 10.0)
+
+
+def test_deadline_does_not_move_after_stream_reconnect():
+    async def scenario():
+        async with LocalDCServer() as server:
+            match_id = server.create_match()
+            async with DCClient(
+                match_id=match_id,
+                username="user",
+                password="password",
+                match_team_name=MatchNameModel.team0,
+                auto_save_log=False,
+                keep_shot_connection_warm=False,
+            ) as client:
+                client.set_server_address("127.0.0.1", server.port)
+                stream = client.receive_state_data()
+                await stream.__anext__()
+                await stream.aclose()
+                first = client.get_deadline()
+
+                await asyncio.sleep(0.2)
+                # Without Last-Event-Id the server resends its latest state, as the DC server does
+                client.last_event_id = ""
+                stream = client.receive_state_data()
+                await stream.__anext__()
+                await stream.aclose()
+                return first, client.get_deadline()
+
+    first, after_reconnect = asyncio.run(scenario())
+    assert after_reconnect == first